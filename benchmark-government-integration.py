@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+🚀 BASAROMETER V8 - GOVERNMENT INTEGRATION BENCHMARKS
+=====================================================
+
+Reproducible performance checks for the government integration hot path:
+- Fuzzy cut matching: linear SequenceMatcher scan vs indexed lookup
+  (10k-entry synthetic dictionary, results must be identical)
+- Throughput: synthetic Hebrew price rows (1k / 100k / 1M, realistic
+  meat/non-meat mix seeded from data/products.json) through
+  calculate_meat_confidence, enhance_with_basarometer_data and
+  filter_meat_products - rows/sec, barcode / enrichment cache hit rates,
+  per-stage time and peak memory
+
+Results are written as JSON (--output) and can be compared against a
+previous run (--baseline) to catch throughput regressions.
+
+Usage:
+    python3 benchmark-government-integration.py [--suite all|fuzzy|throughput]
+        [--entries 10000] [--queries 100] [--sizes 1000,100000,1000000] [--distinct-rows 20000] [--seed 42]
+        [--output government-integration-benchmark.json] [--baseline previous.json]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Add the src/lib directory to Python path
+lib_path = Path(__file__).parent / 'src' / 'lib'
+sys.path.insert(0, str(lib_path))
+
+from government_integration import CUT_SIMILARITY_THRESHOLD, FuzzyIndex
+
+PRODUCTS_PATH = Path(__file__).parent / 'data' / 'products.json'
+INTEGRATION_PATH = lib_path / 'government-scraper-integration.py'
+
+# Share of synthetic rows built from meat catalogue names
+MEAT_SHARE = 0.35
+
+# Distinct synthetic rows by default; real price files repeat names across stores
+DEFAULT_DISTINCT_ROWS = 20000
+
+# Israeli GS1 prefix of the synthetic barcodes
+BARCODE_PREFIX = '729'
+
+RETAILERS = ['SHUFERSAL', 'RAMI_LEVY', 'MEGA', 'VICTORY', 'YAYNO_BITAN', 'KING_STORE',
+             'MACHSANI_ASHUK', 'TIV_TAAM', 'SUPER_YUDA']
+
+CATEGORY_ENGLISH = {'בקר': 'Beef', 'עוף': 'Chicken', 'מעובד': 'Processed Meat',
+                    'פנימיות': 'Offal', 'אחר': 'Meat'}
+
+MEAT_SUFFIXES = ['', 'טרי', 'קפוא', 'ארוז', 'במשקל', 'מובחר', '1 ק"ג', '500 גרם']
+
+# Everyday non-meat products, including look-alikes the exclusion list must catch
+NON_MEAT_NAMES = [
+    ('חלב 3% בקרטון', 'חלב'), ('גבינה צהובה 28%', 'חלב'), ('יוגורט טבעי', 'חלב'),
+    ("קוטג' 5%", 'חלב'), ('לחם אחיד פרוס', 'מאפים'), ('פיתות', 'מאפים'),
+    ('שמפו לשיער יבש', 'טואלטיקה'), ('אבקת כביסה', 'ניקיון'), ('מיץ תפוזים', 'משקאות'),
+    ('קציצות דגים', 'דגים'), ('פילה סלמון', 'דגים'), ('טונה בשמן', 'שימורים'),
+    ('שניצל תירס', 'קפואים'), ('נקניק צמחוני', 'צמחוני'), ('אורז בסמטי', 'יבשים'),
+    ('ביצים L', 'ביצים'), ('עגבניות שרי', 'ירקות'), ('במבה', 'חטיפים'),
+    ('ציפס עוף בטעם ברביקיו', 'חטיפים'), ('מרק עוף אבקה', 'יבשים'),
+]
+NON_MEAT_CATEGORIES = frozenset(category for _, category in NON_MEAT_NAMES)
+
+
+def load_seed_words() -> List[str]:
+    """Hebrew words from the unified products catalogue"""
+    with open(PRODUCTS_PATH, 'r', encoding='utf-8') as f:
+        products = json.load(f)['products']
+
+    words = set()
+    for product in products:
+        words.update(product['name'].split())
+    return sorted(word for word in words if len(word) > 1)
+
+
+def generate_cut_dictionary(words: List[str], size: int, rng: random.Random) -> List[str]:
+    """Synthetic cut names: 2-4 catalogue words per entry"""
+    names = []
+    seen = set()
+    while len(names) < size:
+        name = ' '.join(rng.sample(words, rng.randint(2, 4)))
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def generate_queries(names: List[str], words: List[str], count: int, rng: random.Random) -> List[str]:
+    """Mix of near-duplicates (should match) and random names (mostly should not)"""
+    queries = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            name = rng.choice(names).split()
+            if len(name) > 1 and rng.random() < 0.5:
+                name.pop(rng.randrange(len(name)))
+            if rng.random() < 0.5:
+                name.append(rng.choice(['טרי', 'קפוא', 'ק"ג']))
+            queries.append(' '.join(name))
+        else:
+            queries.append(' '.join(rng.sample(words, rng.randint(1, 4))))
+    return queries
+
+
+def linear_best_match(names: List[str], query: str, threshold: float) -> Optional[Tuple[int, float]]:
+    """The original full-scan loop of find_best_cut_match"""
+    best_match = None
+    best_score = 0
+    for index, name in enumerate(names):
+        similarity = SequenceMatcher(None, query, name).ratio()
+        if similarity > best_score and similarity > threshold:
+            best_score = similarity
+            best_match = (index, similarity)
+    return best_match
+
+
+def benchmark_fuzzy_matching(entries: int, query_count: int, seed: int) -> Dict:
+    """Compare linear and indexed fuzzy matching on a synthetic dictionary"""
+    print(f"\n🔎 FUZZY CUT MATCHING ({entries:,} entries, {query_count:,} queries)")
+
+    rng = random.Random(seed)
+    words = load_seed_words()
+    names = generate_cut_dictionary(words, entries, rng)
+    queries = generate_queries(names, words, query_count, rng)
+
+    started = time.perf_counter()
+    index = FuzzyIndex(names, CUT_SIMILARITY_THRESHOLD)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    linear_results = [linear_best_match(names, query, CUT_SIMILARITY_THRESHOLD) for query in queries]
+    linear_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    indexed_results = [index.best_match(query) for query in queries]
+    indexed_seconds = time.perf_counter() - started
+
+    mismatches = sum(1 for a, b in zip(linear_results, indexed_results) if a != b)
+    matched = sum(1 for result in indexed_results if result is not None)
+    speedup = linear_seconds / indexed_seconds if indexed_seconds > 0 else float('inf')
+
+    print(f"   Index build: {build_seconds * 1000:.1f}ms")
+    print(f"   Linear scan: {linear_seconds:.2f}s ({linear_seconds / query_count * 1000:.2f}ms/query)")
+    print(f"   Indexed:     {indexed_seconds:.2f}s ({indexed_seconds / query_count * 1000:.3f}ms/query)")
+    print(f"   Matches: {matched}/{query_count}, mismatches vs linear: {mismatches}")
+    print(f"   {'✅' if mismatches == 0 else '❌'} Speedup: {speedup:.1f}x")
+
+    return {
+        'entries': entries,
+        'queries': query_count,
+        'index_build_seconds': build_seconds,
+        'linear_seconds': linear_seconds,
+        'indexed_seconds': indexed_seconds,
+        'speedup': speedup,
+        'matches': matched,
+        'mismatches': mismatches,
+    }
+
+
+def load_catalogue() -> List[Dict]:
+    with open(PRODUCTS_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)['products']
+
+
+def build_knowledge_base(catalogue: List[Dict]) -> Tuple[Dict, Dict]:
+    """normalized_cuts / meat_names_mapping stand-ins built from the catalogue"""
+    cut_names = sorted({product['normalized_name'] for product in catalogue})
+    normalized_cuts = {
+        f"cut_{index}": {'hebrew_name': name, 'english_name': '', 'category': 'unknown'}
+        for index, name in enumerate(cut_names)
+    }
+    meat_names_mapping = {
+        product['normalized_name']: CATEGORY_ENGLISH.get(product['category'], 'Meat')
+        for product in catalogue
+    }
+    return normalized_cuts, meat_names_mapping
+
+
+def generate_price_rows(catalogue: List[Dict], count: int, seed: int,
+                        distinct_rows: int = DEFAULT_DISTINCT_ROWS) -> Tuple[List[Dict], List[Dict]]:
+    """count synthetic price rows drawn from a pool of distinct rows (with repeats, like real files)
+
+    Every product name gets one barcode shared by all chains, except weighed
+    products, which get a chain-internal code (13 digits starting with 2).
+    distinct_rows of 0 makes every row distinct. Returns (all rows, rows
+    generated from meat catalogue names).
+    """
+    rng = random.Random(seed)
+    barcodes: Dict[str, str] = {}
+
+    pool = []
+    meat_rows = set()
+    for _ in range(min(count, distinct_rows or count)):
+        if rng.random() < MEAT_SHARE:
+            product = rng.choice(catalogue)
+            name = ' '.join(part for part in (product['name'], rng.choice(MEAT_SUFFIXES)) if part)
+            category = product['category']
+        else:
+            name, category = rng.choice(NON_MEAT_NAMES)
+
+        retailer = rng.choice(RETAILERS)
+        if 'במשקל' in name:
+            item_code = f"2{rng.randrange(10 ** 12):012d}"
+        else:
+            item_code = barcodes.setdefault(name, f"{BARCODE_PREFIX}{len(barcodes):010d}")
+
+        pool.append({
+            'item_code': item_code,
+            'name_hebrew': name,
+            'name_english': '',
+            'price': round(rng.uniform(4.9, 189.9), 2),
+            'retailer': retailer,
+            'category': category if rng.random() < 0.7 else '',
+        })
+        if category not in NON_MEAT_CATEGORIES:
+            meat_rows.add(len(pool) - 1)
+
+    indexes = [rng.randrange(len(pool)) for _ in range(count)]
+    return [pool[index] for index in indexes], [pool[index] for index in indexes if index in meat_rows]
+
+
+def load_integration_module():
+    """government-scraper-integration.py (hyphenated, so loaded by path)"""
+    spec = importlib.util.spec_from_file_location('government_scraper_integration', INTEGRATION_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def timed_stage(rows: int, seconds: float) -> Dict:
+    return {
+        'rows': rows,
+        'seconds': round(seconds, 4),
+        'rows_per_second': round(rows / seconds, 1) if seconds > 0 else None,
+    }
+
+
+def isolate_outputs(data_folder: str):
+    """Point every file the integration persists at data_folder (this process only)"""
+    for variable in ('BASAROMETER_ENRICHMENT_CACHE', 'BASAROMETER_DECISION_LOG', 'BASAROMETER_UNIFIED_SNAPSHOT',
+                     'BASAROMETER_BARCODE_OVERRIDES', 'BASAROMETER_PROFILE'):
+        os.environ.pop(variable, None)  # always start cold, no audit log or profile dumps
+    os.environ.update({
+        'BASAROMETER_KNOWLEDGE_BASE_CACHE': f"{data_folder}/.knowledge-base.pickle",
+        'BASAROMETER_BARCODE_CATALOG': f"{data_folder}/barcode-catalog.sqlite",
+        'BASAROMETER_UNIFIED_OUTPUT': f"{data_folder}/government-unified-products.json",
+        'BASAROMETER_PRICE_HISTORY': f"{data_folder}/price-history",
+        'BASAROMETER_METRICS_DIR': f"{data_folder}/metrics",
+    })
+
+
+def run_throughput(size: int, seed: int, distinct_rows: int = DEFAULT_DISTINCT_ROWS) -> Dict:
+    """One throughput measurement; runs in a fresh process so peak memory is per size"""
+    catalogue = load_catalogue()
+    normalized_cuts, meat_names_mapping = build_knowledge_base(catalogue)
+
+    # filter_meat_products saves its stats and metrics: keep them out of the production data folder
+    with tempfile.TemporaryDirectory(prefix='basarometer-benchmark-') as data_folder, \
+            open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        isolate_outputs(data_folder)
+        module = load_integration_module()
+
+        started = time.perf_counter()
+        integration = module.BasarometerGovernmentIntegration(normalized_cuts, meat_names_mapping)
+        setup_seconds = time.perf_counter() - started
+
+        integration.data_folder = data_folder
+        integration.output_path = Path(data_folder) / 'government-meat-products.jsonl'
+        integration.delta_output_path = Path(data_folder) / 'government-meat-deltas.jsonl'
+        integration.price_state_path = Path(data_folder) / '.last-known-prices.sqlite'
+
+        started = time.perf_counter()
+        rows, meat_rows = generate_price_rows(catalogue, size, seed, distinct_rows)
+        generate_seconds = time.perf_counter() - started
+
+        meat_keywords = integration.vocabulary.meat_keywords
+        started = time.perf_counter()
+        for row in rows:
+            integration.calculate_meat_confidence(row, meat_keywords)
+        confidence_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for row in meat_rows:
+            integration.enhance_with_basarometer_data(row)
+        enhance_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        filtered = asyncio.run(integration.filter_meat_products(rows))
+        filter_seconds = time.perf_counter() - started
+
+    return {
+        'rows': size,
+        'distinct_rows': min(size, distinct_rows or size),
+        'meat_rows': len(meat_rows),
+        'meat_found': len(filtered),
+        'stages': {
+            'setup': {'seconds': round(setup_seconds, 4)},
+            'generate_rows': timed_stage(size, generate_seconds),
+            'calculate_meat_confidence': timed_stage(size, confidence_seconds),
+            'enhance_with_basarometer_data': timed_stage(len(meat_rows), enhance_seconds),
+            'filter_meat_products': timed_stage(size, filter_seconds),
+        },
+        'rows_per_second': round(size / filter_seconds, 1) if filter_seconds > 0 else None,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'enrichment_cache': integration.enrichment_cache.metrics(),
+        'barcode_catalog': integration.barcode_catalog.metrics(),
+    }
+
+
+def benchmark_throughput(sizes: List[int], seed: int, distinct_rows: int = DEFAULT_DISTINCT_ROWS) -> Dict:
+    """Filter/enrichment throughput for each synthetic dataset size"""
+    results = {}
+    for size in sizes:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(run_throughput, size, seed, distinct_rows).result()
+        results[str(size)] = result
+        print(f"\n⚡ THROUGHPUT ({size:,} rows, {result['distinct_rows']:,} distinct)")
+
+        for stage, timing in result['stages'].items():
+            rate = f" ({timing['rows_per_second']:,.0f} rows/s)" if timing.get('rows_per_second') else ''
+            if stage == 'filter_meat_products':
+                # The filter's throughput depends on how many rows the caches answer
+                rate += (f", barcode hit rate {result['barcode_catalog']['hit_rate']:.1%}, "
+                         f"enrichment hit rate {result['enrichment_cache']['hit_rate']:.1%}")
+            print(f"   {stage:<30} {timing['seconds']:8.3f}s{rate}")
+        print(f"   Meat found: {result['meat_found']:,}/{result['meat_rows']:,} meat rows, "
+              f"peak RSS: {result['peak_rss_mb']:.0f}MB")
+    return results
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_with_baseline(results: Dict, baseline_path: str, tolerance: float) -> List[str]:
+    """Throughput stages that got slower than the baseline by more than tolerance"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = []
+    for size, result in results.get('throughput', {}).items():
+        previous = baseline.get('throughput', {}).get(size)
+        if not previous:
+            continue
+        if previous.get('distinct_rows', min(int(size), DEFAULT_DISTINCT_ROWS)) != result['distinct_rows']:
+            continue  # a different repeat ratio changes the cache hit rates
+        for stage, timing in result['stages'].items():
+            if stage == 'generate_rows':
+                continue  # fixture generation, not the code under test
+            old_rate = previous['stages'].get(stage, {}).get('rows_per_second')
+            new_rate = timing.get('rows_per_second')
+            if old_rate and new_rate and new_rate < old_rate * (1 - tolerance):
+                regressions.append(f"{stage} @ {size} rows: {old_rate:,.0f} -> {new_rate:,.0f} rows/s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Government integration benchmarks')
+    parser.add_argument('--suite', choices=['all', 'fuzzy', 'throughput'], default='all')
+    parser.add_argument('--entries', type=int, default=10000, help='Synthetic cut dictionary size')
+    parser.add_argument('--queries', type=int, default=100, help='Number of fuzzy lookups')
+    parser.add_argument('--sizes', default='1000,100000,1000000', help='Comma separated throughput row counts')
+    parser.add_argument('--distinct-rows', type=int, default=DEFAULT_DISTINCT_ROWS,
+                        help='Distinct synthetic rows the throughput rows repeat (0 = every row distinct)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--output', default='government-integration-benchmark.json',
+                        help='Machine-readable results file')
+    parser.add_argument('--baseline', help='Previous results file to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed rows/sec drop vs the baseline (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    print("🚀 BASAROMETER V8 - GOVERNMENT INTEGRATION BENCHMARKS")
+    print("=" * 60)
+
+    results = {
+        'created_at': datetime.now().isoformat(),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+    }
+    exit_code = 0
+
+    if args.suite in ('all', 'fuzzy'):
+        results['fuzzy_matching'] = benchmark_fuzzy_matching(args.entries, args.queries, args.seed)
+        if results['fuzzy_matching']['mismatches']:
+            exit_code = 1
+
+    if args.suite in ('all', 'throughput'):
+        sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+        results['throughput'] = benchmark_throughput(sizes, args.seed, args.distinct_rows)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Results written to: {args.output}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f"❌ REGRESSION: {regression}")
+        if regressions:
+            exit_code = 1
+        else:
+            print(f"✅ No throughput regressions vs {args.baseline}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,29 +17,98 @@ Features:
 Market Impact: 30% → 70-85% Israeli meat market coverage
 """
 
+import argparse
+import asyncio
+import dataclasses
 import json
 import os
+import struct
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from difflib import SequenceMatcher
-from typing import Dict, List, Optional, Any
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-# Government scraper imports
-from il_supermarket_scarper.scrapper_runner import MainScrapperRunner
-from il_supermarket_scarper import scrappers
+
+from government_integration import (
+    BarcodeCatalog,
+    ChainDownloadOrchestrator,
+    CrossRetailerUnifier,
+    DecisionLogger,
+    EnrichmentCache,
+    FilterVocabulary,
+    GroupedStreamingStats,
+    JsonLinesSink,
+    KnowledgeBaseCache,
+    MANIFEST_FILE_NAME,
+    MatchProfile,
+    MetricsExporter,
+    PriceDeltaTracker,
+    PriceHistoryStore,
+    ProcessedFileManifest,
+    ProductBatch,
+    ProductIndex,
+    ProductRecord,
+    ProfiledRunMetrics,
+    QualityGrade,
+    RunMetrics,
+    SnapshotSink,
+    batched,
+    write_catalog_snapshot,
+    find_price_files,
+    iter_price_file_products,
+    knowledge_base_hash,
+    normalize_category,
+    parse_price_file_name,
+    read_snapshot,
+    source_file_key,
+    source_fingerprint,
+)
+
+# Bump whenever the classification logic changes so persisted caches are invalidated
+CLASSIFICATION_VERSION = 2
 
 class BasarometerGovernmentIntegration:
     """Enhanced government data integration with Basarometer intelligence"""
     
-    def __init__(self):
+    def __init__(self, normalized_cuts: Optional[Dict] = None, meat_names_mapping: Optional[Dict] = None,
+                 vocabulary: Optional[FilterVocabulary] = None):
         self.data_folder = "/tmp/basarometer-gov-data"
+        self.output_path = Path(self.data_folder) / 'government-meat-products.jsonl'
+        self.output_batch_size = 1000
         self.config_folder = "/Users/yogi/Desktop/basarometer/v5/v3/config"
+        self.normalized_cuts_path = Path('/Users/yogi/Desktop/basarometer/v5/normalized_cuts.json')
+        self.meat_names_mapping_path = Path(f"{self.config_folder}/meat_names_mapping.json")
+        
+        # Parsed knowledge base + vocabulary, pickled and keyed by the source files' content hash
+        self.knowledge_base_cache = KnowledgeBaseCache(os.environ.get(
+            'BASAROMETER_KNOWLEDGE_BASE_CACHE', f"{self.data_folder}/.knowledge-base.pickle"))
+        
+        # Load existing Basarometer knowledge base (unless handed over, e.g. to a worker process)
+        knowledge_base_fingerprint = self.knowledge_base_fingerprint()
+        if normalized_cuts is None and meat_names_mapping is None and vocabulary is None:
+            normalized_cuts, meat_names_mapping, vocabulary = self.load_knowledge_base(knowledge_base_fingerprint)
+        self.normalized_cuts = normalized_cuts if normalized_cuts is not None else self.load_normalized_cuts()
+        self.meat_names_mapping = (meat_names_mapping if meat_names_mapping is not None
+                                   else self.load_meat_names_mapping())
+        
+        # Precomputed filter vocabulary (keyword sets + compiled matcher)
+        self.vocabulary = vocabulary or FilterVocabulary.build(
+            self.normalized_cuts, self.meat_names_mapping, knowledge_base_fingerprint)
         
-        # Load existing Basarometer knowledge base
-        self.normalized_cuts = self.load_normalized_cuts()
-        self.meat_names_mapping = self.load_meat_names_mapping()
+        # Memoized classifications keyed by normalized name (optionally persisted to SQLite)
+        self.enrichment_cache = EnrichmentCache(
+            max_entries=int(os.environ.get('BASAROMETER_ENRICHMENT_CACHE_SIZE', '100000')),
+            path=os.environ.get('BASAROMETER_ENRICHMENT_CACHE'),
+            fingerprint=self.classification_fingerprint())
+        
+        # ItemCode -> classification, consulted before any text analysis (manual overrides win)
+        self.barcode_catalog = BarcodeCatalog(
+            path=os.environ.get('BASAROMETER_BARCODE_CATALOG', f"{self.data_folder}/barcode-catalog.sqlite"),
+            fingerprint=self.classification_fingerprint())
+        if os.environ.get('BASAROMETER_BARCODE_OVERRIDES'):
+            self.barcode_catalog.import_overrides(os.environ['BASAROMETER_BARCODE_OVERRIDES'])
         
         # Government scraper configuration
         self.enabled_scrapers = [
@@ -54,21 +123,104 @@ class BasarometerGovernmentIntegration:
             "super_yuda",     # Regional chain
         ]
         
+        # Download orchestration: one asyncio task per chain, rate limited with retries
+        self.download_enabled = os.environ.get('BASAROMETER_DOWNLOAD', '0') == '1'
+        self.download_file_types = ['PRICE_FILE', 'STORE_FILE']
+        self.download_limit = 100  # Limit per chain to avoid overload
+        self.max_concurrent_chains = int(os.environ.get('BASAROMETER_MAX_CONCURRENT_CHAINS', '4'))
+        self.download_rate_per_second = float(os.environ.get('BASAROMETER_DOWNLOAD_RATE', '2'))
+        self.download_retries = 3
+        self.download_timeout = 900.0
+        
+        # Incremental ingestion: skip price files a previous run already processed
+        self.incremental = os.environ.get('BASAROMETER_FULL_REFRESH', '0') != '1'
+        self.manifest: Optional[ProcessedFileManifest] = None
+        
+        # Change detection: only inserts, updates and deletions go downstream
+        self.delta_output_path = Path(self.data_folder) / 'government-meat-deltas.jsonl'
+        self.price_state_path = Path(self.data_folder) / '.last-known-prices.sqlite'
+        self.price_deltas = PriceDeltaTracker()
+        
+        # Cross-network unification of the meat catalog in the website's products.json schema
+        self.unified_output_path = Path(os.environ.get(
+            'BASAROMETER_UNIFIED_OUTPUT', f"{self.data_folder}/government-unified-products.json"))
+        self.unifier = CrossRetailerUnifier()
+        
+        # Memory-mapped binary form of the unified catalog for fast reader start-up
+        self.unified_snapshot_path = Path(os.environ.get(
+            'BASAROMETER_UNIFIED_SNAPSHOT', str(self.unified_output_path.with_suffix('.bin'))))
+        
+        # Indexed in-process queries (by category, cut, retailer, grade and price) over the meat catalog
+        self.product_index = ProductIndex()
+        
+        # Append-only daily price series per (retailer, product) for trend charts
+        self.price_history_path = os.environ.get('BASAROMETER_PRICE_HISTORY', f"{self.data_folder}/price-history")
+        self.price_history = PriceHistoryStore(self.price_history_path)
+        
+        # Per-product decision output: summary-only console by default, sampled or
+        # verbose on request, optional JSONL audit log written in the background
+        self.decision_log = DecisionLogger(
+            level=os.environ.get('BASAROMETER_LOG_LEVEL', 'summary'),
+            sample_rate=float(os.environ.get('BASAROMETER_LOG_SAMPLE_RATE', '0.01')),
+            decision_log_path=os.environ.get('BASAROMETER_DECISION_LOG'))
+        
+        # Run metrics: per-stage timers and per-chain counters, exported for monitoring
+        self.metrics_dir = Path(os.environ.get('BASAROMETER_METRICS_DIR', f"{self.data_folder}/metrics"))
+        
+        # Opt-in cProfile + tracemalloc per stage; dumps are written next to the output
+        self.profile = os.environ.get('BASAROMETER_PROFILE', '0') == '1'
+        self.metrics = self.new_run_metrics()
+        
+        # Parallel filtering: >1 fans price files out to a process pool
+        self.filter_workers = int(os.environ.get('BASAROMETER_FILTER_WORKERS', '1'))
+        
         # Performance metrics
-        self.stats = {
+        self.stats = self.new_stats()
+        self.stats['vocabulary_builds'] = 1
+    
+    def new_run_metrics(self) -> RunMetrics:
+        """Stage timers for a new run, profiled per stage when profiling is switched on"""
+        return ProfiledRunMetrics() if self.profile else RunMetrics()
+    
+    def new_stats(self) -> Dict:
+        """Fresh performance metrics"""
+        return {
             'session_start': datetime.now().isoformat(),
             'total_processed': 0,
             'meat_found': 0,
             'excluded_non_meat': 0,
             'mapping_matches': 0,
-            'confidence_scores': [],
-            'errors': []
+            'confidence': GroupedStreamingStats(),
+            'errors': [],
+            'ingest': {'files': 0, 'items': 0, 'skipped_items': 0, 'unchanged_files': 0},
+            'filter_paths': {'barcode_catalog': 0, 'category_non_meat': 0, 'text_matcher': 0},
+            'vocabulary': self.vocabulary.metrics(),
+            'vocabulary_builds': 0
         }
     
+    def load_knowledge_base(self, fingerprint) -> Tuple[Dict, Dict, FilterVocabulary]:
+        """(normalized cuts, meat names mapping, vocabulary) from the cache, or parsed and built"""
+        cache_key = (f"v{CLASSIFICATION_VERSION}:"
+                     f"{knowledge_base_hash([self.normalized_cuts_path, self.meat_names_mapping_path])}")
+        
+        cached = self.knowledge_base_cache.load(cache_key)
+        if cached is not None:
+            normalized_cuts, meat_names_mapping, vocabulary = cached
+            print(f"⚡ Loaded knowledge base from cache ({len(normalized_cuts)} normalized cuts, "
+                  f"{len(meat_names_mapping)} meat name mappings)")
+            # Same content, possibly touched files: keep the vocabulary, track the new mtimes
+            return normalized_cuts, meat_names_mapping, dataclasses.replace(vocabulary, source_fingerprint=fingerprint)
+        
+        normalized_cuts = self.load_normalized_cuts()
+        meat_names_mapping = self.load_meat_names_mapping()
+        vocabulary = FilterVocabulary.build(normalized_cuts, meat_names_mapping, fingerprint)
+        self.knowledge_base_cache.save(cache_key, (normalized_cuts, meat_names_mapping, vocabulary))
+        return normalized_cuts, meat_names_mapping, vocabulary
+    
     def load_normalized_cuts(self) -> Dict:
         """Load existing normalized cuts for intelligent mapping"""
         try:
-            cuts_path = Path('/Users/yogi/Desktop/basarometer/v5/normalized_cuts.json')
+            cuts_path = self.normalized_cuts_path
             if cuts_path.exists():
                 with open(cuts_path, 'r', encoding='utf-8') as f:
                     cuts_data = json.load(f)
@@ -99,7 +251,7 @@ class BasarometerGovernmentIntegration:
     def load_meat_names_mapping(self) -> Dict:
         """Load existing meat names mapping for Hebrew processing"""
         try:
-            mapping_path = Path(f"{self.config_folder}/meat_names_mapping.json")
+            mapping_path = self.meat_names_mapping_path
             if mapping_path.exists():
                 with open(mapping_path, 'r', encoding='utf-8') as f:
                     mappings = json.load(f)
@@ -142,36 +294,79 @@ class BasarometerGovernmentIntegration:
             print(f"❌ Error loading meat_names_mapping.json: {e}")
             return {}
         
-    async def execute_government_scraping(self) -> List[Dict]:
+    async def execute_government_scraping(self, downloader=None) -> List[Dict]:
         """Execute official government-mandated scraping with Basarometer enhancement"""
         print("🏛️  EXECUTING GOVERNMENT SCRAPING WITH BASAROMETER INTELLIGENCE...")
         
+        self.metrics = self.new_run_metrics()
+        
         try:
             # Create data folder
             os.makedirs(self.data_folder, exist_ok=True)
             
-            # Configure environment for focused meat scraping
-            os.environ['ENABLED_SCRAPERS'] = ','.join(self.enabled_scrapers)
-            os.environ['ENABLED_FILE_TYPES'] = 'PRICE_FILE,STORE_FILE'  
-            os.environ['LIMIT'] = '100'  # Limit per chain to avoid overload
-            
-            # Initialize scraper runner
-            runner = MainScrapperRunner()
-            
             print(f"🎯 Targeting scrapers: {', '.join(self.enabled_scrapers)}")
             print(f"📁 Data folder: {self.data_folder}")
             
-            # Execute scraping (this will download data files)
-            print("🔄 Starting government scraping session...")
-            # Note: runner.run() would typically be called here, but we'll simulate for testing
+            if self.download_enabled or downloader is not None:
+                # Execute scraping: every chain downloads concurrently and files are
+                # parsed/filtered as soon as they arrive
+                print("🔄 Starting government scraping session...")
+                filtered_products = await self.download_and_filter(downloader)
+                self.print_filtering_stats()
+                return filtered_products
             
-            # For now, let's simulate and focus on the filtering logic
-            sample_government_data = self.generate_sample_government_data()
+            # Stream the PriceFull/Price files in the data folder that a previous run
+            # has not processed yet (or whose content changed since)
+            self.open_manifest()
+            price_files = find_price_files(self.data_folder)
+            if price_files:
+                new_files = [price_file for price_file in price_files if self.is_new_price_file(price_file)]
+                print(f"📥 Ingesting {len(new_files)} new or changed price files "
+                      f"({len(price_files) - len(new_files)} unchanged skipped)...")
+                if not new_files:
+                    print(f"✅ Snapshot is up to date: {self.output_path}")
+                    self.finish_price_deltas(set())
+                    # The whole snapshot is carried over: rebuild the unifier and query index
+                    # from it, and its prices are still today's history points
+                    for product in read_snapshot(self.output_path):
+                        self.observe_carried_over(product)
+                    self.write_price_history()
+                    self.save_filtering_stats()
+                    return []
+                price_files = new_files
+                government_data = self.iter_downloaded_products(price_files)
+            else:
+                print("⚠️  No downloaded price files found, using sample data")
+                government_data = self.generate_sample_government_data()
             
-            # Filter ONLY meat products using comprehensive Basarometer intelligence
-            filtered_products = await self.filter_meat_products(sample_government_data)
+            # Filter ONLY meat products using comprehensive Basarometer intelligence,
+            # streaming ingest -> filter -> enrich and batching only at the output sink
+            print("🥩 APPLYING STRICT MEAT-ONLY FILTERING...")
+            if price_files and self.filter_workers > 1:
+                meat_products = self.filter_price_files_parallel(price_files, self.filter_workers)
+            else:
+                meat_products = self.metrics.timed('filter', self.iter_meat_products(government_data))
+            
+            written_batches = []
+            replaced_files = None
+            with SnapshotSink(self.output_path) as sink:
+                for batch in batched(meat_products, self.output_batch_size):
+                    written_batches.append(self.write_products(sink, batch))
+                
+                # Merge into the previous snapshot: keep what the reprocessed files did not replace
+                if self.manifest is not None and price_files:
+                    replaced_files = {source_file_key(price_file) for price_file in price_files}
+                    sink.carry_over(replaced_files, on_product=self.observe_carried_over)
             
-            return filtered_products
+            self.save_manifest()
+            self.finish_price_deltas(replaced_files)
+            self.write_unified_products()
+            self.write_price_history()
+            self.print_filtering_stats()
+            print(f"💾 {sink.written} meat products written to: {self.output_path} "
+                  f"({sink.carried_over} carried over from the previous snapshot)")
+            
+            return self.plain_products(written_batches)
             
         except Exception as e:
             error_msg = f"Government scraping error: {e}"
@@ -179,6 +374,262 @@ class BasarometerGovernmentIntegration:
             self.stats['errors'].append(error_msg)
             return []
     
+    def download_chain_files(self, chain: str, file_type: str, dump_folder: Path) -> List[Path]:
+        """Download one chain's files of one type with il_supermarket_scarper (blocking)"""
+        # Imported on first download only: filter-only runs and workers never need the scraper
+        from il_supermarket_scarper.scrapper_runner import MainScrapperRunner
+        
+        runner = MainScrapperRunner(enabled_scrapers=[chain], dump_folder_name=str(dump_folder))
+        runner.run(limit=self.download_limit, files_types=[file_type])
+        return find_price_files(str(dump_folder))
+    
+    async def download_and_filter(self, downloader=None) -> List[Dict]:
+        """Download every enabled chain as its own task, filtering files as they arrive"""
+        orchestrator = ChainDownloadOrchestrator(
+            downloader or self.download_chain_files,
+            self.data_folder,
+            file_types=self.download_file_types,
+            max_concurrent_chains=self.max_concurrent_chains,
+            rate_per_second=self.download_rate_per_second,
+            max_retries=self.download_retries,
+            attempt_timeout=self.download_timeout)
+        
+        print("🥩 APPLYING STRICT MEAT-ONLY FILTERING...")
+        self.open_manifest()
+        written_batches = []
+        replaced_files = set()
+        
+        with SnapshotSink(self.output_path) as sink:
+            if self.filter_workers > 1:
+                # Files are submitted to the pool on arrival and merged in file order
+                loop = asyncio.get_running_loop()
+                with self.create_filter_pool(self.filter_workers) as executor:
+                    pending = {}
+                    async for chain, price_file in orchestrator.stream(self.enabled_scrapers):
+                        if self.is_new_price_file(price_file):
+                            pending[price_file] = loop.run_in_executor(
+                                executor, _filter_price_file_worker, str(price_file))
+                    
+                    for price_file in sorted(pending):
+                        products, worker_stats, cache_counters = await pending[price_file]
+                        self.merge_worker_stats(worker_stats, cache_counters)
+                        self.record_processed_file(price_file, worker_stats)
+                        replaced_files.add(source_file_key(price_file))
+                        written_batches.append(self.write_products(sink, products))
+                    
+                    # Workers only ship the codes they learned; the parent persists them
+                    self.barcode_catalog.save()
+            else:
+                async for chain, price_file in orchestrator.stream(self.enabled_scrapers):
+                    if not self.is_new_price_file(price_file):
+                        continue  # store files and files already processed by a previous run
+                    
+                    # Filtering runs in a thread so the other chains keep downloading
+                    products = await asyncio.to_thread(self.filter_price_file, price_file)
+                    replaced_files.add(source_file_key(price_file))
+                    written_batches.append(self.write_products(sink, products))
+            
+            if self.manifest is not None:
+                sink.carry_over(replaced_files, on_product=self.observe_carried_over)
+        
+        self.save_manifest()
+        self.finish_price_deltas(replaced_files if self.manifest is not None else None)
+        self.write_unified_products()
+        self.write_price_history()
+        
+        self.stats['downloads'] = orchestrator.timings()
+        for chain, timing in self.stats['downloads'].items():
+            status = '✅' if not timing['failed_jobs'] else '⚠️ '
+            print(f"{status} {chain}: {timing['files']} files in {timing['seconds']:.1f}s "
+                  f"({timing['attempts']} attempts)")
+            self.metrics.add_stage_time('download', timing['seconds'], timing['attempts'])
+            self.metrics.count(chain, 'downloaded_files', timing['files'])
+            if timing['failed_jobs']:
+                self.stats['errors'].extend(timing['errors'])
+                self.metrics.count(chain, 'errors', timing['failed_jobs'])
+        
+        print(f"💾 {sink.written} meat products written to: {self.output_path} "
+              f"({sink.carried_over} carried over from the previous snapshot)")
+        return self.plain_products(written_batches)
+    
+    def write_products(self, sink: SnapshotSink, products: List[Dict]) -> ProductBatch:
+        """Write a batch of meat products and feed the delta tracker and the unification stage
+
+        Every stage reads the same columnar batch, which replaces the individual records.
+        """
+        with self.metrics.stage('write'):
+            batch = ProductBatch.from_records(products)
+            sink.write_batch(batch)
+            self.price_deltas.observe_batch(batch)
+            self.unifier.add_batch(batch)
+            self.price_history.observe_batch(batch)
+            self.product_index.add_batch(batch)
+        return batch
+    
+    @staticmethod
+    def plain_products(batches: Iterable[ProductBatch]) -> List[Dict]:
+        """The written products as plain dicts (the JSON boundary of the list-returning API)"""
+        return [product for batch in batches for product in batch.to_dicts()]
+    
+    def observe_carried_over(self, product: Dict):
+        """Feed a product carried over from the previous snapshot to the unification stage, history and index"""
+        self.unifier.add(product)
+        self.price_history.observe(product)
+        self.product_index.add(product)
+    
+    def write_unified_products(self):
+        """Write the cross-network products.json-style snapshot of the whole meat catalog"""
+        with self.metrics.stage('write'):
+            snapshot = self.unifier.snapshot()
+            self.unifier.write(self.unified_output_path, snapshot)
+            try:
+                snapshot_bytes = write_catalog_snapshot(self.unified_snapshot_path, snapshot)
+            except (OSError, struct.error) as e:
+                print(f"⚠️  Could not write binary catalog snapshot: {e}")
+                snapshot_bytes = 0
+        
+        self.stats['unification'] = dict(self.unifier.metrics(), binary_snapshot_bytes=snapshot_bytes)
+        counts = self.stats['unification']
+        print(f"🔗 Unified {counts['rows']} rows into {counts['unified_products']} products "
+              f"({counts['cross_network_products']} in 2+ networks) -> {self.unified_output_path}")
+        if snapshot_bytes:
+            print(f"📦 Binary catalog snapshot: {snapshot_bytes / 1024:.1f} KiB -> {self.unified_snapshot_path}")
+    
+    def write_price_history(self):
+        """Append today's lowest price per (retailer, product) to the price history"""
+        try:
+            with self.metrics.stage('write'):
+                self.price_history.flush()
+        except OSError as e:
+            print(f"⚠️  Could not update price history: {e}")
+        finally:
+            self.price_history.close()
+        
+        self.stats['price_history'] = self.price_history.metrics()
+        counts = self.stats['price_history']
+        print(f"📈 Price history: {counts['appended']} points appended, {counts['updated']} updated "
+              f"({counts['series']} series) -> {self.price_history_path}")
+    
+    def open_manifest(self):
+        """Load the processed-file manifest (None on a full refresh) and the last-known prices"""
+        self.refresh_vocabulary()
+        self.unifier = CrossRetailerUnifier()
+        self.price_history = PriceHistoryStore(self.price_history_path)
+        self.product_index = ProductIndex()
+        self.price_deltas = PriceDeltaTracker(self.price_state_path)
+        self.manifest = None
+        if self.incremental:
+            self.manifest = ProcessedFileManifest(
+                Path(self.data_folder) / MANIFEST_FILE_NAME, self.classification_fingerprint())
+    
+    def finish_price_deltas(self, replaced_files=None):
+        """Write this run's insert/update/delete feed and persist the last-known prices"""
+        deltas = self.price_deltas.finish(replaced_files)
+        with JsonLinesSink(self.delta_output_path) as sink:
+            sink.write_batch(deltas)
+        self.price_deltas.save()
+        
+        self.stats['deltas'] = self.price_deltas.metrics()
+        counts = self.stats['deltas']
+        print(f"🔁 Price deltas: {counts['inserts']} inserts, {counts['updates']} updates, "
+              f"{counts['deletions']} deletions ({counts['unchanged']} unchanged) -> {self.delta_output_path}")
+    
+    def save_manifest(self):
+        """Persist the manifest once the merged snapshot has been written"""
+        if self.manifest is not None:
+            self.manifest.save()
+            print(f"📒 Manifest tracks {len(self.manifest)} processed price files")
+    
+    def is_new_price_file(self, price_file: Path) -> bool:
+        """True for a price file that is new or changed since it was last processed"""
+        if parse_price_file_name(price_file) is None:
+            return False
+        
+        if self.manifest is not None and self.manifest.is_unchanged(price_file):
+            self.stats['ingest']['unchanged_files'] += 1
+            return False
+        return True
+    
+    def record_processed_file(self, price_file: Path, worker_stats: Dict):
+        """Add a file filtered by a worker to the manifest unless the worker hit an error"""
+        if self.manifest is not None and not worker_stats['errors']:
+            self.manifest.record(price_file)
+    
+    def filter_price_file(self, price_file: Path) -> List[Dict]:
+        """Ingest, filter and enrich a single price file"""
+        products = self.iter_meat_products(self.iter_downloaded_products([Path(price_file)]))
+        return list(self.metrics.timed('filter', products))
+    
+    def iter_downloaded_products(self, price_files: Optional[List[Path]] = None) -> Iterator[Dict]:
+        """Stream product dicts from the downloaded price files, one item at a time"""
+        if price_files is None:
+            price_files = find_price_files(self.data_folder)
+        
+        ingest = self.stats['ingest']
+        for price_file in price_files:
+            chain = source_file_key(price_file)[0]
+            items = ingest['items']
+            try:
+                yield from self.metrics.timed('parse', iter_price_file_products(price_file, stats=ingest))
+                if self.manifest is not None:
+                    self.manifest.record(price_file)
+                self.metrics.count(chain, 'files')
+            except Exception as e:
+                # A corrupt or truncated file must not abort the whole ingest
+                error_msg = f"Price file error ({price_file.name}): {e}"
+                print(f"❌ {error_msg}")
+                self.stats['errors'].append(error_msg)
+                self.metrics.count(chain, 'errors')
+            finally:
+                self.metrics.count(chain, 'rows', ingest['items'] - items)
+    
+    def filter_price_files_parallel(self, price_files: List[Path], workers: int) -> Iterator[Dict]:
+        """Fan per-file ingest + filter + enrich out to a process pool, yielding results in file order"""
+        self.refresh_vocabulary()
+        print(f"⚡ Parallel filtering of {len(price_files)} files on {workers} worker processes")
+        
+        with self.create_filter_pool(workers) as executor:
+            # map() returns results in submission order, so merged output and stats are deterministic
+            results = executor.map(_filter_price_file_worker, [str(price_file) for price_file in price_files])
+            for price_file, (products, worker_stats, cache_counters) in zip(price_files, results):
+                self.merge_worker_stats(worker_stats, cache_counters)
+                self.record_processed_file(price_file, worker_stats)
+                yield from products
+        
+        # Workers only ship the codes they learned; the parent persists them
+        self.barcode_catalog.save()
+    
+    def create_filter_pool(self, workers: int) -> ProcessPoolExecutor:
+        """Process pool whose workers receive the knowledge base and prebuilt vocabulary once"""
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_filter_worker,
+                                   initargs=(self.normalized_cuts, self.meat_names_mapping, self.vocabulary,
+                                             self.profile))
+    
+    def merge_worker_stats(self, worker_stats: Dict, cache_counters: Dict[str, int]):
+        """Fold the stats of one worker task into this run's stats"""
+        for counter in ('total_processed', 'meat_found', 'excluded_non_meat', 'mapping_matches'):
+            self.stats[counter] += worker_stats[counter]
+        for group in ('ingest', 'filter_paths'):
+            for counter, value in worker_stats[group].items():
+                self.stats[group][counter] = self.stats[group].get(counter, 0) + value
+        self.stats['confidence'].merge(worker_stats['confidence'])
+        self.stats['errors'].extend(worker_stats['errors'])
+        
+        self.enrichment_cache.hits += cache_counters['hits']
+        self.enrichment_cache.misses += cache_counters['misses']
+        
+        barcode_lookups = worker_stats.get('barcode_catalog', {})
+        for counter in ('hits', 'misses', 'override_hits'):
+            setattr(self.barcode_catalog, counter,
+                    getattr(self.barcode_catalog, counter) + barcode_lookups.get(counter, 0))
+        self.barcode_catalog.merge(barcode_lookups.get('new_entries', {}))
+        
+        logged_decisions = worker_stats.get('logged_decisions', {})
+        self.decision_log.logged += logged_decisions.get('logged', 0)
+        self.decision_log.printed += logged_decisions.get('printed', 0)
+        
+        self.metrics.merge(worker_stats['metrics'])
+    
     def generate_sample_government_data(self) -> List[Dict]:
         """Generate sample government data for testing (replace with actual scraper output)"""
         
@@ -205,271 +656,266 @@ class BasarometerGovernmentIntegration:
         print(f"📊 Generated {len(sample_data)} sample government products for testing")
         return sample_data
     
-    async def filter_meat_products(self, data: List[Dict]) -> List[Dict]:
+    async def filter_meat_products(self, data: Iterable[Dict]) -> List[Dict]:
         """Filter ONLY meat products using comprehensive Basarometer knowledge base + strict validation"""
         
         print("🥩 APPLYING STRICT MEAT-ONLY FILTERING...")
         
-        # Load comprehensive meat keywords from existing mappings
-        hebrew_meat_keywords = set()
-        english_meat_keywords = set()
+        # Thin list wrapper around the streaming pipeline (kept for backward compatibility)
+        filtered_products = ProductBatch.from_records(self.iter_meat_products(data))
+        self.product_index.add_batch(filtered_products)
         
-        # Extract from meat_names_mapping (high confidence meat products)
-        for hebrew_name, english_name in self.meat_names_mapping.items():
-            # Split compound Hebrew names for better matching
-            hebrew_words = hebrew_name.replace('_', ' ').split()
-            hebrew_meat_keywords.update(hebrew_words)
-            
-            # Split compound English names
-            english_words = english_name.replace('_', ' ').split()
-            english_meat_keywords.update(english_words)
-        
-        # Extract from normalized_cuts (confirmed meat cuts)
-        for cut_data in self.normalized_cuts.values():
-            if isinstance(cut_data, dict):
-                if 'hebrew_name' in cut_data:
-                    hebrew_meat_keywords.add(cut_data['hebrew_name'])
-                if 'english_name' in cut_data:
-                    english_meat_keywords.add(cut_data['english_name'])
-        
-        # STRICT meat-only keywords (no dairy, produce, etc.)
-        core_meat_keywords_hebrew = {
-            # Primary meat types
-            'בקר', 'עוף', 'כבש', 'טלה', 'עגל', 'תרנגול', 'דק', 'אווז', 'בר',
-            
-            # Beef cuts - בקר
-            'אנטריקוט', 'פילה', 'סינטה', 'שייטל', 'פיקניה', 'ריב איי', 'דנוור',
-            'בריסקט', 'אסאדו', 'אונטריב', 'וייסבראטן', 'אוסבוקו', 'ואסיו', 'פלאנק',
-            'טי-בון', 'טומהוק', 'פורטרהאוס', 'וואגיו', 'אנגוס', 'קובה',
-            
-            # Chicken parts - עוף
-            'חזה', 'שוקיים', 'ירכיים', 'כנפיים', 'שניצל', 'פרגיות', 'פילה',
-            'לבבות', 'כבד', 'קיבות', 'צוואר', 'רגלי', 'עור',
-            
-            # Lamb/Mutton - כבש/טלה
-            'צלעות', 'כתף', 'צווארון', 'רגל', 'חזה',
-            
-            # Veal - עגל
-            'קוטלט', 'מדליונים', 'כליות', 'שקדים',
-            
-            # Ground/Processed - טחון/מעובד
-            'טחון', 'קציצות', 'נקניקיות', 'קבב', 'מרגז', 'חטיפי', 'המבורגר',
-            'פסטרמה', 'סלמי', 'צ\'וריצו', 'ברטווסט', 'מרגזיה',
-            
-            # Organ meats - איברים
-            'לשון', 'לחי', 'מוח', 'זנב', 'לב', 'ריאות', 'כליות', 'כבד', 'קרביים',
-            
-            # Quality indicators
-            'טרי', 'קפוא', 'מעושן', 'מתובל', 'במרינדה', 'אורגני', 'פרמיום', 'מהדרין', 'בשר'
-        }
+        # Log filtering statistics
+        self.print_filtering_stats()
         
-        # EXCLUSION keywords - products that are NOT meat
-        exclusion_keywords_hebrew = {
-            # Dairy products
-            'חלב', 'גבינה', 'יוגורט', 'חמאה', 'שמנת', 'קוטג\'', 'צפתית', 'עמק', 'תנובה',
-            'לבן', 'חלבי', 'מעדן', 'פודינג', 'גלידה', 'חמצה',
-            
-            # Produce
-            'תפוח', 'בננה', 'תפוז', 'עגבניה', 'מלפפון', 'חסה', 'גזר', 'בצל',
-            'תפוח אדמה', 'ירקות', 'פירות', 'קישוא', 'פלפל', 'חציל',
-            
-            # Grains/Bakery
-            'לחם', 'פיתה', 'חלה', 'עוגה', 'עוגיה', 'ביסקוויט', 'קרקר', 'דגנים',
-            'אורז', 'פסטה', 'מקרוני', 'קוסקוס', 'בורגול', 'שיבולת שועל',
-            
-            # Beverages
-            'מיץ', 'משקה', 'קולה', 'מים', 'בירה', 'יין', 'שמפניה', 'וודקה',
-            'קפה', 'תה', 'חליב', 'אנרגיה',
-            
-            # Pantry/Condiments
-            'שמן', 'חומץ', 'קטשופ', 'מיונז', 'חרדל', 'ממרח', 'ריבה', 'דבש',
-            'סוכר', 'מלח', 'פלפל', 'תבלין', 'רוטב', 'חרוסת',
-            
-            # Fish (separate category from meat)
-            'דג', 'סלמון', 'טונה', 'סרדין', 'הרינג', 'מקרל', 'קרפיון', 'דניס',
-            'לברק', 'פילה דג', 'קווה', 'דג מעושן', 'דגים',
-            
-            # Household items
-            'נייר', 'סבון', 'שמפו', 'ניקוי', 'חיתול', 'טואלט', 'מפיות'
-        }
+        return filtered_products.to_dicts()
+    
+    def iter_meat_products(self, data: Iterable[Dict]) -> Iterator[Dict]:
+        """Lazily yield enhanced meat products, updating stats as each row is consumed"""
         
-        # Combine all meat keywords
-        all_meat_keywords = core_meat_keywords_hebrew.union(hebrew_meat_keywords)
+        # Reuse the prebuilt vocabulary, reloading only if the mapping files changed on disk
+        self.refresh_vocabulary()
         
-        filtered_products = []
-        self.stats['total_processed'] = len(data)
+        # Per-product output is off by default; checking the flag keeps the loop free of I/O
+        log = self.decision_log
+        catalog = self.barcode_catalog
+        category_decision = self.vocabulary.category_decision
+        filter_paths = self.stats['filter_paths']
         
         for product in data:
-            hebrew_name = product.get('name_hebrew', '').lower()
-            english_name = product.get('name_english', '').lower()
-            full_product_name = f"{hebrew_name} {english_name}"
+            self.stats['total_processed'] += 1
+            
+            # Barcode catalog: a code classified before (in any chain) is a single hash lookup
+            barcode_key = catalog.key(product)
+            classification = catalog.get(barcode_key) if barcode_key else None
+            
+            if classification is not None:
+                filter_paths['barcode_catalog'] += 1
+            else:
+                # Category fast path: clearly non-meat categories are decided without name analysis
+                path = category_decision(product.get('category'))
+                if path == 'excluded':
+                    filter_paths['category_non_meat'] += 1
+                    self.stats['excluded_non_meat'] += 1
+                    if log.enabled:
+                        log.decision('excluded', product)
+                    continue
+                filter_paths['text_matcher'] += 1
+                
+                # Repeated names (every store, every day) reuse the cached classification
+                cache_key = self.classification_cache_key(product)
+                classification = self.enrichment_cache.get(cache_key)
+                if classification is None:
+                    classification = self.classify_product(product)
+                    self.enrichment_cache.put(cache_key, classification)
+                
+                if barcode_key:
+                    classification = catalog.learn(barcode_key, classification)
             
-            # EXCLUSION CHECK FIRST - reject if contains non-meat keywords
-            is_excluded = any(exclusion_word in full_product_name 
-                            for exclusion_word in exclusion_keywords_hebrew)
+            decision = classification['decision']
             
-            if is_excluded:
+            if decision == 'excluded':
                 self.stats['excluded_non_meat'] += 1
-                print(f"❌ EXCLUDED: {hebrew_name} (contains non-meat keywords)")
+                if log.enabled:
+                    log.decision(decision, product)
                 continue
             
-            # MEAT INCLUSION CHECK - must contain meat keywords
-            contains_meat_keyword = any(meat_word in full_product_name 
-                                      for meat_word in all_meat_keywords)
+            if decision == 'no_meat_keywords':
+                if log.enabled:
+                    log.decision(decision, product)
+                continue
             
-            # MAPPING VALIDATION - check against our known meat mappings
-            has_mapping_match = any(mapped_hebrew.lower() in hebrew_name 
-                                  for mapped_hebrew in self.meat_names_mapping.keys())
+            confidence = classification['confidence']
             
-            # STRICT FILTERING: Must pass meat keyword OR mapping match
-            if contains_meat_keyword or has_mapping_match:
-                # Additional validation - calculate confidence score
-                confidence = self.calculate_meat_confidence(product, all_meat_keywords)
-                
-                # Only include products with high meat confidence (80%+)
-                if confidence >= 0.80:
-                    enhanced_product = self.enhance_with_basarometer_data(product)
-                    enhanced_product['meat_confidence_score'] = confidence
-                    enhanced_product['filtering_source'] = 'basarometer_strict_filter'
-                    
-                    filtered_products.append(enhanced_product)
-                    self.stats['meat_found'] += 1
-                    self.stats['confidence_scores'].append(confidence)
-                    
-                    if has_mapping_match:
-                        self.stats['mapping_matches'] += 1
-                    
-                    print(f"✅ INCLUDED: {hebrew_name} (confidence: {confidence:.2f})")
-                else:
-                    print(f"⚠️  LOW CONFIDENCE: {hebrew_name} (confidence: {confidence:.2f})")
-            else:
-                print(f"❌ NO MEAT KEYWORDS: {hebrew_name}")
-        
-        # Log filtering statistics
-        self.print_filtering_stats()
+            if decision == 'low_confidence':
+                if log.enabled:
+                    log.decision(decision, product, confidence)
+                continue
+            
+            # Only the price/retailer fields of the row differ from the cached result
+            with self.metrics.stage('enrich'):
+                enhanced_product = self.merge_enrichment(product, classification['enrichment'])
+            enhanced_product['meat_confidence_score'] = confidence
+            enhanced_product['filtering_source'] = 'basarometer_strict_filter'
+            
+            self.stats['meat_found'] += 1
+            self.stats['confidence'].add(confidence, product.get('retailer', ''),
+                                         normalize_category(product.get('category')))
+            
+            if classification['has_mapping_match']:
+                self.stats['mapping_matches'] += 1
+            
+            if log.enabled:
+                log.decision('included', product, confidence)
+            yield enhanced_product
         
-        return filtered_products
+        self.enrichment_cache.save()
+        catalog.save()
+        log.flush(wait=True)
+    
+    def classification_cache_key(self, product: Dict) -> tuple:
+        """Normalized name + category: exactly the fields classification depends on"""
+        return (product.get('name_hebrew', ''),
+                product.get('name_english', '').lower(),
+                product.get('category', '').lower())
     
-    def calculate_meat_confidence(self, product: Dict, meat_keywords: set) -> float:
-        """Calculate confidence that product is actually meat"""
-        product_name = (product.get('name_hebrew', '') + ' ' + 
-                       product.get('name_english', '')).lower()
+    def classification_fingerprint(self) -> str:
+        """Identity of the classifier (logic version + knowledge base content) for cache validation"""
+        return f"v{CLASSIFICATION_VERSION}:{self.vocabulary.content_hash}"
+    
+    def classify_product(self, product: Dict) -> Dict:
+        """Filter decision, confidence and Basarometer enrichment for one product name"""
+        # One scan of the name drives the decision, the confidence and the quality grade
+        profile = self.match_profile(product)
+        decision = profile.decision
+        
+        classification = {
+            'decision': decision,
+            'confidence': None,
+            'has_mapping_match': False,
+            'enrichment': None
+        }
         
-        confidence_score = 0.0
+        # EXCLUSION CHECK FIRST - reject if contains non-meat keywords
+        if decision == 'excluded':
+            return classification
         
-        # Base score for containing meat keywords
-        meat_keyword_matches = sum(1 for keyword in meat_keywords 
-                                 if keyword.lower() in product_name)
-        confidence_score += min(meat_keyword_matches * 0.25, 0.5)
+        # MAPPING VALIDATION - known meat mappings in the Hebrew part of the name
+        classification['has_mapping_match'] = profile.has_mapping_match
         
-        # Bonus for specific meat type identification
-        meat_types = ['בקר', 'עוף', 'כבש', 'עגל', 'טלה']
-        if any(meat_type in product_name for meat_type in meat_types):
-            confidence_score += 0.25
+        # STRICT FILTERING: Must pass meat keyword OR mapping match
+        if decision == 'no_meat_keywords':
+            return classification
         
-        # Bonus for meat-specific terms
-        meat_specific = ['חזה', 'שוקיים', 'כנפיים', 'אנטריקוט', 'פילה', 'צלעות']
-        if any(term in product_name for term in meat_specific):
-            confidence_score += 0.25
+        # Only products with high meat confidence (80%+) get enriched
+        classification['confidence'] = profile.confidence
+        if decision == 'included':
+            with self.metrics.stage('enrich'):
+                classification['enrichment'] = self.compute_basarometer_enrichment(product, profile)
+        return classification
+    
+    def match_profile(self, product: Dict) -> MatchProfile:
+        """Single-pass match profile of a product's name and category"""
+        return self.vocabulary.match_profile(product.get('name_hebrew', ''),
+                                             product.get('name_english', ''),
+                                             product.get('category', ''))
+    
+    def knowledge_base_fingerprint(self):
+        """Change marker (mtime + size) of the knowledge base files on disk"""
+        return source_fingerprint([self.normalized_cuts_path, self.meat_names_mapping_path])
+    
+    def refresh_vocabulary(self) -> bool:
+        """Reload the knowledge base and rebuild the vocabulary only if the source files changed"""
+        fingerprint = self.knowledge_base_fingerprint()
+        if fingerprint == self.vocabulary.source_fingerprint:
+            return False
         
-        # Bonus for existing mapping match
-        if any(mapped_name.lower() in product_name 
-               for mapped_name in self.meat_names_mapping.keys()):
-            confidence_score += 0.3
+        print("🔄 Knowledge base files changed, rebuilding filter vocabulary...")
+        self.normalized_cuts, self.meat_names_mapping, vocabulary = self.load_knowledge_base(fingerprint)
+        self.rebuild_vocabulary(fingerprint, vocabulary)
+        return True
+    
+    def rebuild_vocabulary(self, fingerprint=None, vocabulary: Optional[FilterVocabulary] = None):
+        """Rebuild the vocabulary from the currently loaded knowledge base (or use a prebuilt one)"""
+        if fingerprint is None:
+            fingerprint = self.vocabulary.source_fingerprint
         
-        # Bonus for category match
-        category = product.get('category', '').lower()
-        meat_categories = ['בשר', 'עוף', 'כבש', 'בקר', 'בשר מעובד']
-        if any(cat in category for cat in meat_categories):
-            confidence_score += 0.2
+        self.vocabulary = vocabulary or FilterVocabulary.build(
+            self.normalized_cuts, self.meat_names_mapping, fingerprint)
+        self.stats['vocabulary'] = self.vocabulary.metrics()
+        self.stats['vocabulary_builds'] += 1
         
-        return min(confidence_score, 1.0)
+        # Cached classifications were derived from the previous knowledge base
+        self.enrichment_cache.reset(self.classification_fingerprint())
+        self.barcode_catalog.reset(self.classification_fingerprint())
+    
+    def calculate_meat_confidence(self, product: Dict, meat_keywords: Optional[set] = None) -> float:
+        """Calculate confidence that product is actually meat
+
+        meat_keywords is kept for backward compatibility; the vocabulary's keywords are used.
+        """
+        return self.match_profile(product).confidence
     
     def enhance_with_basarometer_data(self, product: Dict) -> Dict:
         """Enhance government product with existing Basarometer intelligence"""
-        enhanced = product.copy()
+        return self.merge_enrichment(product, self.compute_basarometer_enrichment(product)).to_dict()
+    
+    def compute_basarometer_enrichment(self, product: Dict, profile: Optional[MatchProfile] = None) -> Dict:
+        """Basarometer intelligence fields for a product name (independent of price/retailer)"""
+        enrichment = {}
         
         # Try to match with existing normalized cuts
         best_match = self.find_best_cut_match(product.get('name_hebrew', ''))
         if best_match:
-            enhanced['basarometer_match'] = best_match
-            enhanced['normalized_cut_id'] = best_match.get('normalized_id')
-            enhanced['category_mapping'] = best_match.get('category')
-            enhanced['quality_grade'] = self.determine_quality_grade(product)
+            enrichment['basarometer_match'] = best_match
+            enrichment['normalized_cut_id'] = best_match.get('normalized_id')
+            enrichment['category_mapping'] = best_match.get('category')
+            enrichment['quality_grade'] = self.determine_quality_grade(product, profile)
         
         # Enhance with mapping intelligence
         hebrew_name = product.get('name_hebrew', '')
         if hebrew_name in self.meat_names_mapping:
-            enhanced['english_mapping'] = self.meat_names_mapping[hebrew_name]
-            enhanced['mapping_confidence'] = 0.95
+            enrichment['english_mapping'] = self.meat_names_mapping[hebrew_name]
+            enrichment['mapping_confidence'] = 0.95
         else:
             # Try fuzzy matching
             fuzzy_match = self.find_fuzzy_mapping(hebrew_name)
             if fuzzy_match:
-                enhanced['english_mapping'] = fuzzy_match['english']
-                enhanced['mapping_confidence'] = fuzzy_match['confidence']
+                enrichment['english_mapping'] = fuzzy_match['english']
+                enrichment['mapping_confidence'] = fuzzy_match['confidence']
+        
+        return enrichment
+    
+    def merge_enrichment(self, product: Dict, enrichment: Dict) -> ProductRecord:
+        """Compact record of the row fields and the enrichment fields"""
+        enhanced = ProductRecord(product)
+        enhanced.update(enrichment)
+        if 'basarometer_match' in enrichment:
+            # The enrichment is the cached classification: callers get their own copy
+            enhanced['basarometer_match'] = dict(enrichment['basarometer_match'])
         
         enhanced['source'] = 'government_enhanced'
-        enhanced['processed_at'] = datetime.now().isoformat()
+        enhanced.processed_at = time.time()  # rendered as an ISO timestamp when read
         enhanced['basarometer_processed'] = True
         
         return enhanced
     
     def find_best_cut_match(self, hebrew_name: str) -> Optional[Dict]:
         """Find best matching normalized cut using existing data"""
-        best_match = None
-        best_score = 0
-        
-        for cut_id, cut_data in self.normalized_cuts.items():
-            if isinstance(cut_data, dict) and 'hebrew_name' in cut_data:
-                similarity = SequenceMatcher(None, hebrew_name, cut_data['hebrew_name']).ratio()
-                if similarity > best_score and similarity > 0.7:  # 70% similarity threshold
-                    best_score = similarity
-                    best_match = {
-                        'normalized_id': cut_id,
-                        'hebrew_name': cut_data['hebrew_name'],
-                        'english_name': cut_data.get('english_name', ''),
-                        'category': cut_data.get('category', ''),
-                        'similarity_score': similarity
-                    }
-        
-        return best_match
+        # Indexed lookup: same result as scoring every cut, 70% similarity threshold
+        match = self.vocabulary.cut_index.best_match(hebrew_name)
+        if match is None:
+            return None
+        
+        index, similarity = match
+        cut_id = self.vocabulary.cut_ids[index]
+        cut_data = self.normalized_cuts[cut_id]
+        return {
+            'normalized_id': cut_id,
+            'hebrew_name': cut_data['hebrew_name'],
+            'english_name': cut_data.get('english_name', ''),
+            'category': cut_data.get('category', ''),
+            'similarity_score': similarity
+        }
     
     def find_fuzzy_mapping(self, hebrew_name: str) -> Optional[Dict]:
         """Find fuzzy match in meat names mapping"""
-        best_match = None
-        best_score = 0
-        
-        for mapped_hebrew, mapped_english in self.meat_names_mapping.items():
-            similarity = SequenceMatcher(None, hebrew_name, mapped_hebrew).ratio()
-            if similarity > best_score and similarity > 0.75:  # 75% similarity for mapping
-                best_score = similarity
-                best_match = {
-                    'hebrew': mapped_hebrew,
-                    'english': mapped_english,
-                    'confidence': similarity
-                }
-        
-        return best_match
-    
-    def determine_quality_grade(self, product: Dict) -> str:
+        # Indexed lookup: same result as scoring every mapping, 75% similarity threshold
+        match = self.vocabulary.mapping_index.best_match(hebrew_name)
+        if match is None:
+            return None
+        
+        index, similarity = match
+        mapped_hebrew = self.vocabulary.mapping_names[index]
+        return {
+            'hebrew': mapped_hebrew,
+            'english': self.meat_names_mapping[mapped_hebrew],
+            'confidence': similarity
+        }
+    
+    def determine_quality_grade(self, product: Dict, profile: Optional[MatchProfile] = None) -> QualityGrade:
         """Determine quality grade using Basarometer intelligence"""
-        product_name = (product.get('name_hebrew', '') + ' ' + 
-                       product.get('name_english', '')).lower()
-        
-        # Quality grade keywords from existing data
-        if any(word in product_name for word in ['וואגיו', 'wagyu', 'א5', 'a5']):
-            return 'wagyu'
-        elif any(word in product_name for word in ['אנגוס', 'angus']):
-            return 'angus'  
-        elif any(word in product_name for word in ['פרימיום', 'premium', 'פרמיום']):
-            return 'premium'
-        elif any(word in product_name for word in ['אורגני', 'organic', 'ביו']):
-            return 'organic'
-        elif any(word in product_name for word in ['עגל', 'veal']):
-            return 'veal'
-        else:
-            return 'regular'
+        return (profile or self.match_profile(product)).quality_grade
     
     def print_filtering_stats(self):
         """Print comprehensive filtering statistics"""
@@ -478,10 +924,37 @@ class BasarometerGovernmentIntegration:
         print(f"   Meat products found: {self.stats['meat_found']}")
         print(f"   Non-meat excluded: {self.stats['excluded_non_meat']}")
         print(f"   Mapping matches: {self.stats['mapping_matches']}")
+        print(f"   Filter vocabulary: {self.vocabulary.size} keywords "
+              f"(built in {self.vocabulary.build_seconds * 1000:.1f}ms)")
+        
+        self.stats['enrichment_cache'] = self.enrichment_cache.metrics()
+        self.stats['barcode_catalog'] = self.barcode_catalog.metrics()
+        print(f"   Enrichment cache: {self.enrichment_cache.hits} hits, "
+              f"{self.enrichment_cache.misses} misses "
+              f"({self.stats['enrichment_cache']['hit_rate'] * 100:.1f}% hit rate)")
+        
+        filter_paths = self.stats['filter_paths']
+        routed = sum(filter_paths.values())
+        if routed:
+            print(f"   Filter paths: {filter_paths['barcode_catalog'] / routed:.1%} barcode catalog, "
+                  f"{filter_paths['category_non_meat'] / routed:.1%} non-meat category, "
+                  f"{filter_paths['text_matcher'] / routed:.1%} text matcher")
+            self.stats['filter_path_rates'] = {path: round(count / routed, 4)
+                                               for path, count in filter_paths.items()}
+        
+        self.stats['logging'] = self.decision_log.metrics()
+        if self.decision_log.enabled:
+            log_target = self.stats['logging']['decision_log'] or 'console only'
+            print(f"   Decision log: {self.decision_log.logged} decisions "
+                  f"({self.decision_log.printed} printed, level {self.decision_log.level}) -> {log_target}")
         
-        if self.stats['confidence_scores']:
-            avg_confidence = sum(self.stats['confidence_scores']) / len(self.stats['confidence_scores'])
-            print(f"   Average confidence: {avg_confidence:.2f}")
+        stage_seconds = self.metrics.stage_seconds
+        print("   Stage time: " + ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in stage_seconds.items()))
+        
+        confidence = self.stats['confidence']
+        if confidence.count:
+            print(f"   Average confidence: {confidence.mean:.2f} "
+                  f"(p50 {confidence.overall.quantile(0.5):.2f}, min {confidence.overall.minimum:.2f})")
         
         if self.stats['total_processed'] > 0:
             efficiency = (self.stats['excluded_non_meat'] / self.stats['total_processed']) * 100
@@ -494,27 +967,109 @@ class BasarometerGovernmentIntegration:
         self.save_filtering_stats()
     
     def save_filtering_stats(self):
-        """Save filtering statistics to JSON file"""
+        """Save filtering statistics to JSON file and export this run's metrics"""
         try:
-            stats_file = Path('/Users/yogi/Desktop/basarometer/v5/v3/logs/government-scraping-results.json')
-            stats_file.parent.mkdir(exist_ok=True)
+            stats_file = self.metrics_dir / 'government-scraping-results.json'
+            stats_file.parent.mkdir(parents=True, exist_ok=True)
             
+            stats = dict(self.stats, confidence=self.stats['confidence'].to_dict())
             with open(stats_file, 'w', encoding='utf-8') as f:
-                json.dump(self.stats, f, ensure_ascii=False, indent=2, default=str)
+                json.dump(stats, f, ensure_ascii=False, indent=2, default=str)
             
             print(f"📊 Stats saved to: {stats_file}")
         except Exception as e:
             print(f"⚠️  Could not save stats: {e}")
+        
+        if MetricsExporter(self.metrics_dir).export(self.run_metrics_summary()):
+            print(f"📈 Metrics exported to: {self.metrics_dir}")
+        
+        if isinstance(self.metrics, ProfiledRunMetrics):
+            self.write_profile_report()
+    
+    def write_profile_report(self):
+        """Write the per-stage profile dumps and allocation report next to the output file"""
+        try:
+            written = self.metrics.write_report(self.output_path.parent, self.output_path.stem)
+            print(f"🔬 Profile report: {written[-1]} ({len(written) - 1} stage dumps)")
+        except Exception as e:
+            print(f"⚠️  Could not write profile report: {e}")
+    
+    def run_metrics_summary(self) -> Dict:
+        """This run's throughput, stage timings, cache hit rates and per-chain counters"""
+        for chain, confidence in self.stats['confidence'].by_chain.items():
+            self.metrics.chains.setdefault(chain, {})['meat_products'] = confidence.count
+        
+        return self.metrics.summary(
+            self.stats['ingest']['items'] or self.stats['total_processed'],
+            filter_workers=self.filter_workers,
+            meat_products=self.stats['meat_found'],
+            errors=len(self.stats['errors']),
+            cache_hit_rate={
+                'enrichment': self.enrichment_cache.metrics()['hit_rate'],
+                'barcode_catalog': self.barcode_catalog.metrics()['hit_rate'],
+            })
+
+
+# Per-process integration instance used by parallel filter workers
+_worker_integration: Optional[BasarometerGovernmentIntegration] = None
+
+
+def _init_filter_worker(normalized_cuts: Dict, meat_names_mapping: Dict, vocabulary: FilterVocabulary,
+                        profile: bool = False):
+    """Process pool initializer: build the worker's integration from the shipped knowledge base"""
+    global _worker_integration
+    _worker_integration = BasarometerGovernmentIntegration(normalized_cuts, meat_names_mapping, vocabulary)
+    _worker_integration.profile = profile
+    
+    # Workers keep an in-memory cache only; the parent owns the persistent one
+    _worker_integration.enrichment_cache = EnrichmentCache(
+        max_entries=_worker_integration.enrichment_cache.max_entries,
+        fingerprint=_worker_integration.classification_fingerprint())
+    
+    # Workers read the barcode catalog but ship newly learned codes to the parent
+    _worker_integration.barcode_catalog.path = None
+    
+    # Each worker appends its decisions to its own log file
+    decision_log = _worker_integration.decision_log
+    if decision_log.writer is not None:
+        decision_log.close()
+        _worker_integration.decision_log = DecisionLogger(
+            decision_log.level, decision_log.sample_rate,
+            f"{decision_log.writer.path}.worker-{os.getpid()}")
+
+
+def _filter_price_file_worker(price_file: str):
+    """Ingest, filter and enrich one price file; returns (products, stats, cache counters)"""
+    integration = _worker_integration
+    integration.stats = integration.new_stats()
+    integration.metrics = integration.new_run_metrics()
+    cache, log, catalog = integration.enrichment_cache, integration.decision_log, integration.barcode_catalog
+    hits, misses, logged, printed = cache.hits, cache.misses, log.logged, log.printed
+    catalog_lookups = (catalog.hits, catalog.misses, catalog.override_hits)
+    
+    products = integration.filter_price_file(Path(price_file))
+    
+    cache_counters = {'hits': cache.hits - hits, 'misses': cache.misses - misses}
+    integration.stats['logged_decisions'] = {'logged': log.logged - logged, 'printed': log.printed - printed}
+    integration.stats['barcode_catalog'] = {
+        'hits': catalog.hits - catalog_lookups[0],
+        'misses': catalog.misses - catalog_lookups[1],
+        'override_hits': catalog.override_hits - catalog_lookups[2],
+        'new_entries': catalog.drain_new_entries(),
+    }
+    integration.stats['metrics'] = integration.metrics
+    return products, integration.stats, cache_counters
 
 
 # Test execution
-async def main():
+async def main(profile: bool = False):
     """Test the government integration with Basarometer intelligence"""
     print("🚀 BASAROMETER V8 - GOVERNMENT INTEGRATION TEST")
     print("=" * 60)
     
     # Initialize integration
     integration = BasarometerGovernmentIntegration()
+    integration.profile = integration.profile or profile
     
     # Execute government scraping with Basarometer enhancement
     enhanced_products = await integration.execute_government_scraping()
@@ -526,5 +1081,7 @@ async def main():
     return enhanced_products
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Government price ingest with Basarometer meat filtering")
+    parser.add_argument('--profile', action='store_true',
+                        help="profile every pipeline stage (cProfile + tracemalloc), same as BASAROMETER_PROFILE=1")
+    asyncio.run(main(profile=parser.parse_args().profile))
\ No newline at end of file
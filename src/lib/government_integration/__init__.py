@@ -0,0 +1,112 @@
+"""
+Support package for the government scraper integration.
+
+Holds the reusable building blocks used by
+``government-scraper-integration.py`` (which cannot be imported directly
+because of its hyphenated file name).
+"""
+
+from .barcode_catalog import BarcodeCatalog, catalog_key, is_internal_code, normalize_item_code
+from .catalog_snapshot import CatalogSnapshot, write_catalog_snapshot
+from .decision_log import DecisionLogWriter, DecisionLogger
+from .download_orchestrator import ChainDownloadOrchestrator, ChainDownloadResult, TokenBucket
+from .enrichment_cache import EnrichmentCache
+from .file_manifest import MANIFEST_FILE_NAME, ProcessedFileManifest, file_content_hash, source_file_key
+from .fuzzy_index import FuzzyIndex
+from .keyword_matcher import KeywordMatcher
+from .knowledge_base_cache import KnowledgeBaseCache, knowledge_base_hash
+from .match_profile import MEAT_CONFIDENCE_THRESHOLD, MatchProfile, QualityGrade
+from .metrics import MetricsExporter, RunMetrics, STAGES, prometheus_text
+from .pipeline import JsonLinesSink, SnapshotSink, batched, product_key, read_snapshot
+from .price_delta import PriceDeltaTracker, attributes_hash
+from .price_files import (
+    find_price_files,
+    iter_price_file_products,
+    iter_price_files_products,
+    parse_price_file_name,
+)
+from .price_history import PriceHistoryStore, history_key
+from .price_matrix import PriceMatrix, PriceStatistics
+from .product_index import ProductIndex, SortedPriceIndex
+from .profiling import ProfiledRunMetrics
+from .records import ProductBatch, ProductRecord, ProductRowView, json_default
+from .streaming_stats import GroupedStreamingStats, StreamingStats
+from .unification import CrossRetailerUnifier, UnifiedProduct, normalize_product_name, unified_product_id
+from .vocabulary import (
+    CATEGORY_DECISIONS,
+    CORE_MEAT_KEYWORDS_HEBREW,
+    CUT_SIMILARITY_THRESHOLD,
+    EXCLUSION_KEYWORDS_HEBREW,
+    FilterVocabulary,
+    MAPPING_SIMILARITY_THRESHOLD,
+    NON_MEAT_CATEGORIES,
+    normalize_category,
+    source_fingerprint,
+)
+
+__all__ = [
+    'BarcodeCatalog',
+    'CATEGORY_DECISIONS',
+    'CatalogSnapshot',
+    'ChainDownloadOrchestrator',
+    'ChainDownloadResult',
+    'CORE_MEAT_KEYWORDS_HEBREW',
+    'CUT_SIMILARITY_THRESHOLD',
+    'CrossRetailerUnifier',
+    'DecisionLogWriter',
+    'DecisionLogger',
+    'EXCLUSION_KEYWORDS_HEBREW',
+    'EnrichmentCache',
+    'FilterVocabulary',
+    'FuzzyIndex',
+    'GroupedStreamingStats',
+    'JsonLinesSink',
+    'KeywordMatcher',
+    'KnowledgeBaseCache',
+    'MANIFEST_FILE_NAME',
+    'MAPPING_SIMILARITY_THRESHOLD',
+    'MEAT_CONFIDENCE_THRESHOLD',
+    'MatchProfile',
+    'MetricsExporter',
+    'NON_MEAT_CATEGORIES',
+    'PriceDeltaTracker',
+    'PriceHistoryStore',
+    'PriceMatrix',
+    'PriceStatistics',
+    'ProcessedFileManifest',
+    'ProductBatch',
+    'ProductIndex',
+    'ProductRecord',
+    'ProductRowView',
+    'ProfiledRunMetrics',
+    'QualityGrade',
+    'RunMetrics',
+    'STAGES',
+    'SnapshotSink',
+    'SortedPriceIndex',
+    'StreamingStats',
+    'TokenBucket',
+    'UnifiedProduct',
+    'attributes_hash',
+    'batched',
+    'catalog_key',
+    'file_content_hash',
+    'find_price_files',
+    'history_key',
+    'is_internal_code',
+    'iter_price_file_products',
+    'iter_price_files_products',
+    'json_default',
+    'knowledge_base_hash',
+    'normalize_category',
+    'normalize_item_code',
+    'normalize_product_name',
+    'parse_price_file_name',
+    'product_key',
+    'prometheus_text',
+    'read_snapshot',
+    'source_file_key',
+    'source_fingerprint',
+    'unified_product_id',
+    'write_catalog_snapshot',
+]
@@ -0,0 +1,246 @@
+"""
+Barcode (ItemCode) classification catalog.
+
+The same barcode is published by every chain and store, so once an ItemCode
+has been classified its decision, confidence, normalized cut id and quality
+grade can be reused with a single hash lookup, before any text analysis.
+
+Learned entries are tied to the classification fingerprint (like the
+enrichment cache) and dropped when the knowledge base changes. Manual
+overrides are kept regardless and always win over learned entries.
+
+In-store codes (short codes, and 13-digit codes starting with 2 used for
+weighed products) are reused by different chains for different products,
+so they are scoped per chain; real barcodes are global.
+"""
+
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Enrichment fields an override may set
+OVERRIDE_ENRICHMENT_FIELDS = ('normalized_cut_id', 'category_mapping', 'quality_grade', 'english_mapping')
+
+OVERRIDE_DECISIONS = ('included', 'excluded')
+
+
+def normalize_item_code(item_code: Any) -> str:
+    """ItemCode without surrounding whitespace and leading zeros"""
+    return str(item_code or '').strip().lstrip('0')
+
+
+def is_internal_code(code: str) -> bool:
+    """True for chain-internal codes that do not identify the same product across chains"""
+    if not code.isdigit() or len(code) < 8:
+        return True
+    return len(code) == 13 and code.startswith('2')
+
+
+def catalog_key(item_code: Any, chain: str = '') -> Optional[str]:
+    """Catalog key of an ItemCode: the code itself, or 'chain:code' for in-store codes"""
+    code = normalize_item_code(item_code)
+    if not code:
+        return None
+    return f"{chain}:{code}" if is_internal_code(code) else code
+
+
+class BarcodeCatalog:
+    """ItemCode -> classification, with manual overrides and optional SQLite persistence"""
+
+    def __init__(self, path: Optional[str] = None, fingerprint: str = ''):
+        self.path = Path(path) if path else None
+        self.fingerprint = fingerprint
+
+        self.entries: Dict[str, Dict] = {}
+        self.overrides: Dict[str, Dict] = {}
+        self._new_entries: Dict[str, Dict] = {}
+        self._stale = False  # learned codes belong to another fingerprint
+        self._overrides_changed = False
+
+        self.hits = 0
+        self.misses = 0
+        self.override_hits = 0
+
+        if self.path:
+            self.load()
+
+    @staticmethod
+    def key(product: Dict) -> Optional[str]:
+        """Catalog key of a product row, None if it has no ItemCode"""
+        return catalog_key(product.get('item_code'), product.get('chain_id') or product.get('retailer', ''))
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Effective classification of a code (override applied), or None if unknown"""
+        override = self.overrides.get(key)
+        classification = self.entries.get(key)
+
+        # An override without a decision only adjusts a learned classification
+        if override is not None and (classification is not None or 'decision' in override):
+            self.override_hits += 1
+            return self.apply_override(classification, override)
+
+        if classification is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return classification
+
+    def learn(self, key: str, classification: Dict) -> Dict:
+        """Record the classification of a new code; returns it with any override applied"""
+        self.entries[key] = classification
+        self._new_entries[key] = classification
+
+        override = self.overrides.get(key)
+        return self.apply_override(classification, override) if override is not None else classification
+
+    @staticmethod
+    def apply_override(classification: Optional[Dict], override: Dict) -> Dict:
+        """Classification with the manually overridden fields replaced"""
+        result = dict(classification or {'decision': 'excluded', 'confidence': None,
+                                          'has_mapping_match': False, 'enrichment': None})
+
+        if 'decision' in override:
+            result['decision'] = override['decision']
+        if 'confidence' in override:
+            result['confidence'] = override['confidence']
+        elif result['decision'] == 'included' and result['confidence'] is None:
+            result['confidence'] = 1.0
+
+        # A code forced to 'included' without a learned enrichment gets the override fields only
+        enrichment_overrides = {field: override[field] for field in OVERRIDE_ENRICHMENT_FIELDS if field in override}
+        if result['decision'] == 'included' and (enrichment_overrides or result.get('enrichment') is None):
+            result['enrichment'] = dict(result.get('enrichment') or {}, **enrichment_overrides)
+
+        return result
+
+    def set_override(self, item_code: Any, chain: str = '', **fields):
+        """Manually pin the decision / confidence / cut id / quality grade of a code"""
+        decision = fields.get('decision')
+        if decision is not None and decision not in OVERRIDE_DECISIONS:
+            raise ValueError(f"override decision must be one of {', '.join(OVERRIDE_DECISIONS)}")
+
+        key = catalog_key(item_code, chain)
+        if key is None:
+            raise ValueError('override needs a non-empty item code')
+        if self.overrides.get(key) != fields:
+            self.overrides[key] = fields
+            self._overrides_changed = True
+
+    def remove_override(self, item_code: Any, chain: str = ''):
+        if self.overrides.pop(catalog_key(item_code, chain), None) is not None:
+            self._overrides_changed = True
+
+    def import_overrides(self, path: str) -> int:
+        """Load overrides from JSON: {"item_code" or "chain:item_code": {"decision": ..., ...}}"""
+        with open(path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+
+        for code, fields in overrides.items():
+            chain, _, item_code = code.rpartition(':')
+            self.set_override(item_code, chain, **fields)
+        return len(overrides)
+
+    def drain_new_entries(self) -> Dict[str, Dict]:
+        """Codes learned since the last call (shipped from worker processes to the parent)"""
+        new_entries, self._new_entries = self._new_entries, {}
+        return new_entries
+
+    def merge(self, entries: Dict[str, Dict]):
+        """Add codes learned by a worker process"""
+        for key, classification in entries.items():
+            if key not in self.entries:
+                self.entries[key] = classification
+                self._new_entries[key] = classification
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.override_hits
+        return {
+            'codes': len(self.entries),
+            'overrides': len(self.overrides),
+            'hits': self.hits,
+            'misses': self.misses,
+            'override_hits': self.override_hits,
+            'hit_rate': round((self.hits + self.override_hits) / lookups, 4) if lookups else 0.0,
+            'persistent': self.path is not None,
+        }
+
+    def load(self):
+        """Read overrides, and learned codes if they match the classification fingerprint"""
+        if not self.path or not self.path.exists():
+            return
+
+        try:
+            with closing(sqlite3.connect(str(self.path))) as connection:
+                self.overrides.update(
+                    (key, json.loads(fields))
+                    for key, fields in connection.execute("SELECT key, fields FROM overrides"))
+
+                row = connection.execute(
+                    "SELECT value FROM catalog_meta WHERE key = 'fingerprint'").fetchone()
+                if not row or row[0] != self.fingerprint:
+                    print("⚠️  Barcode catalog was built for another knowledge base, relearning codes")
+                    self._stale = True
+                    return
+
+                self.entries.update(
+                    (key, json.loads(value))
+                    for key, value in connection.execute("SELECT key, value FROM barcodes"))
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not load barcode catalog: {e}")
+            return
+
+        print(f"✅ Loaded {len(self.entries)} classified barcodes ({len(self.overrides)} overrides)")
+
+    def save(self):
+        """Persist newly learned codes (and the overrides if they changed)"""
+        if not self.path or not (self._new_entries or self._stale or self._overrides_changed):
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(str(self.path))) as connection, connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS catalog_meta (key TEXT PRIMARY KEY, value TEXT)")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS barcodes (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS overrides (key TEXT PRIMARY KEY, fields TEXT NOT NULL)")
+
+                if self._stale or self._overrides_changed:
+                    connection.execute("DELETE FROM overrides")
+                    connection.executemany(
+                        "INSERT INTO overrides (key, fields) VALUES (?, ?)",
+                        ((key, json.dumps(fields, ensure_ascii=False)) for key, fields in self.overrides.items()))
+
+                if self._stale:
+                    # Learned codes of another fingerprint are rewritten
+                    connection.execute("DELETE FROM barcodes")
+                    pending = self.entries
+                else:
+                    pending = self._new_entries
+
+                connection.executemany(
+                    "INSERT OR REPLACE INTO barcodes (key, value) VALUES (?, ?)",
+                    ((key, json.dumps(value, ensure_ascii=False)) for key, value in pending.items()))
+                connection.execute(
+                    "INSERT OR REPLACE INTO catalog_meta (key, value) VALUES ('fingerprint', ?)",
+                    (self.fingerprint,))
+
+            self._new_entries = {}
+            self._stale = False
+            self._overrides_changed = False
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not save barcode catalog: {e}")
+
+    def reset(self, fingerprint: str):
+        """Forget learned codes (overrides stay), e.g. after the knowledge base changed"""
+        self.entries.clear()
+        self._new_entries = {}
+        self.fingerprint = fingerprint
+        self._stale = True
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,261 @@
+"""
+Memory-mapped binary snapshot of the unified catalog.
+
+Consumers of the unified products.json parse the whole pretty-printed
+document on every start, which dominates their cold start and grows with
+every chain and store. The same catalog is also written as a binary
+snapshot that ``CatalogSnapshot`` memory-maps and reads on demand: a product
+is found by id or category with a few binary searches and only the records
+that are returned are decoded.
+
+Layout (little-endian, sections 8-byte aligned)::
+
+    header          magic, format, counts, metadata string, section offsets
+    strings         UTF-8 string table; every string is an (offset, length) ref
+    networks        one string ref per network
+    records         one fixed-width RECORD per product, in products.json order
+    prices          (network index, price) entries, each product's in a run
+    id index        (blake2b-64 of the id, record) sorted by hash
+    categories      (category string ref, first, count) sorted by category
+    category rows   record numbers grouped by category
+
+The JSON file stays the export format; ``CatalogSnapshot.get()`` returns the
+same product entries.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .price_matrix import price_statistics_entry, savings_entry
+
+SNAPSHOT_MAGIC = b'BSNP'
+SNAPSHOT_FORMAT = 1
+
+# magic, format, records, networks, categories, metadata ref (offset, length), reserved,
+# then the offsets of strings, networks, records, prices, id index, categories, category rows
+HEADER = struct.Struct('<4sIIIIIII7Q')
+
+STRING_REF = struct.Struct('<II')
+
+# id, name, normalized name, category, original names, created_at (string refs);
+# min, max, avg price; cheapest / most expensive network; network count; flags; first price entry
+RECORD = struct.Struct('<12I3d4HI4x')
+PRICE_ENTRY = struct.Struct('<I4xd')
+ID_ENTRY = struct.Struct('<QI4x')
+CATEGORY_ENTRY = struct.Struct('<IIII')
+ROW = struct.Struct('<I')
+
+NO_NETWORK = 0xFFFF
+NAMES_SEPARATOR = '\x1f'
+
+
+def id_hash(product_id: str) -> int:
+    return int.from_bytes(hashlib.blake2b(product_id.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+class _StringTable:
+    """Deduplicated UTF-8 string table"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.refs: Dict[str, Tuple[int, int]] = {}
+
+    def ref(self, value: str) -> Tuple[int, int]:
+        ref = self.refs.get(value)
+        if ref is None:
+            encoded = value.encode('utf-8')
+            ref = self.refs[value] = (len(self.data), len(encoded))
+            self.data += encoded
+        return ref
+
+
+def write_catalog_snapshot(path: str, snapshot: Mapping) -> int:
+    """Atomically write the binary form of a unified snapshot (CrossRetailerUnifier.snapshot()); returns its size"""
+    products = snapshot.get('products', [])
+    strings = _StringTable()
+    metadata_ref = strings.ref(json.dumps(snapshot.get('metadata', {}), ensure_ascii=False))
+
+    networks: Dict[str, int] = {}
+    records = bytearray()
+    prices = bytearray()
+    categories: Dict[str, List[int]] = {}
+    id_entries = []
+
+    price_count = 0
+    for number, product in enumerate(products):
+        for network in product['network_prices']:
+            networks.setdefault(network, len(networks))
+
+        savings = product.get('savings_analysis')
+        cheapest = networks[savings['cheapest_network']] if savings else NO_NETWORK
+        most_expensive = networks[savings['most_expensive_network']] if savings else NO_NETWORK
+        metadata = product.get('metadata', {})
+        statistics = product['price_statistics']
+
+        refs = (strings.ref(product['id']), strings.ref(product['name']),
+                strings.ref(product['normalized_name']), strings.ref(product['category']),
+                strings.ref(NAMES_SEPARATOR.join(metadata.get('original_names', []))),
+                strings.ref(metadata.get('created_at', '')))
+        records += RECORD.pack(*(value for ref in refs for value in ref),
+                               statistics['min_price'], statistics['max_price'], statistics['avg_price'],
+                               cheapest, most_expensive, len(product['network_prices']), 0, price_count)
+        for network, price in product['network_prices'].items():
+            prices += PRICE_ENTRY.pack(networks[network], price)
+            price_count += 1
+
+        categories.setdefault(product['category'], []).append(number)
+        id_entries.append((id_hash(product['id']), number))
+
+    network_section = b''.join(STRING_REF.pack(*strings.ref(network)) for network in networks)
+    id_section = b''.join(ID_ENTRY.pack(*entry) for entry in sorted(id_entries))
+    category_section, row_section = bytearray(), bytearray()
+    for category in sorted(categories):
+        rows = categories[category]
+        category_section += CATEGORY_ENTRY.pack(*strings.ref(category), len(row_section) // ROW.size, len(rows))
+        row_section += b''.join(ROW.pack(row) for row in rows)
+
+    sections = [bytes(strings.data), network_section, bytes(records), bytes(prices), id_section,
+                bytes(category_section), bytes(row_section)]
+    offsets = []
+    position = HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position = _align(position + len(section))
+
+    path = Path(path)
+    temp_path = path.with_name(path.name + '.tmp')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, len(products), len(networks), len(categories),
+                            *metadata_ref, 0, *offsets))
+        for offset, section in zip(offsets, sections):
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(section)
+    os.replace(temp_path, path)
+    return position
+
+
+class CatalogSnapshot:
+    """Read-only, memory-mapped unified catalog; decodes only the products that are looked up"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header = HEADER.unpack_from(self._map, 0)
+        magic, version, self.record_count, network_count, category_count = header[:5]
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_FORMAT:
+            self._map.close()
+            raise ValueError(f"{self.path} is not a format {SNAPSHOT_FORMAT} catalog snapshot")
+
+        self._metadata_ref = header[5:7]
+        (self._strings, self._networks, self._records, self._prices,
+         self._ids, self._categories, self._rows) = header[8:]
+
+        # Small directories, decoded once
+        self.networks = [self._string(*STRING_REF.unpack_from(self._map, self._networks + i * STRING_REF.size))
+                         for i in range(network_count)]
+        self.category_rows: Dict[str, Tuple[int, int]] = {}
+        for i in range(category_count):
+            offset, length, first, count = CATEGORY_ENTRY.unpack_from(
+                self._map, self._categories + i * CATEGORY_ENTRY.size)
+            self.category_rows[self._string(offset, length)] = (first, count)
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings + offset
+        return self._map[start:start + length].decode('utf-8')
+
+    @property
+    def metadata(self) -> Dict:
+        return json.loads(self._string(*self._metadata_ref))
+
+    @property
+    def categories(self) -> List[str]:
+        return list(self.category_rows)
+
+    def record(self, number: int) -> Dict:
+        """Product entry number in the products.json schema"""
+        if not 0 <= number < self.record_count:
+            raise IndexError(number)
+
+        fields = RECORD.unpack_from(self._map, self._records + number * RECORD.size)
+        product_id, name, normalized_name, category, original_names, created_at = (
+            self._string(fields[i], fields[i + 1]) for i in range(0, 12, 2))
+        minimum, maximum, average, cheapest, most_expensive, network_count, _, first_price = fields[12:]
+
+        network_prices = {}
+        for i in range(first_price, first_price + network_count):
+            network, price = PRICE_ENTRY.unpack_from(self._map, self._prices + i * PRICE_ENTRY.size)
+            network_prices[self.networks[network]] = price
+
+        savings = None
+        if cheapest != NO_NETWORK:
+            savings = savings_entry(minimum, maximum, self.networks[cheapest], self.networks[most_expensive])
+        return {
+            'id': product_id,
+            'name': name,
+            'normalized_name': normalized_name,
+            'category': category,
+            'network_prices': network_prices,
+            'networks_available': list(network_prices),
+            'network_count': network_count,
+            'price_statistics': price_statistics_entry(minimum, maximum, average),
+            'savings_analysis': savings,
+            'metadata': {
+                'original_names': original_names.split(NAMES_SEPARATOR) if original_names else [],
+                'created_at': created_at,
+                'data_quality': 'high' if network_count >= 2 else 'medium',
+            },
+        }
+
+    def get(self, product_id: str) -> Optional[Dict]:
+        """Product by unified id (binary search over the id hashes), None if absent"""
+        target = id_hash(product_id)
+        low, high = 0, self.record_count
+        while low < high:
+            middle = (low + high) // 2
+            if ID_ENTRY.unpack_from(self._map, self._ids + middle * ID_ENTRY.size)[0] < target:
+                low = middle + 1
+            else:
+                high = middle
+
+        for i in range(low, self.record_count):
+            entry_hash, number = ID_ENTRY.unpack_from(self._map, self._ids + i * ID_ENTRY.size)
+            if entry_hash != target:
+                break
+            product = self.record(number)
+            if product['id'] == product_id:
+                return product
+        return None
+
+    def by_category(self, category: str) -> Iterator[Dict]:
+        """Products of a category, in catalog order"""
+        first, count = self.category_rows.get(category, (0, 0))
+        for i in range(first, first + count):
+            yield self.record(ROW.unpack_from(self._map, self._rows + i * ROW.size)[0])
+
+    def __iter__(self) -> Iterator[Dict]:
+        for number in range(self.record_count):
+            yield self.record(number)
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self) -> 'CatalogSnapshot':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
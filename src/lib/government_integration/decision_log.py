@@ -0,0 +1,139 @@
+"""
+Quiet, structured logging of per-product filter decisions.
+
+Printing one emoji line per product makes stdout the bottleneck of a
+million-row ingest. ``DecisionLogger`` keeps the console at summary level by
+default, prints only a sample of decisions when asked to, and can write
+every decision to a JSONL audit log through a buffered background thread so
+the hot loop never waits on disk.
+
+Levels:
+- ``summary``: no per-product output (default)
+- ``sample``: every Nth decision, N = 1 / sample_rate
+- ``verbose``: every decision (the historical behaviour)
+"""
+
+import json
+import queue
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+LOG_LEVELS = ('summary', 'sample', 'verbose')
+
+DECISION_MESSAGES = {
+    'excluded': "❌ EXCLUDED: {name} (contains non-meat keywords)",
+    'no_meat_keywords': "❌ NO MEAT KEYWORDS: {name}",
+    'low_confidence': "⚠️  LOW CONFIDENCE: {name} (confidence: {confidence:.2f})",
+    'included': "✅ INCLUDED: {name} (confidence: {confidence:.2f})",
+}
+
+
+class DecisionLogWriter:
+    """Buffered JSONL writer; full buffers are written by a background thread"""
+
+    def __init__(self, path: str, buffer_size: int = 5000):
+        self.path = Path(path)
+        self.buffer_size = buffer_size
+        self.written = 0
+
+        self._buffer: List[str] = []
+        self._queue: 'queue.Queue[Optional[List[str]]]' = queue.Queue(maxsize=16)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name='decision-log-writer', daemon=True)
+        self._thread.start()
+
+    def write(self, record: Dict):
+        self._buffer.append(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self, wait: bool = False):
+        """Hand the buffer to the writer thread; wait=True blocks until it is on disk"""
+        if self._buffer:
+            self._queue.put(self._buffer)
+            self._buffer = []
+        if wait:
+            self._queue.join()
+
+    def close(self):
+        """Flush everything and stop the writer thread"""
+        if not self._thread.is_alive():
+            return
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            while True:
+                lines = self._queue.get()
+                try:
+                    if lines is None:
+                        return
+                    f.write('\n'.join(lines) + '\n')
+                    f.flush()
+                    self.written += len(lines)
+                finally:
+                    self._queue.task_done()
+
+
+class DecisionLogger:
+    """Per-product decision output: console by level/sample rate, optional JSONL audit log"""
+
+    def __init__(self, level: str = 'summary', sample_rate: float = 0.01,
+                 decision_log_path: Optional[str] = None):
+        if level not in LOG_LEVELS:
+            raise ValueError(f"log level must be one of {', '.join(LOG_LEVELS)}")
+
+        self.level = level
+        self.sample_rate = sample_rate
+        self.writer = DecisionLogWriter(decision_log_path) if decision_log_path else None
+
+        # Deterministic sampling: every Nth decision
+        self._sample_every = max(int(round(1 / sample_rate)), 1) if sample_rate > 0 else 0
+        self.logged = 0
+        self.printed = 0
+
+        # Lets the hot loop skip building log arguments entirely
+        self.enabled = self.writer is not None or level == 'verbose' or (
+            level == 'sample' and self._sample_every > 0)
+
+    def decision(self, decision: str, product: Dict, confidence: Optional[float] = None):
+        """Record one filter decision"""
+        self.logged += 1
+
+        if self.level == 'verbose' or (
+                self.level == 'sample' and self._sample_every and self.logged % self._sample_every == 0):
+            print(DECISION_MESSAGES[decision].format(
+                name=product.get('name_hebrew', '').lower(), confidence=confidence or 0.0))
+            self.printed += 1
+
+        if self.writer is not None:
+            self.writer.write({
+                'decision': decision,
+                'name': product.get('name_hebrew', ''),
+                'confidence': round(confidence, 4) if confidence is not None else None,
+                'retailer': product.get('retailer', ''),
+                'store_id': product.get('store_id', ''),
+                'item_code': product.get('item_code', ''),
+                'source_file': product.get('source_file', ''),
+            })
+
+    def flush(self, wait: bool = False):
+        if self.writer is not None:
+            self.writer.flush(wait)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+    def metrics(self) -> Dict:
+        return {
+            'level': self.level,
+            'sample_rate': self.sample_rate,
+            'logged_decisions': self.logged,
+            'printed': self.printed,
+            'decision_log': str(self.writer.path) if self.writer else None,
+            'decision_log_written': self.writer.written if self.writer else 0,
+        }
@@ -0,0 +1,217 @@
+"""
+Concurrent, rate-limited download orchestration for the enabled chains.
+
+Every chain is its own asyncio task, so a slow chain (Shufersal) does not
+hold up the others. Downloads go through:
+- a global limit on concurrently downloading chains
+- a per-chain limit on concurrent download jobs (one job per file type)
+- a shared token bucket limiting how fast jobs are started
+- retries with exponential backoff and an optional per-attempt timeout
+- sync downloaders run in worker threads, one at a time per dump folder
+
+Downloaded files are streamed to the consumer as soon as their job finishes,
+so parsing/filtering overlaps with the remaining downloads. The downloader is
+injected, which lets tests use a local fake scraper instead of the network.
+"""
+
+import asyncio
+import inspect
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# downloader(chain, file_type, dump_folder) -> downloaded files (sync or async)
+Downloader = Callable[[str, str, Path], Sequence[Path]]
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts of up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class ChainDownloadResult:
+    """Outcome and timing of one chain's downloads"""
+
+    chain: str
+    files: List[Path] = field(default_factory=list)
+    attempts: int = 0
+    failed_jobs: int = 0
+    errors: List[str] = field(default_factory=list)
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    @property
+    def seconds(self) -> float:
+        return max(self.finished_at - self.started_at, 0.0)
+
+    def to_dict(self) -> Dict:
+        return {
+            'chain': self.chain,
+            'files': len(self.files),
+            'attempts': self.attempts,
+            'failed_jobs': self.failed_jobs,
+            'errors': list(self.errors),
+            'seconds': round(self.seconds, 3),
+        }
+
+
+class ChainDownloadOrchestrator:
+    """Schedules one asyncio task per chain and streams downloaded files as they arrive"""
+
+    def __init__(self, downloader: Downloader, dump_folder: str,
+                 file_types: Iterable[str] = ('PRICE_FILE',),
+                 max_concurrent_chains: int = 4, per_chain_concurrency: int = 1,
+                 rate_per_second: float = 2.0, burst: float = 2.0,
+                 max_retries: int = 3, backoff_base: float = 1.0, backoff_max: float = 30.0,
+                 attempt_timeout: Optional[float] = None):
+        self.downloader = downloader
+        self.dump_folder = Path(dump_folder)
+        self.file_types = list(file_types)
+        self.max_concurrent_chains = max_concurrent_chains
+        self.per_chain_concurrency = per_chain_concurrency
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.attempt_timeout = attempt_timeout
+
+        self.results: Dict[str, ChainDownloadResult] = {}
+        self._folder_locks: Dict[Path, asyncio.Lock] = {}
+
+    async def _call_downloader(self, chain: str, file_type: str, folder: Path) -> List[Path]:
+        """Run the downloader (async, or sync in a worker thread) with the attempt timeout"""
+        if inspect.iscoroutinefunction(self.downloader):
+            call = self.downloader(chain, file_type, folder)
+        else:
+            call = self._call_sync_downloader(chain, file_type, folder)
+
+        if self.attempt_timeout:
+            files = await asyncio.wait_for(call, timeout=self.attempt_timeout)
+        else:
+            files = await call
+        return [Path(path) for path in files or []]
+
+    async def _call_sync_downloader(self, chain: str, file_type: str, folder: Path) -> Sequence[Path]:
+        """Run a sync downloader in a worker thread, one at a time per folder
+
+        A thread cannot be cancelled: a timed-out download keeps running and
+        its folder stays locked until it finishes, so a retry waits for it
+        (within its own timeout) instead of starting a second scraper in the
+        same folder.
+        """
+        lock = self._folder_locks.setdefault(folder, asyncio.Lock())
+        await lock.acquire()
+        thread = asyncio.ensure_future(asyncio.to_thread(self.downloader, chain, file_type, folder))
+        thread.add_done_callback(lambda _: lock.release())
+        return await asyncio.shield(thread)
+
+    async def _download_job(self, chain: str, file_type: str, result: ChainDownloadResult,
+                            rate_limiter: TokenBucket) -> List[Path]:
+        """One (chain, file type) download with retry and exponential backoff"""
+        folder = self.dump_folder / chain
+
+        for attempt in range(self.max_retries + 1):
+            await rate_limiter.acquire()
+            result.attempts += 1
+            try:
+                return await self._call_downloader(chain, file_type, folder)
+            except Exception as e:
+                error = f"{chain}/{file_type} attempt {attempt + 1}: {type(e).__name__}: {e}"
+                result.errors.append(error)
+                if attempt == self.max_retries:
+                    break
+                delay = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+                await asyncio.sleep(delay * (0.5 + random.random() / 2))
+
+        result.failed_jobs += 1
+        return []
+
+    async def _run_chain(self, chain: str, queue: asyncio.Queue,
+                         chain_slots: asyncio.Semaphore, rate_limiter: TokenBucket):
+        """Download every file type of a chain, pushing files to the queue as jobs finish"""
+        result = ChainDownloadResult(chain=chain)
+        self.results[chain] = result
+        job_slots = asyncio.Semaphore(self.per_chain_concurrency)
+        seen = set()
+
+        async def run_job(file_type: str):
+            async with job_slots:
+                files = await self._download_job(chain, file_type, result, rate_limiter)
+            for path in files:
+                if path not in seen:
+                    seen.add(path)
+                    result.files.append(path)
+                    await queue.put((chain, path))
+
+        async with chain_slots:
+            result.started_at = time.perf_counter()
+            try:
+                await asyncio.gather(*(run_job(file_type) for file_type in self.file_types))
+            finally:
+                result.finished_at = time.perf_counter()
+
+    async def stream(self, chains: Iterable[str]) -> AsyncIterator[Tuple[str, Path]]:
+        """Yield (chain, file) pairs as soon as each download job completes"""
+        queue: asyncio.Queue = asyncio.Queue()
+        chain_slots = asyncio.Semaphore(self.max_concurrent_chains)
+        rate_limiter = TokenBucket(self.rate_per_second, self.burst)
+        self._folder_locks = {}
+        done = object()
+
+        tasks = [asyncio.create_task(self._run_chain(chain, queue, chain_slots, rate_limiter))
+                 for chain in chains]
+
+        async def close_when_done():
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await queue.put(done)
+
+        closer = asyncio.create_task(close_when_done())
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            closer.cancel()
+
+    async def run(self, chains: Iterable[str]) -> Dict[str, ChainDownloadResult]:
+        """Download everything without streaming; returns the per-chain results"""
+        async for _ in self.stream(chains):
+            pass
+        return self.results
+
+    def timings(self) -> Dict[str, Dict]:
+        """Per-chain timing and outcome for the stats report"""
+        return {chain: result.to_dict() for chain, result in self.results.items()}
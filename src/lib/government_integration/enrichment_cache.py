@@ -0,0 +1,160 @@
+"""
+Memoized per-name classification results.
+
+Government price files repeat the same product names across every store of
+a chain and day after day. ``EnrichmentCache`` keeps the filter decision,
+confidence and Basarometer enrichment per normalized name in a bounded LRU,
+optionally persisted to SQLite so restarts start warm.
+
+Saves are incremental: only the entries used or added since the last save
+are written (with their new LRU position) and evicted entries deleted, so
+saving after every price file costs the work done on that file, not the
+size of the cache.
+"""
+
+import json
+import sqlite3
+from collections import OrderedDict
+from contextlib import closing
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+CacheKey = Tuple[str, ...]
+
+
+class EnrichmentCache:
+    """Bounded LRU cache of classification results with hit/miss counters"""
+
+    def __init__(self, max_entries: int = 100000, path: Optional[str] = None, fingerprint: str = ''):
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        self.fingerprint = fingerprint
+
+        self._entries: 'OrderedDict[Hashable, Dict[str, Any]]' = OrderedDict()
+
+        # Changes since the last save; touched keys are always the newest entries of the LRU
+        self._touched = set()
+        self._evicted = set()
+        self._cleared = True  # The stored table does not match the cache (until loaded)
+        self._next_position = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.path:
+            self.load()
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Cached classification for key, or None (counts a hit or a miss)"""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._touched.add(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: CacheKey, value: Dict[str, Any]):
+        """Store a classification, evicting the least recently used entry when full"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._touched.add(key)
+        self._evicted.discard(key)
+
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._touched.discard(evicted)
+            self._evicted.add(evicted)
+            self.evictions += 1
+
+    def reset(self, fingerprint: str):
+        """Drop every entry, e.g. after the knowledge base changed"""
+        self._entries.clear()
+        self.fingerprint = fingerprint
+        self._touched.clear()
+        self._evicted.clear()
+        self._cleared = True
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit/miss counters for the stats report"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'persistent': self.path is not None,
+        }
+
+    def load(self):
+        """Warm the cache from SQLite if it was written for the same knowledge base"""
+        if not self.path or not self.path.exists():
+            return
+
+        try:
+            with closing(sqlite3.connect(str(self.path))) as connection:
+                row = connection.execute(
+                    "SELECT value FROM cache_meta WHERE key = 'fingerprint'").fetchone()
+                if not row or row[0] != self.fingerprint:
+                    print("⚠️  Enrichment cache was built for another knowledge base, starting cold")
+                    return
+
+                rows = connection.execute(
+                    "SELECT key, value, position FROM enrichment ORDER BY position").fetchall()
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not load enrichment cache: {e}")
+            return
+
+        for key, value, _ in rows[-self.max_entries:]:
+            self._entries[tuple(json.loads(key))] = json.loads(value)
+        # Rows beyond the current capacity are deleted by the next save
+        self._evicted.update(tuple(json.loads(key)) for key, _, _ in rows[:max(len(rows) - self.max_entries, 0)])
+        self._next_position = rows[-1][2] + 1 if rows else 0
+
+        self._cleared = False
+        print(f"✅ Loaded {len(self._entries)} cached classifications")
+
+    def save(self):
+        """Persist the changes since the last save (LRU order included) if persistence is enabled"""
+        if not self.path or not (self._touched or self._evicted or self._cleared):
+            return
+
+        # Touched keys were all moved to the end since the last save: newest last
+        touched = list(islice(reversed(self._entries), len(self._touched)))[::-1]
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(str(self.path))) as connection, connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS cache_meta (key TEXT PRIMARY KEY, value TEXT)")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS enrichment "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, position INTEGER NOT NULL)")
+                if self._cleared:
+                    connection.execute("DELETE FROM enrichment")
+                connection.executemany(
+                    "DELETE FROM enrichment WHERE key = ?",
+                    ((json.dumps(key, ensure_ascii=False),) for key in self._evicted))
+                connection.executemany(
+                    "INSERT OR REPLACE INTO enrichment (key, value, position) VALUES (?, ?, ?)",
+                    ((json.dumps(key, ensure_ascii=False), json.dumps(self._entries[key], ensure_ascii=False),
+                      self._next_position + offset)
+                     for offset, key in enumerate(touched)))
+                connection.execute(
+                    "INSERT OR REPLACE INTO cache_meta (key, value) VALUES ('fingerprint', ?)",
+                    (self.fingerprint,))
+            self._next_position += len(touched)
+            self._touched.clear()
+            self._evicted.clear()
+            self._cleared = False
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not save enrichment cache: {e}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
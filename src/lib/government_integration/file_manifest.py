@@ -0,0 +1,128 @@
+"""
+Persistent manifest of already processed price files.
+
+Government portals republish the same PriceFull files and many small Price
+delta files every hour, most of which were already seen. The manifest keeps
+chain, store, file name, size and content hash of every processed file so
+the next run only parses, filters and enriches new or changed files.
+
+The manifest is tied to the classification fingerprint: when the knowledge
+base changes, every file counts as changed and is reprocessed.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from .price_files import parse_price_file_name, retailer_from_folder
+
+MANIFEST_FILE_NAME = '.processed-files.json'
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_content_hash(path: Path) -> str:
+    """sha256 of a file's bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ProcessedFileManifest:
+    """Chain/store/file -> size and content hash of the files a previous run processed"""
+
+    def __init__(self, path: str, fingerprint: str = ''):
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, Dict] = {}
+        self._hashes: Dict[Path, str] = {}
+
+        self.load()
+
+    @staticmethod
+    def file_key(path: Path) -> str:
+        """'CHAIN/store/file name' identifying a price file across runs"""
+        path = Path(path)
+        store_id = (parse_price_file_name(path) or {}).get('store_id', '')
+        return f"{retailer_from_folder(path.parent.name)}/{store_id}/{path.name}"
+
+    def content_hash(self, path: Path) -> str:
+        """Content hash of a file, computed at most once per run"""
+        path = Path(path)
+        if path not in self._hashes:
+            self._hashes[path] = file_content_hash(path)
+        return self._hashes[path]
+
+    def is_unchanged(self, path: Path) -> bool:
+        """True if the file was processed before with the same size and content"""
+        entry = self.entries.get(self.file_key(path))
+        if entry is None or entry['size'] != Path(path).stat().st_size:
+            return False  # Cheap size check before hashing
+        return entry['sha256'] == self.content_hash(path)
+
+    def partition(self, paths: Iterable[Path]) -> Tuple[List[Path], List[Path]]:
+        """Split files into (new or changed, unchanged)"""
+        changed, unchanged = [], []
+        for path in paths:
+            (unchanged if self.is_unchanged(path) else changed).append(path)
+        return changed, unchanged
+
+    def record(self, path: Path):
+        """Mark a file as processed (persisted by save())"""
+        path = Path(path)
+        chain, store_id, file_name = self.file_key(path).split('/', 2)
+        self.entries[self.file_key(path)] = {
+            'chain': chain,
+            'store_id': store_id,
+            'file_name': file_name,
+            'size': path.stat().st_size,
+            'sha256': self.content_hash(path),
+            'processed_at': datetime.now().isoformat(),
+        }
+
+    def load(self):
+        """Read the manifest if it was written for the same classification fingerprint"""
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not load processed-file manifest: {e}")
+            return
+
+        if data.get('fingerprint') != self.fingerprint:
+            print("⚠️  Knowledge base changed since the last run, reprocessing every price file")
+            return
+
+        self.entries = data.get('files', {})
+
+    def save(self):
+        """Atomically write the manifest"""
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'fingerprint': self.fingerprint,
+                    'updated_at': datetime.now().isoformat(),
+                    'files': self.entries,
+                }, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"⚠️  Could not save processed-file manifest: {e}")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def source_file_key(path: Path) -> Tuple[str, str]:
+    """(retailer, file name) as recorded on the products parsed from a price file"""
+    path = Path(path)
+    return retailer_from_folder(path.parent.name), path.name
@@ -0,0 +1,142 @@
+"""
+Indexed fuzzy lookup with results identical to a full SequenceMatcher scan.
+
+``find_best_cut_match`` / ``find_fuzzy_mapping`` used to score every
+dictionary entry with ``difflib.SequenceMatcher``. ``FuzzyIndex`` shortlists
+candidates first and only runs the exact scoring on the shortlist:
+
+1. Every name becomes a set of character tokens ``(char, occurrence)`` so
+   that set intersection equals the multiset character overlap.
+2. ``SequenceMatcher.ratio()`` can never exceed ``2 * overlap / total_len``
+   (the ``quick_ratio`` bound), so a name scoring above ``threshold`` must
+   share a minimum number of tokens with the query. Prefix filtering on a
+   rare-first token order turns that into an inverted-list lookup.
+3. Candidates are ranked by their upper bound and scored exactly until no
+   remaining bound can beat the best score.
+
+Ties are broken by dictionary order, exactly like the original loops.
+"""
+
+from difflib import SequenceMatcher
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+Token = Tuple[str, int]
+
+
+def _tokens(text: str) -> List[Token]:
+    """Character tokens (char, n-th occurrence) of text"""
+    seen: Dict[str, int] = {}
+    tokens = []
+    for char in text:
+        occurrence = seen.get(char, 0)
+        seen[char] = occurrence + 1
+        tokens.append((char, occurrence))
+    return tokens
+
+
+class FuzzyIndex:
+    """Candidate index for best-match SequenceMatcher lookups above a fixed threshold"""
+
+    def __init__(self, names: Sequence[str], threshold: float):
+        self.names = list(names)
+        self.threshold = threshold
+
+        token_lists = [_tokens(name) for name in self.names]
+
+        # Document frequency decides the global (rare-first) token order
+        self._document_frequency: Dict[Token, int] = {}
+        for tokens in token_lists:
+            for token in tokens:
+                self._document_frequency[token] = self._document_frequency.get(token, 0) + 1
+
+        self._token_sets: List[FrozenSet[Token]] = []
+        self._postings: Dict[Token, List[int]] = {}
+        self._empty_entries: List[int] = []
+
+        for index, tokens in enumerate(token_lists):
+            self._token_sets.append(frozenset(tokens))
+            if not tokens:
+                self._empty_entries.append(index)
+                continue
+
+            for token in self._prefix(tokens):
+                self._postings.setdefault(token, []).append(index)
+
+        self._matchers: Dict[int, SequenceMatcher] = {}
+
+    def _min_overlap(self, length: int) -> int:
+        """Smallest token overlap a string of this length needs with any match"""
+        # ratio > t implies overlap > t * length / (2 - t) for the shorter-or-equal side
+        bound = self.threshold * length / (2 - self.threshold)
+        return max(1, int(bound - 1e-9) + 1)
+
+    def _prefix(self, tokens: List[Token]) -> List[Token]:
+        """Rare-first prefix that any sufficiently similar string must intersect"""
+        ordered = sorted(tokens, key=lambda token: (self._document_frequency.get(token, 0), token))
+        prefix_length = len(tokens) - self._min_overlap(len(tokens)) + 1
+        return ordered[:max(prefix_length, 0)]
+
+    def candidates(self, query: str) -> List[int]:
+        """Entry indexes that may score above the threshold against query"""
+        if not query:
+            return list(self._empty_entries)
+
+        found = set()
+        postings = self._postings
+        for token in self._prefix(_tokens(query)):
+            entries = postings.get(token)
+            if entries:
+                found.update(entries)
+
+        return sorted(found)
+
+    def _ratio(self, query: str, index: int) -> float:
+        """Exact SequenceMatcher(None, query, name).ratio(), reusing the per-entry b2j tables"""
+        matcher = self._matchers.get(index)
+        if matcher is None:
+            matcher = SequenceMatcher(None, '', self.names[index])
+            self._matchers[index] = matcher
+        matcher.set_seq1(query)
+        return matcher.ratio()
+
+    def best_match(self, query: str) -> Optional[Tuple[int, float]]:
+        """(index, similarity) of the first best entry scoring above the threshold, or None"""
+        if not query:
+            # SequenceMatcher treats two empty strings as identical (ratio 1.0)
+            if self._empty_entries and 1.0 > self.threshold:
+                return self._empty_entries[0], 1.0
+            return None
+
+        query_tokens = frozenset(_tokens(query))
+        query_length = len(query)
+
+        ranked = []
+        for index in self.candidates(query):
+            total_length = query_length + len(self.names[index])
+            overlap = len(query_tokens & self._token_sets[index])
+            upper_bound = 2.0 * overlap / total_length
+            if upper_bound > self.threshold:
+                ranked.append((-upper_bound, index))
+        ranked.sort()
+
+        best_index = None
+        best_score = self.threshold
+        for negative_bound, index in ranked:
+            upper_bound = -negative_bound
+            if upper_bound < best_score:
+                break
+            if best_index is not None and upper_bound == best_score and index > best_index:
+                continue
+
+            similarity = self._ratio(query, index)
+            if similarity > best_score or (
+                    best_index is not None and similarity == best_score and index < best_index):
+                best_score = similarity
+                best_index = index
+
+        if best_index is None:
+            return None
+        return best_index, best_score
+
+    def __len__(self) -> int:
+        return len(self.names)
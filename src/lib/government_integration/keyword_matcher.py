@@ -0,0 +1,114 @@
+"""
+Compiled multi-keyword matcher (Aho-Corasick) for Hebrew product names.
+
+Replaces ``any(word in name for word in keywords)`` scans with a single
+pass over the product name that reports every contained keyword, no
+matter how many keywords are registered.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton returning every keyword contained in a text"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = frozenset(keywords)
+
+        # An empty keyword is a substring of every text ('' in text is True)
+        self._always_present = '' in self.keywords
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[Tuple[str, ...]] = [()]
+
+        self._build_trie()
+        self._build_failure_links()
+
+    def _build_trie(self):
+        """Insert every keyword into the goto trie"""
+        for keyword in self.keywords:
+            if not keyword:
+                continue
+
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append(())
+                    self._goto[state][char] = next_state
+                state = next_state
+
+            self._outputs[state] = self._outputs[state] + (keyword,)
+
+    def _build_failure_links(self):
+        """Breadth-first failure links, merging outputs along each link"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                fail_state = self._goto[fallback].get(char, 0)
+                if fail_state == next_state:
+                    fail_state = 0
+
+                self._fail[next_state] = fail_state
+                if self._outputs[fail_state]:
+                    self._outputs[next_state] = self._outputs[next_state] + self._outputs[fail_state]
+
+    @property
+    def state_count(self) -> int:
+        """Number of automaton states (trie nodes)"""
+        return len(self._goto)
+
+    def scan(self, text: str) -> Dict[str, int]:
+        """Return every keyword found in text, mapped to the end offset of its first occurrence"""
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+
+        hits: Dict[str, int] = {'': 0} if self._always_present else {}
+        state = 0
+
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            if outputs[state]:
+                for keyword in outputs[state]:
+                    if keyword not in hits:
+                        hits[keyword] = index + 1
+
+        return hits
+
+    def contains_any(self, text: str) -> bool:
+        """True if at least one keyword occurs in text"""
+        if self._always_present:
+            return True
+
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        state = 0
+
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                return True
+
+        return False
+
+    def __len__(self) -> int:
+        return len(self.keywords)
@@ -0,0 +1,106 @@
+"""
+Pickled knowledge base for fast startup.
+
+Parsing ``normalized_cuts.json`` and ``meat_names_mapping.json`` and
+building the filter vocabulary (keyword sets, Aho-Corasick matcher, fuzzy
+indexes) is paid by every process that starts, including short-lived
+per-chain workers and filter-only runs. ``KnowledgeBaseCache`` stores the
+parsed knowledge base together with its vocabulary as one pickle, keyed by
+the content hash of the source files, so unchanged sources load in
+milliseconds.
+
+Unpickling runs arbitrary code, and the default data folder lives under
+/tmp, where any local user can create it first. The cache is therefore only
+loaded from a file this user owns with mode 0600, in a folder this user
+owns that nobody else can write to; anything else is ignored (and not
+overwritten) as if there were no cache.
+"""
+
+import hashlib
+import os
+import pickle
+import stat
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from .file_manifest import file_content_hash
+
+# Bump when the pickled layout changes
+KNOWLEDGE_BASE_CACHE_FORMAT = 1
+
+
+def knowledge_base_hash(paths: Iterable[Path]) -> str:
+    """Content hash over the knowledge base source files (missing files included as such)"""
+    digest = hashlib.sha256()
+    for path in paths:
+        path = Path(path)
+        digest.update(path.name.encode('utf-8'))
+        digest.update(file_content_hash(path).encode('ascii') if path.exists() else b'missing')
+    return digest.hexdigest()
+
+
+def _is_private(status: os.stat_result, mode_mask: int) -> bool:
+    """Owned by this user with none of the mode_mask permission bits set"""
+    return status.st_uid == os.geteuid() and not stat.S_IMODE(status.st_mode) & mode_mask
+
+
+class KnowledgeBaseCache:
+    """Single-entry pickle cache of the parsed knowledge base and its vocabulary"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self.hits = 0
+        self.misses = 0
+
+    def folder_is_private(self) -> bool:
+        """True if only this user can create, replace or remove files in the cache folder"""
+        try:
+            return _is_private(os.stat(self.path.parent), stat.S_IWGRP | stat.S_IWOTH)
+        except OSError:
+            return False
+
+    def load(self, key: str) -> Optional[Any]:
+        """Cached payload if it was stored under key, else None"""
+        if not self.path or not self.path.exists():
+            self.misses += 1
+            return None
+
+        try:
+            if not self.folder_is_private():
+                raise PermissionError(f"{self.path.parent} is not owned by this user or is writable by others")
+            with open(os.open(self.path, os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0)), 'rb') as f:
+                # Checked on the open file, so it cannot be swapped after the check
+                if not _is_private(os.fstat(f.fileno()), 0o077):
+                    raise PermissionError(f"{self.path} is not owned by this user with mode 0600")
+                cached = pickle.load(f)
+        except Exception as e:
+            print(f"⚠️  Could not load knowledge base cache: {e}")
+            self.misses += 1
+            return None
+
+        if cached.get('format') != KNOWLEDGE_BASE_CACHE_FORMAT or cached.get('key') != key:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return cached['payload']
+
+    def save(self, key: str, payload: Any):
+        """Atomically replace the cache (mode 0600) with payload stored under key"""
+        if not self.path:
+            return
+
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            if not self.folder_is_private():
+                print(f"⚠️  Not saving knowledge base cache: {self.path.parent} is not private to this user")
+                return
+            temp_path.unlink(missing_ok=True)
+            with open(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), 'wb') as f:
+                pickle.dump({'format': KNOWLEDGE_BASE_CACHE_FORMAT, 'key': key, 'payload': payload},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.path)
+        except (OSError, pickle.PicklingError) as e:
+            print(f"⚠️  Could not save knowledge base cache: {e}")
+            temp_path.unlink(missing_ok=True)
@@ -0,0 +1,133 @@
+"""
+Single-pass match profile of a product name.
+
+The filter decision, the meat confidence score and the quality grade all
+depend on which vocabulary terms occur in the product name. ``MatchProfile``
+is built from one ``KeywordMatcher`` scan of the name and carries every hit
+those three derivations need, so a row is scanned once instead of once per
+check.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, FrozenSet, Mapping, Optional, Tuple
+
+# Confidence scoring terms (see MatchProfile.confidence)
+MEAT_TYPE_TERMS = frozenset({'בקר', 'עוף', 'כבש', 'עגל', 'טלה'})
+MEAT_CUT_TERMS = frozenset({'חזה', 'שוקיים', 'כנפיים', 'אנטריקוט', 'פילה', 'צלעות'})
+MEAT_CATEGORY_TERMS = ('בשר', 'עוף', 'כבש', 'בקר', 'בשר מעובד')
+
+
+class QualityGrade(str, Enum):
+    """Quality grade of a meat product (compares and serializes as its string value)"""
+
+    WAGYU = 'wagyu'
+    ANGUS = 'angus'
+    PREMIUM = 'premium'
+    ORGANIC = 'organic'
+    VEAL = 'veal'
+    REGULAR = 'regular'
+
+    def __str__(self) -> str:
+        return self.value
+
+
+# Quality grades in priority order: the first grade with a matching term wins
+QUALITY_GRADE_TERMS: Tuple[Tuple[QualityGrade, FrozenSet[str]], ...] = (
+    (QualityGrade.WAGYU, frozenset({'וואגיו', 'wagyu', 'א5', 'a5'})),
+    (QualityGrade.ANGUS, frozenset({'אנגוס', 'angus'})),
+    (QualityGrade.PREMIUM, frozenset({'פרימיום', 'premium', 'פרמיום'})),
+    (QualityGrade.ORGANIC, frozenset({'אורגני', 'organic', 'ביו'})),
+    (QualityGrade.VEAL, frozenset({'עגל', 'veal'})),
+)
+GRADE_TERMS = frozenset(term for _, terms in QUALITY_GRADE_TERMS for term in terms)
+
+# Only products with high meat confidence (80%+) are included
+MEAT_CONFIDENCE_THRESHOLD = 0.80
+
+
+@dataclass(frozen=True)
+class MatchProfile:
+    """Every vocabulary hit of one product name, and what follows from them"""
+
+    has_exclusion: bool
+    meat_keywords: FrozenSet[str]
+    meat_keyword_count: int
+    mapping_hits: FrozenSet[str]
+    has_mapping_match: bool
+    meat_types: FrozenSet[str]
+    cut_terms: FrozenSet[str]
+    grade_terms: FrozenSet[str]
+    category_match: bool
+    category_decision: Optional[str] = None
+
+    @classmethod
+    def from_hits(cls, hits: Mapping[str, int], hebrew_length: int, category: str,
+                  exclusion_keywords: FrozenSet[str], meat_keywords: FrozenSet[str],
+                  meat_keyword_weights: Dict[str, int], mapping_keywords: FrozenSet[str],
+                  category_decision: Optional[str] = None) -> 'MatchProfile':
+        """Classify the hits of one scan of 'hebrew english' (lowercased)
+
+        meat_keyword_weights maps a lowercased meat keyword to the number of
+        meat keywords sharing that lowercase form.
+        """
+        keywords = hits.keys()
+        mapping_hits = frozenset(keywords & mapping_keywords)
+        category = category.lower()
+
+        return cls(
+            has_exclusion=not exclusion_keywords.isdisjoint(keywords),
+            meat_keywords=frozenset(keywords & meat_keywords),
+            meat_keyword_count=sum(meat_keyword_weights.get(keyword, 0) for keyword in keywords),
+            mapping_hits=mapping_hits,
+            # Mapping names only count when they occur in the Hebrew part of the name
+            has_mapping_match=any(hits[keyword] <= hebrew_length for keyword in mapping_hits),
+            meat_types=frozenset(keywords & MEAT_TYPE_TERMS),
+            cut_terms=frozenset(keywords & MEAT_CUT_TERMS),
+            grade_terms=frozenset(keywords & GRADE_TERMS),
+            category_match=any(term in category for term in MEAT_CATEGORY_TERMS),
+            category_decision=category_decision,
+        )
+
+    @property
+    def confidence(self) -> float:
+        """Confidence that the product is actually meat"""
+        confidence_score = min(self.meat_keyword_count * 0.25, 0.5)  # meat keywords
+        if self.meat_types:
+            confidence_score += 0.25  # specific meat type
+        if self.cut_terms:
+            confidence_score += 0.25  # meat-specific cut terms
+        if self.mapping_hits:
+            confidence_score += 0.3  # existing mapping match
+        if self.category_match:
+            confidence_score += 0.2
+        return min(confidence_score, 1.0)
+
+    @property
+    def decision(self) -> str:
+        """'excluded', 'no_meat_keywords', 'low_confidence' or 'included'"""
+        if self.has_exclusion or self.category_decision == 'excluded':
+            return 'excluded'
+        if not (self.meat_keywords or self.has_mapping_match):
+            return 'no_meat_keywords'
+        if self.confidence < MEAT_CONFIDENCE_THRESHOLD:
+            return 'low_confidence'
+        return 'included'
+
+    @property
+    def quality_grade(self) -> QualityGrade:
+        for grade, terms in QUALITY_GRADE_TERMS:
+            if not terms.isdisjoint(self.grade_terms):
+                return grade
+        return QualityGrade.REGULAR
+
+    def to_dict(self) -> Dict[str, Optional[object]]:
+        return {
+            'matched_keywords': sorted(self.meat_keywords),
+            'mapping_hits': sorted(self.mapping_hits),
+            'meat_types': sorted(self.meat_types),
+            'cut_terms': sorted(self.cut_terms),
+            'grade_terms': sorted(self.grade_terms),
+            'category_match': self.category_match,
+            'category_decision': self.category_decision,
+        }
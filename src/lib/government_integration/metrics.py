@@ -0,0 +1,187 @@
+"""
+Run metrics and their export for monitoring.
+
+``RunMetrics`` counts time per pipeline stage (download, parse, filter,
+enrich, write) and rows / files / errors per chain. Stages nest the way the
+streaming pipeline does (the filter pulls rows from the parser, the writer
+pulls products from the filter), so time is charged exclusively: entering a
+stage pauses the one it was entered from.
+
+``MetricsExporter`` writes the summary of every run to a metrics directory
+as a Prometheus textfile (for the node_exporter textfile collector) and as
+one line of an append-only JSONL run log, so throughput trends survive
+across runs.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+STAGES = ('download', 'parse', 'filter', 'enrich', 'write')
+
+PROMETHEUS_FILE_NAME = 'basarometer_ingest.prom'
+RUN_LOG_FILE_NAME = 'ingest-runs.jsonl'
+
+
+class RunMetrics:
+    """Per-stage timers and per-chain counters of one ingest run"""
+
+    def __init__(self):
+        self.started_at = datetime.now().isoformat()
+        self.started = time.perf_counter()
+
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+        self.stage_calls = dict.fromkeys(STAGES, 0)
+        self.chains: Dict[str, Dict[str, int]] = {}
+
+        self._stack: List[str] = []
+        self._mark = 0.0
+
+    def enter(self, stage: str):
+        """Start charging time to a stage (pausing the enclosing one)"""
+        now = time.perf_counter()
+        if self._stack:
+            self.stage_seconds[self._stack[-1]] += now - self._mark
+        self._stack.append(stage)
+        self.stage_calls[stage] += 1
+        self._mark = now
+
+    def exit(self):
+        """Stop charging the current stage and resume the enclosing one"""
+        now = time.perf_counter()
+        self.stage_seconds[self._stack.pop()] += now - self._mark
+        self._mark = now
+
+    @contextmanager
+    def stage(self, stage: str):
+        self.enter(stage)
+        try:
+            yield
+        finally:
+            self.exit()
+
+    def timed(self, stage: str, iterable: Iterable) -> Iterator:
+        """Iterate, charging the time spent producing each item to a stage"""
+        iterator = iter(iterable)
+        while True:
+            self.enter(stage)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self.exit()
+            yield item
+
+    def add_stage_time(self, stage: str, seconds: float, calls: int = 1):
+        """Record time measured elsewhere (e.g. by the download orchestrator)"""
+        self.stage_seconds[stage] += seconds
+        self.stage_calls[stage] += calls
+
+    def count(self, chain: str, counter: str, value: int = 1):
+        counters = self.chains.setdefault(chain or 'unknown', {})
+        counters[counter] = counters.get(counter, 0) + value
+
+    def merge(self, other: 'RunMetrics'):
+        """Add the stage times and chain counters of a worker task"""
+        for stage in STAGES:
+            self.stage_seconds[stage] += other.stage_seconds[stage]
+            self.stage_calls[stage] += other.stage_calls[stage]
+        for chain, counters in other.chains.items():
+            for counter, value in counters.items():
+                self.count(chain, counter, value)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def summary(self, rows: int, **extra) -> Dict:
+        """Run summary: throughput overall and per stage, per-chain counters, plus extra fields"""
+        elapsed = self.elapsed
+        return {
+            'run_started_at': self.started_at,
+            'run_finished_at': datetime.now().isoformat(),
+            'duration_seconds': round(elapsed, 3),
+            'rows': rows,
+            'rows_per_second': round(rows / elapsed, 1) if elapsed > 0 else 0.0,
+            'stages': {
+                stage: {
+                    'seconds': round(self.stage_seconds[stage], 4),
+                    'calls': self.stage_calls[stage],
+                    'rows_per_second': (round(rows / self.stage_seconds[stage], 1)
+                                        if self.stage_seconds[stage] > 0 and stage != 'download' else None),
+                }
+                for stage in STAGES
+            },
+            'chains': {chain: dict(counters) for chain, counters in sorted(self.chains.items())},
+            **extra,
+        }
+
+
+def _label_value(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text(summary: Dict) -> str:
+    """Render a run summary in the Prometheus text exposition format"""
+    lines = []
+
+    def metric(name: str, help_text: str, samples: List):
+        lines.append(f"# HELP basarometer_ingest_{name} {help_text}")
+        lines.append(f"# TYPE basarometer_ingest_{name} gauge")
+        for labels, value in samples:
+            label_text = ','.join(f'{key}="{_label_value(label)}"' for key, label in labels.items())
+            lines.append(f"basarometer_ingest_{name}{{{label_text}}} {value}" if label_text
+                         else f"basarometer_ingest_{name} {value}")
+
+    metric('last_run_timestamp_seconds', 'Unix time the last ingest run finished.', [({}, round(time.time(), 3))])
+    metric('run_duration_seconds', 'Wall time of the last ingest run.', [({}, summary['duration_seconds'])])
+    metric('rows', 'Price rows ingested by the last run.', [({}, summary['rows'])])
+    metric('rows_per_second', 'Ingest throughput of the last run.', [({}, summary['rows_per_second'])])
+    metric('stage_seconds', 'Time spent per pipeline stage in the last run.',
+           [({'stage': stage}, values['seconds']) for stage, values in summary['stages'].items()])
+    metric('stage_calls', 'Timed calls per pipeline stage in the last run.',
+           [({'stage': stage}, values['calls']) for stage, values in summary['stages'].items()])
+
+    counters = sorted({counter for values in summary['chains'].values() for counter in values})
+    for counter in counters:
+        metric(f"chain_{counter}", f"{counter.replace('_', ' ').capitalize()} per chain in the last run.",
+               [({'chain': chain}, values.get(counter, 0)) for chain, values in summary['chains'].items()])
+
+    metric('cache_hit_ratio', 'Hit ratio of the classification caches in the last run.',
+           [({'cache': cache}, rate) for cache, rate in summary.get('cache_hit_rate', {}).items()])
+    metric('errors', 'Errors recorded by the last run.', [({}, summary.get('errors', 0))])
+
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsExporter:
+    """Writes run summaries as a Prometheus textfile and an append-only JSONL run log"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.prometheus_path = self.directory / PROMETHEUS_FILE_NAME
+        self.run_log_path = self.directory / RUN_LOG_FILE_NAME
+
+    def export(self, summary: Dict) -> Optional[Path]:
+        """Write one run summary; returns the metrics directory, None if it could not be written"""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+            # The textfile collector must never read a half-written file
+            temp_path = self.prometheus_path.with_name(self.prometheus_path.name + '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(prometheus_text(summary))
+            os.replace(temp_path, self.prometheus_path)
+
+            with open(self.run_log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(summary, ensure_ascii=False, separators=(',', ':'), default=str) + '\n')
+        except OSError as e:
+            print(f"⚠️  Could not export metrics: {e}")
+            return None
+
+        return self.directory
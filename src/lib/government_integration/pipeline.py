@@ -0,0 +1,120 @@
+"""
+Streaming pipeline helpers.
+
+Products flow through ingest -> filter -> enrich as generators; batching
+only happens at the sink, where writes are cheaper in bulk.
+
+``SnapshotSink`` additionally carries over the products of the previous
+output that this (incremental) run did not reprocess.
+"""
+
+import json
+import os
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Collection, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from .records import json_default
+
+T = TypeVar('T')
+
+
+def batched(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Group an iterable into lists of at most size items (last batch may be shorter)"""
+    if size < 1:
+        raise ValueError('batch size must be at least 1')
+
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def product_key(product: Dict) -> Tuple[str, str, str]:
+    """(retailer, store, product id) identifying one shelf product across runs"""
+    product_id = str(product.get('item_code') or '').strip().lstrip('0') or product.get('name_hebrew', '')
+    return product.get('retailer', ''), str(product.get('store_id') or ''), product_id
+
+
+def read_snapshot(path: str) -> Iterator[Dict]:
+    """Products of a JSON lines snapshot written by SnapshotSink (nothing if it does not exist)"""
+    path = Path(path)
+    if not path.exists():
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class JsonLinesSink:
+    """Batch writer of products as JSON lines, atomically replacing the target on close"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.temp_path = self.path.with_name(self.path.name + '.tmp')
+        self.written = 0
+        self._file = None
+
+    def __enter__(self) -> 'JsonLinesSink':
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.temp_path, 'w', encoding='utf-8')
+        return self
+
+    def write_batch(self, products: List[Dict]):
+        """Serialize a whole batch with a single write call"""
+        if not products:
+            return
+        self._file.write(''.join(
+            json.dumps(product, ensure_ascii=False, default=json_default) + '\n' for product in products))
+        self.written += len(products)
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._file.close()
+        if exc_type is None:
+            os.replace(self.temp_path, self.path)
+        else:
+            # Keep the previous output intact if the run failed half way
+            self.temp_path.unlink(missing_ok=True)
+        return False
+
+
+class SnapshotSink(JsonLinesSink):
+    """JsonLinesSink that merges the new products into the previous snapshot at path"""
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.carried_over = 0
+        self._keys = set()
+
+    def write_batch(self, products: List[Dict]):
+        self._keys.update(product_key(product) for product in products)
+        super().write_batch(products)
+
+    def carry_over(self, replaced_files: Collection[Hashable] = (),
+                   on_product: Optional[Callable[[Dict], None]] = None):
+        """Append previous products not rewritten by this run nor parsed from a replaced file
+
+        replaced_files holds (retailer, source_file) pairs of the reprocessed price files;
+        on_product, if given, is called with every carried-over product.
+        """
+        if not self.path.exists():
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as previous:
+            for line in previous:
+                if not line.strip():
+                    continue
+                product = json.loads(line)
+                if product_key(product) in self._keys:
+                    continue
+                if (product.get('retailer', ''), product.get('source_file', '')) in replaced_files:
+                    continue  # Dropped from a file that was reprocessed
+                self._file.write(line if line.endswith('\n') else line + '\n')
+                if on_product is not None:
+                    on_product(product)
+                self.carried_over += 1
+                self.written += 1
@@ -0,0 +1,149 @@
+"""
+Change detection between runs.
+
+Every run re-emits every meat product with a fresh ``processed_at``, even
+when nothing changed. ``PriceDeltaTracker`` keeps the last-known price and an
+attribute hash per (retailer, store, normalized product id) in SQLite and
+turns a run into a compact feed of inserts, updates and deletions, so the
+database and the JSON API only receive what actually changed.
+"""
+
+import hashlib
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Collection, Dict, Hashable, List, Optional, Tuple
+
+from .pipeline import product_key
+
+# Fields that change on every run / republish without the product changing
+VOLATILE_FIELDS = frozenset({'processed_at', 'source_file', 'file_type', 'price_updated_at'})
+
+ProductKey = Tuple[str, str, str]
+
+
+def attributes_hash(product: Dict) -> str:
+    """Hash of the non-volatile product attributes (price excluded)"""
+    stable = {field: value for field, value in product.items()
+              if field not in VOLATILE_FIELDS and field != 'price'}
+    payload = json.dumps(stable, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class PriceDeltaTracker:
+    """Last-known price per product key; emits insert / update / delete records"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+
+        # key -> (price, attributes hash, retailer, source file)
+        self.state: Dict[ProductKey, Tuple[float, str, str, str]] = {}
+        self.deltas: List[Dict] = []
+        self.counts = {'inserts': 0, 'updates': 0, 'deletions': 0, 'unchanged': 0}
+
+        self._seen = set()
+        self._changed = set()
+        self._deleted = set()
+
+        if self.path:
+            self.load()
+
+    def observe(self, product: Dict) -> Optional[Dict]:
+        """Compare one product with its last-known state; returns its delta record, if any"""
+        key = product_key(product)
+        price = product.get('price')
+        digest = attributes_hash(product)
+        previous = self.state.get(key)
+
+        self._seen.add(key)
+        self.state[key] = (price, digest, product.get('retailer', ''), product.get('source_file', ''))
+
+        if previous is None:
+            delta = self._delta('insert', key, price=price, product=product)
+        elif previous[0] != price or previous[1] != digest:
+            delta = self._delta('update', key, price=price, previous_price=previous[0])
+            if previous[1] != digest:
+                delta['product'] = product  # Attributes changed, not just the price
+        else:
+            if previous[3] != self.state[key][3]:
+                self._changed.add(key)  # Same product, newer source file
+            self.counts['unchanged'] += 1
+            return None
+
+        self._changed.add(key)
+        self.deltas.append(delta)
+        return delta
+
+    def observe_batch(self, products: List[Dict]):
+        for product in products:
+            self.observe(product)
+
+    def finish(self, replaced_files: Optional[Collection[Hashable]] = None) -> List[Dict]:
+        """Emit deletions for known products missing from this run and return every delta
+
+        Only products whose (retailer, source file) is in replaced_files can be
+        deleted, since untouched files were not re-read; None means a full run.
+        """
+        for key, (price, _digest, retailer, source_file) in list(self.state.items()):
+            if key in self._seen:
+                continue
+            if replaced_files is not None and (retailer, source_file) not in replaced_files:
+                continue
+
+            del self.state[key]
+            self._deleted.add(key)
+            self.deltas.append(self._delta('delete', key, previous_price=price))
+
+        return self.deltas
+
+    def _delta(self, op: str, key: ProductKey, **fields) -> Dict:
+        self.counts[{'insert': 'inserts', 'update': 'updates', 'delete': 'deletions'}[op]] += 1
+        retailer, store_id, product_id = key
+        return {'op': op, 'retailer': retailer, 'store_id': store_id, 'product_id': product_id, **fields}
+
+    def metrics(self) -> Dict[str, int]:
+        """Insert / update / deletion / unchanged counts for the stats report"""
+        return dict(self.counts, tracked_products=len(self.state))
+
+    def load(self):
+        """Read the last-known state from SQLite"""
+        if not self.path or not self.path.exists():
+            return
+
+        try:
+            with closing(sqlite3.connect(str(self.path))) as connection:
+                rows = connection.execute(
+                    "SELECT retailer, store_id, product_id, price, attributes_hash, source_file "
+                    "FROM last_known").fetchall()
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not load last-known prices: {e}")
+            return
+
+        for retailer, store_id, product_id, price, digest, source_file in rows:
+            self.state[(retailer, store_id, product_id)] = (price, digest, retailer, source_file)
+
+    def save(self):
+        """Persist only the rows that changed in this run"""
+        if not self.path or not (self._changed or self._deleted):
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(sqlite3.connect(str(self.path))) as connection, connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS last_known ("
+                    "retailer TEXT NOT NULL, store_id TEXT NOT NULL, product_id TEXT NOT NULL, "
+                    "price REAL, attributes_hash TEXT NOT NULL, source_file TEXT NOT NULL, "
+                    "PRIMARY KEY (retailer, store_id, product_id))")
+                connection.executemany(
+                    "INSERT OR REPLACE INTO last_known VALUES (?, ?, ?, ?, ?, ?)",
+                    (key + (self.state[key][0], self.state[key][1], self.state[key][3])
+                     for key in self._changed if key in self.state))
+                connection.executemany(
+                    "DELETE FROM last_known WHERE retailer = ? AND store_id = ? AND product_id = ?",
+                    self._deleted)
+            self._changed.clear()
+            self._deleted.clear()
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not save last-known prices: {e}")
@@ -0,0 +1,208 @@
+"""
+Streaming reader for government PriceFull / Price XML files.
+
+The files downloaded by ``il_supermarket_scarper`` are gzipped (sometimes
+zipped or plain) XML documents with a chain/store header followed by one
+``<Item>`` element per product. A Shufersal PriceFull file is hundreds of MB
+uncompressed, so items are parsed incrementally with ``iterparse`` and
+detached from the tree as soon as they are yielded: memory stays flat
+regardless of file size.
+"""
+
+import gzip
+import io
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional
+
+# Elements holding one product (lowercased, namespace stripped)
+ITEM_TAGS = frozenset({'item', 'product'})
+
+# Header elements describing the whole file
+HEADER_TAGS = {
+    'chainid': 'chain_id',
+    'subchainid': 'sub_chain_id',
+    'storeid': 'store_id',
+}
+
+# Item elements copied to the product dict
+ITEM_FIELDS = {
+    'itemcode': 'item_code',
+    'itemtype': 'item_type',
+    'manufacturername': 'manufacturer',
+    'unitofmeasure': 'unit_of_measure',
+    'unitqty': 'unit_qty',
+    'quantity': 'quantity',
+    'bisweighted': 'is_weighted',
+    'priceupdatedate': 'price_updated_at',
+}
+
+# Chain-specific category elements, when a chain publishes them
+CATEGORY_FIELDS = ('category', 'itemcategory', 'categoryname')
+
+PRICE_FILE_PATTERN = re.compile(
+    r'^(?P<file_type>pricefull|price)(?P<chain_id>\d+)?-(?P<store_id>\d+)?(?:-(?P<timestamp>\d+))?',
+    re.IGNORECASE)
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZIP_MAGIC = b'PK\x03\x04'
+
+
+def _local_name(tag: str) -> str:
+    """Lowercased element name without XML namespace"""
+    return tag.rsplit('}', 1)[-1].lower()
+
+
+def _parse_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, '') else None
+    except ValueError:
+        return None
+
+
+def retailer_from_folder(folder_name: str) -> str:
+    """'RamiLevy' / 'rami-levy' / 'Shufersal' -> 'RAMI_LEVY' / 'RAMI_LEVY' / 'SHUFERSAL'"""
+    name = re.sub(r'(?<=[a-z0-9])(?=[A-Z])', '_', folder_name)
+    return re.sub(r'[^0-9A-Za-z]+', '_', name).strip('_').upper()
+
+
+def parse_price_file_name(path: Path) -> Optional[Dict[str, str]]:
+    """File type, chain id, store id and timestamp encoded in a price file name"""
+    match = PRICE_FILE_PATTERN.match(Path(path).name)
+    if not match:
+        return None
+
+    return {
+        'file_type': 'PriceFull' if match.group('file_type').lower() == 'pricefull' else 'Price',
+        'chain_id': match.group('chain_id') or '',
+        'store_id': match.group('store_id') or '',
+        'timestamp': match.group('timestamp') or '',
+    }
+
+
+def find_price_files(folder: str) -> List[Path]:
+    """Every PriceFull / Price file under folder, in a stable (sorted) order"""
+    root = Path(folder)
+    if not root.exists():
+        return []
+
+    return sorted(path for path in root.rglob('*')
+                  if path.is_file() and parse_price_file_name(path) is not None)
+
+
+def open_price_file(path: Path) -> BinaryIO:
+    """Binary stream of the XML inside a gzip / zip / plain price file"""
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.open(path, 'rb')
+
+    if magic.startswith(ZIP_MAGIC):
+        archive = zipfile.ZipFile(path)
+        members = [name for name in archive.namelist() if not name.endswith('/')]
+        if not members:
+            archive.close()
+            return io.BytesIO(b'')
+        return archive.open(members[0])
+
+    return open(path, 'rb')
+
+
+def iter_price_file_products(path: Path, retailer: Optional[str] = None,
+                             stats: Optional[Dict[str, int]] = None) -> Iterator[Dict]:
+    """Yield one product dict per <Item> of a price file without loading the file"""
+    path = Path(path)
+    if retailer is None:
+        retailer = retailer_from_folder(path.parent.name)
+
+    file_info = parse_price_file_name(path) or {}
+    header = {
+        'chain_id': file_info.get('chain_id', ''),
+        'sub_chain_id': '',
+        'store_id': file_info.get('store_id', ''),
+    }
+
+    if stats is None:
+        stats = {}
+    stats.setdefault('files', 0)
+    stats.setdefault('items', 0)
+    stats.setdefault('skipped_items', 0)
+    stats['files'] += 1
+
+    with open_price_file(path) as stream:
+        stack = []
+        item_depth = 0
+
+        for event, element in ET.iterparse(stream, events=('start', 'end')):
+            tag = _local_name(element.tag)
+
+            if event == 'start':
+                stack.append(element)
+                if tag in ITEM_TAGS:
+                    item_depth += 1
+                continue
+
+            stack.pop()
+
+            if tag in ITEM_TAGS:
+                item_depth -= 1
+                product = _build_product(element, header, retailer, file_info, path)
+                if product is None:
+                    stats['skipped_items'] += 1
+                else:
+                    stats['items'] += 1
+                    yield product
+
+                # Detach the finished item so the tree never grows
+                element.clear()
+                if stack:
+                    stack[-1].remove(element)
+
+            elif item_depth == 0 and tag in HEADER_TAGS and element.text:
+                header[HEADER_TAGS[tag]] = element.text.strip()
+
+
+def _build_product(element: ET.Element, header: Dict[str, str], retailer: str,
+                   file_info: Dict[str, str], path: Path) -> Optional[Dict]:
+    """Product dict in the shape filter_meat_products consumes, or None if unusable"""
+    fields = {_local_name(child.tag): (child.text or '').strip() for child in element}
+
+    name = fields.get('itemname') or fields.get('manufactureritemdescription') or ''
+    price = _parse_float(fields.get('itemprice'))
+    if not name or price is None:
+        return None
+
+    category = ''
+    for category_field in CATEGORY_FIELDS:
+        if fields.get(category_field):
+            category = fields[category_field]
+            break
+
+    product = {
+        'name_hebrew': name,
+        'name_english': '',
+        'price': price,
+        'retailer': retailer,
+        'category': category,
+        'unit_of_measure_price': _parse_float(fields.get('unitofmeasureprice')),
+        'chain_id': header['chain_id'],
+        'sub_chain_id': header['sub_chain_id'],
+        'store_id': header['store_id'],
+        'file_type': file_info.get('file_type', ''),
+        'source_file': path.name,
+    }
+    for xml_field, product_field in ITEM_FIELDS.items():
+        if xml_field in fields:
+            product[product_field] = fields[xml_field]
+
+    return product
+
+
+def iter_price_files_products(paths: Iterable[Path],
+                              stats: Optional[Dict[str, int]] = None) -> Iterator[Dict]:
+    """Chain the products of several price files, one file open at a time"""
+    for path in paths:
+        yield from iter_price_file_products(path, stats=stats)
@@ -0,0 +1,305 @@
+"""
+Append-only price history.
+
+Every run overwrites its snapshot, so the outputs carry no history and
+trend charts had to re-read old JSON dumps. ``PriceHistoryStore`` keeps one
+time series per (retailer, product id): one price per day (the lowest of the
+retailer's stores), as a uint32 day offset and a float32 price.
+
+Points live in fixed-size chunks of ``CHUNK_POINTS`` days in two flat files
+(``days.u32`` and ``prices.f32``); ``chunks.u32`` records the series and
+fill count of every chunk and ``series.jsonl`` maps series ids to their
+(retailer, product id). Chunks are only ever appended, and a series' chunks
+are in time order, so a range query memory-maps the files and bisects the
+chunk views without copying or parsing anything. Years of daily prices for
+every meat SKU of every chain stay in the hundreds of megabytes.
+
+A point is written before the chunk's fill count, so an interrupted flush
+at worst loses the points of that flush. Files are in native byte order,
+recorded in ``meta.json``.
+"""
+
+import bisect
+import json
+import mmap
+import sys
+from array import array
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .pipeline import product_key
+
+PRICE_HISTORY_FORMAT = 1
+
+# Points (days) per chunk: a series grows by 512 bytes at a time
+CHUNK_POINTS = 64
+
+# Day offsets count days since EPOCH
+EPOCH = date(2000, 1, 1)
+
+PERIODS = ('day', 'week')
+
+SeriesKey = Tuple[str, str]
+
+
+def history_key(product: Mapping) -> SeriesKey:
+    """(retailer, normalized product id) of the series a product's price belongs to"""
+    retailer, _, product_id = product_key(product)
+    return retailer, product_id
+
+
+def day_offset(day: date) -> int:
+    return (day - EPOCH).days
+
+
+def offset_day(offset: int) -> date:
+    return EPOCH + timedelta(days=offset)
+
+
+def period_start(day: date, period: str) -> date:
+    """First day of the day / week (starting on Sunday) containing day"""
+    if period == 'week':
+        return day - timedelta(days=(day.weekday() + 1) % 7)
+    return day
+
+
+class PriceHistoryStore:
+    """Chunked, memory-mapped (retailer, product) -> daily price series; loaded on first use"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self.series: Dict[SeriesKey, int] = {}
+        self.series_keys: List[SeriesKey] = []
+        self.series_chunks: Dict[int, List[int]] = {}
+        self.chunk_series = array('I')
+        self.chunk_count = array('I')
+        self.last_points: Dict[int, Tuple[int, float]] = {}
+
+        # Lowest price per series observed since the last flush
+        self.pending: Dict[SeriesKey, float] = {}
+        self.counts = {'appended': 0, 'updated': 0, 'unchanged': 0, 'out_of_order': 0, 'new_series': 0}
+
+        self._loaded = False
+        self._views = None
+
+    def observe(self, product: Mapping):
+        """Record a product's price for the next flush (the lowest store price per retailer wins)"""
+        price = product.get('price')
+        if not isinstance(price, (int, float)) or price <= 0:
+            return
+        key = history_key(product)
+        if not key[0] or not key[1]:
+            return
+        previous = self.pending.get(key)
+        if previous is None or price < previous:
+            self.pending[key] = float(price)
+
+    def observe_batch(self, products: Iterable[Mapping]):
+        for product in products:
+            self.observe(product)
+
+    def _file(self, name: str) -> Path:
+        return self.path / name
+
+    def load(self):
+        """Read the series catalog and chunk table (not the points)"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not self._file('meta.json').exists():
+            return
+
+        try:
+            meta = json.loads(self._file('meta.json').read_text(encoding='utf-8'))
+            if meta != self._meta():
+                print(f"⚠️  Price history at {self.path} has an incompatible format {meta}, not using it")
+                self.path = None
+                return
+
+            with open(self._file('series.jsonl'), 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._add_series((entry['retailer'], entry['product']))
+
+            table = array('I')
+            entries = self._file('chunks.u32').read_bytes()
+            table.frombytes(entries[:len(entries) - len(entries) % 8])  # Drop a torn last entry
+            self.chunk_series = table[0::2]
+            self.chunk_count = table[1::2]
+            for chunk, series_id in enumerate(self.chunk_series):
+                self.series_chunks.setdefault(series_id, []).append(chunk)
+
+            days, prices = self._open_views()
+            for series_id, chunks in self.series_chunks.items():
+                last = chunks[-1] * CHUNK_POINTS + self.chunk_count[chunks[-1]] - 1
+                self.last_points[series_id] = (days[last], prices[last])
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            print(f"⚠️  Could not load price history: {e}")
+            self.path = None
+
+    @staticmethod
+    def _meta() -> Dict:
+        return {'format': PRICE_HISTORY_FORMAT, 'chunk_points': CHUNK_POINTS,
+                'epoch': EPOCH.isoformat(), 'byteorder': sys.byteorder}
+
+    def _add_series(self, key: SeriesKey) -> int:
+        series_id = self.series[key] = len(self.series_keys)
+        self.series_keys.append(key)
+        return series_id
+
+    def flush(self, day: Optional[date] = None) -> int:
+        """Append the pending prices as day's points (default: today); returns the points written"""
+        self.load()
+        pending, self.pending = self.pending, {}
+        if not self.path or not pending:
+            return 0
+
+        offset = day_offset(day or date.today())
+        self._close_views()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._file('meta.json').write_text(json.dumps(self._meta()), encoding='utf-8')
+        for name in ('days.u32', 'prices.f32', 'chunks.u32'):
+            self._file(name).touch()
+
+        written = 0
+        with open(self._file('series.jsonl'), 'a', encoding='utf-8') as series_file, \
+                open(self._file('days.u32'), 'r+b') as days_file, \
+                open(self._file('prices.f32'), 'r+b') as prices_file, \
+                open(self._file('chunks.u32'), 'r+b') as chunks_file:
+            for key, price in pending.items():
+                series_id = self.series.get(key)
+                if series_id is None:
+                    series_id = self._add_series(key)
+                    series_file.write(json.dumps({'retailer': key[0], 'product': key[1]},
+                                                 ensure_ascii=False) + '\n')
+                    self.counts['new_series'] += 1
+
+                price = array('f', [price])[0]  # As stored
+                last = self.last_points.get(series_id)
+                chunks = self.series_chunks.get(series_id)
+                if last is not None and last[0] == offset:
+                    # A later run on the same day: keep the day's lowest price
+                    if price < last[1]:
+                        position = chunks[-1] * CHUNK_POINTS + self.chunk_count[chunks[-1]] - 1
+                        _write_at(prices_file, position, 'f', price)
+                        self.last_points[series_id] = (offset, price)
+                        self.counts['updated'] += 1
+                        written += 1
+                    else:
+                        self.counts['unchanged'] += 1
+                    continue
+                if last is not None and last[0] > offset:
+                    self.counts['out_of_order'] += 1
+                    continue
+
+                if chunks is None or self.chunk_count[chunks[-1]] == CHUNK_POINTS:
+                    chunk = len(self.chunk_series)
+                    self.chunk_series.append(series_id)
+                    self.chunk_count.append(0)
+                    self.series_chunks.setdefault(series_id, []).append(chunk)
+                else:
+                    chunk = chunks[-1]
+
+                # Point first, then the fill count that makes it visible
+                position = chunk * CHUNK_POINTS + self.chunk_count[chunk]
+                _write_at(days_file, position, 'I', offset)
+                _write_at(prices_file, position, 'f', price)
+                self.chunk_count[chunk] += 1
+                series_file.flush()
+                _write_at(chunks_file, 2 * chunk, 'I', series_id, self.chunk_count[chunk])
+                self.last_points[series_id] = (offset, price)
+                self.counts['appended'] += 1
+                written += 1
+        return written
+
+    def _open_views(self):
+        """(days, prices) memoryviews over the memory-mapped point files"""
+        if self._views is None:
+            maps = []
+            for name in ('days.u32', 'prices.f32'):
+                file_path = self._file(name)
+                if not file_path.exists() or file_path.stat().st_size == 0:
+                    maps.append(None)
+                    continue
+                with open(file_path, 'rb') as f:
+                    maps.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            views = tuple(memoryview(m).cast(code) if m is not None else memoryview(array(code))
+                          for m, code in zip(maps, ('I', 'f')))
+            self._views = (views, maps)
+        return self._views[0]
+
+    def _close_views(self):
+        if self._views is not None:
+            views, maps = self._views
+            for view in views:
+                view.release()
+            for m in maps:
+                if m is not None:
+                    m.close()
+            self._views = None
+
+    def close(self):
+        self._close_views()
+
+    def range(self, retailer: str, product_id: str, start: Optional[date] = None,
+              end: Optional[date] = None) -> List[Tuple[date, float]]:
+        """(day, price) points of a series between start and end (inclusive)"""
+        self.load()
+        series_id = self.series.get((retailer, product_id))
+        if series_id is None or series_id not in self.series_chunks or not self.path:
+            return []
+
+        low = day_offset(start) if start else 0
+        high = day_offset(end) if end else 2 ** 32 - 1
+        days, prices = self._open_views()
+        points = []
+        for chunk in self.series_chunks[series_id]:
+            base = chunk * CHUNK_POINTS
+            chunk_days = days[base:base + self.chunk_count[chunk]]
+            if chunk_days[-1] < low:
+                continue
+            if chunk_days[0] > high:
+                break
+            first = bisect.bisect_left(chunk_days, low)
+            last = bisect.bisect_right(chunk_days, high)
+            points.extend((offset_day(chunk_days[i]), round(prices[base + i], 2)) for i in range(first, last))
+        return points
+
+    def downsample(self, retailer: str, product_id: str, period: str = 'week',
+                   start: Optional[date] = None, end: Optional[date] = None) -> List[Dict]:
+        """Min / max / average / closing price per day or week (weeks start on Sunday)"""
+        if period not in PERIODS:
+            raise ValueError(f"period must be one of {PERIODS}, got {period!r}")
+
+        buckets: List[Dict] = []
+        for day, price in self.range(retailer, product_id, start, end):
+            bucket_start = period_start(day, period).isoformat()
+            if not buckets or buckets[-1]['date'] != bucket_start:
+                buckets.append({'date': bucket_start, 'min_price': price, 'max_price': price,
+                                'avg_price': price, 'close_price': price, 'points': 1})
+                continue
+            bucket = buckets[-1]
+            bucket['min_price'] = min(bucket['min_price'], price)
+            bucket['max_price'] = max(bucket['max_price'], price)
+            bucket['avg_price'] += price  # Sum until the bucket is complete
+            bucket['close_price'] = price
+            bucket['points'] += 1
+
+        for bucket in buckets:
+            bucket['avg_price'] = round(bucket['avg_price'] / bucket['points'], 2)
+        return buckets
+
+    def metrics(self) -> Dict[str, int]:
+        return dict(self.counts, series=len(self.series_keys), chunks=len(self.chunk_series))
+
+    def __len__(self) -> int:
+        self.load()
+        return len(self.series_keys)
+
+
+def _write_at(f, position: int, typecode: str, *values):
+    """Write values of a 4-byte type at an item position of a flat file"""
+    f.seek(position * 4)
+    f.write(array(typecode, values).tobytes())
@@ -0,0 +1,181 @@
+"""
+Product x network price matrix with batch statistics.
+
+``price_statistics`` and ``savings_analysis`` are reductions over the
+networks a product is sold in. ``PriceMatrix`` keeps every unified
+product's network prices in one dense product x network matrix (NaN where
+a network does not sell the product) that the unification stage updates in
+place, and ``statistics()`` computes min, max, mean, range, cheapest /
+most expensive network and savings for every product in one vectorized
+pass.
+
+NumPy is optional: without it the matrix is a list of float arrays and the
+same statistics are computed row by row.
+"""
+
+import math
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Pure-Python fallback below
+    np = None
+
+INITIAL_ROWS = 1024
+
+
+def price_statistics_entry(minimum: float, maximum: float, mean: float) -> Dict:
+    """'price_statistics' of a unified product"""
+    return {
+        'min_price': minimum,
+        'max_price': maximum,
+        'avg_price': round(mean, 2),
+        'price_range': round(maximum - minimum, 2),
+    }
+
+
+def savings_entry(minimum: float, maximum: float, cheapest: str, most_expensive: str) -> Dict:
+    """'savings_analysis' of a product sold in two or more networks"""
+    amount = round(maximum - minimum, 2)
+    percentage = round((maximum - minimum) / maximum * 100, 1) if maximum else 0.0
+    return {
+        'max_savings_amount': amount,
+        'max_savings_percentage': percentage,
+        'cheapest_network': cheapest,
+        'most_expensive_network': most_expensive,
+        'savings_opportunities': f"חסוך ₪{amount} ({percentage}%) בבחירת {cheapest} על פני {most_expensive}",
+    }
+
+
+class PriceStatistics:
+    """Per-product reductions of a PriceMatrix (NumPy arrays or lists, indexed by row)"""
+
+    def __init__(self, networks: Sequence[str], count, minimum, maximum, mean, cheapest, most_expensive):
+        self.networks = list(networks)
+        self.count = count
+        self.minimum = minimum
+        self.maximum = maximum
+        self.mean = mean
+        self.cheapest = cheapest
+        self.most_expensive = most_expensive
+
+    def row(self, index: int) -> Tuple[Dict, Optional[Dict]]:
+        """(price_statistics, savings_analysis) of one product in the products.json schema"""
+        minimum, maximum = float(self.minimum[index]), float(self.maximum[index])
+        price_statistics = price_statistics_entry(minimum, maximum, float(self.mean[index]))
+        if int(self.count[index]) < 2:
+            return price_statistics, None
+
+        return price_statistics, savings_entry(minimum, maximum, self.networks[int(self.cheapest[index])],
+                                               self.networks[int(self.most_expensive[index])])
+
+
+class PriceMatrix:
+    """Dense product x network price matrix, NaN for missing prices"""
+
+    def __init__(self, use_numpy: Optional[bool] = None):
+        self.use_numpy = np is not None if use_numpy is None else bool(use_numpy and np is not None)
+        self.networks: List[str] = []
+        self.network_index: Dict[str, int] = {}
+        self.rows = 0
+
+        if self.use_numpy:
+            self._data = np.full((INITIAL_ROWS, 0), np.nan)
+        else:
+            self._data: List[array] = []
+
+    def add_row(self) -> int:
+        """Index of a new, empty product row"""
+        if self.use_numpy and self.rows == self._data.shape[0]:
+            grown = np.full((self.rows * 2, self._data.shape[1]), np.nan)
+            grown[:self.rows] = self._data[:self.rows]
+            self._data = grown
+        elif not self.use_numpy:
+            self._data.append(array('d', [math.nan]) * len(self.networks))
+
+        self.rows += 1
+        return self.rows - 1
+
+    def column(self, network: str) -> int:
+        """Column of a network, added on first use"""
+        index = self.network_index.get(network)
+        if index is not None:
+            return index
+
+        index = self.network_index[network] = len(self.networks)
+        self.networks.append(network)
+        if self.use_numpy:
+            self._data = np.hstack([self._data, np.full((self._data.shape[0], 1), np.nan)])
+        else:
+            for row in self._data:
+                row.append(math.nan)
+        return index
+
+    def set(self, row: int, network: str, price: float):
+        # A new network's column replaces the NumPy array: add it before indexing the row
+        column = self.column(network)
+        self._data[row][column] = price
+
+    def get(self, row: int, network: str) -> Optional[float]:
+        column = self.network_index.get(network)
+        if column is None:
+            return None
+        price = float(self._data[row][column])
+        return None if math.isnan(price) else price
+
+    def statistics(self) -> PriceStatistics:
+        """Reductions for every product; ties go to the alphabetically first network"""
+        # Columns in network-name order so argmin/argmax ties resolve by name
+        order = sorted(range(len(self.networks)), key=self.networks.__getitem__)
+        networks = [self.networks[column] for column in order]
+
+        if self.use_numpy:
+            return self._numpy_statistics(order, networks)
+        return self._python_statistics(order, networks)
+
+    def _numpy_statistics(self, order: List[int], networks: List[str]) -> PriceStatistics:
+        if not networks or not self.rows:
+            # argmin/argmax fail on an empty axis (e.g. a run where nothing is meat)
+            empty = np.empty(self.rows)
+            return PriceStatistics(networks, np.zeros(self.rows, dtype=int), np.full(self.rows, np.inf),
+                                   np.full(self.rows, -np.inf), np.zeros(self.rows), empty, empty)
+
+        prices = self._data[:self.rows][:, order]
+        present = ~np.isnan(prices)
+        count = present.sum(axis=1)
+
+        # Rows without prices never occur for products, but must not warn or fail
+        filled_low = np.where(present, prices, np.inf)
+        filled_high = np.where(present, prices, -np.inf)
+        minimum = filled_low.min(axis=1, initial=np.inf)
+        maximum = filled_high.max(axis=1, initial=-np.inf)
+        mean = np.where(present, prices, 0.0).sum(axis=1) / np.maximum(count, 1)
+        return PriceStatistics(networks, count, minimum, maximum, mean,
+                               filled_low.argmin(axis=1), filled_high.argmax(axis=1))
+
+    def _python_statistics(self, order: List[int], networks: List[str]) -> PriceStatistics:
+        count, minimum, maximum, mean, cheapest, most_expensive = [], [], [], [], [], []
+        for row in self._data[:self.rows]:
+            prices = [(row[column], position) for position, column in enumerate(order)
+                      if not math.isnan(row[column])]
+            count.append(len(prices))
+            if not prices:
+                minimum.append(math.inf)
+                maximum.append(-math.inf)
+                mean.append(0.0)
+                cheapest.append(0)
+                most_expensive.append(0)
+                continue
+
+            low = min(prices, key=lambda price: price[0])
+            high = max(prices, key=lambda price: (price[0], -price[1]))
+            minimum.append(low[0])
+            maximum.append(high[0])
+            mean.append(sum(price for price, _ in prices) / len(prices))
+            cheapest.append(low[1])
+            most_expensive.append(high[1])
+        return PriceStatistics(networks, count, minimum, maximum, mean, cheapest, most_expensive)
+
+    def __len__(self) -> int:
+        return self.rows
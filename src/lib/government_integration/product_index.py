@@ -0,0 +1,316 @@
+"""
+In-memory indexed queries over the filtered meat catalog.
+
+Comparison questions such as "cheapest entrecote per retailer", "all chicken
+under 40₪ per unit of measure" or "products by quality grade" used to be
+linear scans over the product list. ``ProductIndex`` keeps hash indexes on
+the categorical fields (value -> row numbers) and sorted (price, row)
+indexes on the price fields, updated incrementally as filtered batches
+arrive; a product seen again (same retailer, store and product id) replaces
+its previous row. Replaced rows are dropped and the rest renumbered (in
+arrival order) once they make up more than half of the rows.
+
+Every hash-index bucket also has its own price indexes, so a filtered
+query walks the smallest matching bucket in price order, checks the other
+filters with set lookups and stops at the limit: top-k and "cheapest per
+retailer" touch a handful of rows however large the catalog is. Price
+indexes are ``SortedPriceIndex``es, sorted runs of at most a few hundred
+entries, so an insert or delete moves one short run instead of a whole
+index.
+"""
+
+import bisect
+import math
+from enum import Enum
+from itertools import islice
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from .pipeline import product_key
+
+INDEXED_FIELDS = ('category_mapping', 'normalized_cut_id', 'retailer', 'quality_grade')
+PRICE_FIELDS = ('price', 'unit_of_measure_price')
+
+# Entries per run of a SortedPriceIndex (runs split at twice this size)
+RUN_SIZE = 256
+
+# Replaced rows kept before compact() is considered (it runs once they outnumber live rows)
+COMPACT_MIN_FREE_ROWS = 1024
+
+PriceEntry = Tuple[float, int]
+
+
+def index_value(value: Any) -> Hashable:
+    """Index key of a field value (enum members by their value, so 'premium' finds QualityGrade.PREMIUM)"""
+    return value.value if isinstance(value, Enum) else value
+
+
+class SortedPriceIndex:
+    """Sorted (price, row) entries kept in short sorted runs for cheap inserts and deletes"""
+
+    def __init__(self):
+        self._runs: List[List[PriceEntry]] = []
+        self._maxes: List[PriceEntry] = []
+        self._length = 0
+
+    def add(self, entry: PriceEntry):
+        if not self._runs:
+            self._runs.append([entry])
+            self._maxes.append(entry)
+            self._length = 1
+            return
+
+        i = bisect.bisect_left(self._maxes, entry)
+        if i == len(self._runs):
+            i -= 1
+            self._runs[i].append(entry)
+            self._maxes[i] = entry
+        else:
+            bisect.insort(self._runs[i], entry)
+        self._length += 1
+
+        run = self._runs[i]
+        if len(run) > 2 * RUN_SIZE:
+            self._runs.insert(i + 1, run[RUN_SIZE:])
+            del run[RUN_SIZE:]
+            self._maxes.insert(i, run[-1])
+
+    def update(self, entries: List[PriceEntry]):
+        """Add many entries; large batches rebuild the runs with one sort instead of many inserts"""
+        if len(entries) * 8 < self._length:
+            for entry in entries:
+                self.add(entry)
+            return
+
+        merged = [entry for run in self._runs for entry in run]
+        merged.extend(entries)
+        merged.sort()
+        self._runs = [merged[start:start + RUN_SIZE] for start in range(0, len(merged), RUN_SIZE)]
+        self._maxes = [run[-1] for run in self._runs]
+        self._length = len(merged)
+
+    def remove(self, entry: PriceEntry) -> bool:
+        i = bisect.bisect_left(self._maxes, entry)
+        if i == len(self._runs):
+            return False
+        run = self._runs[i]
+        position = bisect.bisect_left(run, entry)
+        if position == len(run) or run[position] != entry:
+            return False
+
+        del run[position]
+        self._length -= 1
+        if not run:
+            del self._runs[i]
+            del self._maxes[i]
+        elif position == len(run):
+            self._maxes[i] = run[-1]
+        return True
+
+    def _locate(self, key: Tuple[float, float], right: bool) -> Tuple[int, int]:
+        """(run, position) where key would be inserted"""
+        find = bisect.bisect_right if right else bisect.bisect_left
+        i = find(self._maxes, key)
+        if i == len(self._runs):
+            return i, 0
+        return i, find(self._runs[i], key)
+
+    def range(self, low: Optional[float] = None, high: Optional[float] = None,
+              descending: bool = False) -> Iterator[PriceEntry]:
+        """Entries with low <= price <= high, in price order"""
+        first_run, first = (0, 0) if low is None else self._locate((low, -math.inf), False)
+        last_run, last = (len(self._runs), 0) if high is None else self._locate((high, math.inf), True)
+        if (first_run, first) >= (last_run, last):
+            return
+
+        runs = range(first_run, min(last_run + 1, len(self._runs)))
+        for i in (reversed(runs) if descending else runs):
+            run = self._runs[i]
+            start = first if i == first_run else 0
+            stop = last if i == last_run else len(run)
+            if descending:
+                yield from (run[position] for position in range(stop - 1, start - 1, -1))
+            else:
+                yield from islice(run, start, stop)
+
+    def __len__(self) -> int:
+        return self._length
+
+
+class ProductIndex:
+    """Hash indexes on categorical fields and sorted price indexes over enriched products"""
+
+    def __init__(self, products: Iterable[Mapping] = ()):
+        self._reset()
+        self.add_batch(products)
+
+    def _reset(self):
+        self.rows: List[Optional[Mapping]] = []
+        self.free_rows = 0
+        self.row_by_key: Dict[Tuple[str, str, str], int] = {}
+        self.hash_indexes: Dict[str, Dict[Hashable, Set[int]]] = {field: {} for field in INDEXED_FIELDS}
+        self.price_indexes: Dict[str, SortedPriceIndex] = {field: SortedPriceIndex() for field in PRICE_FIELDS}
+        # (field, value, price field) -> price index of the rows in that hash-index bucket
+        self.bucket_price_indexes: Dict[Tuple[str, Hashable, str], SortedPriceIndex] = {}
+
+    def add(self, product: Mapping) -> int:
+        """Index one product (replacing its previous version); returns its row (until the next compaction)"""
+        row = self._add(product, None)
+        if self._should_compact():
+            self.compact()
+            row = self.row_by_key[product_key(product)]
+        return row
+
+    def add_batch(self, products: Iterable[Mapping]):
+        """Index a batch, e.g. one written batch of filter_meat_products output"""
+        pending: Dict[Tuple, List[PriceEntry]] = {}
+        for product in products:
+            self._add(product, pending)
+
+        for key, entries in pending.items():
+            if isinstance(key, str):
+                index = self.price_indexes[key]
+            else:
+                index = self.bucket_price_indexes.get(key)
+                if index is None:
+                    index = self.bucket_price_indexes[key] = SortedPriceIndex()
+            # Rows replaced later in the same batch are not indexed yet
+            index.update([entry for entry in entries if self.rows[entry[1]] is not None])
+
+        if self._should_compact():
+            self.compact()
+
+    def _should_compact(self) -> bool:
+        return self.free_rows > COMPACT_MIN_FREE_ROWS and self.free_rows * 2 > len(self.rows)
+
+    def compact(self):
+        """Drop replaced rows and renumber the others in arrival order, rebuilding the indexes in bulk"""
+        products = list(self)
+        self._reset()
+        self.add_batch(products)
+
+    def _add(self, product: Mapping, pending: Optional[Dict[Tuple, List[PriceEntry]]]) -> int:
+        """Index a product; price entries go to pending (per price index key) when given"""
+        key = product_key(product)
+        previous = self.row_by_key.get(key)
+        if previous is not None:
+            self._remove_row(previous)
+
+        row = self.row_by_key[key] = len(self.rows)
+        self.rows.append(product)
+        buckets = []
+        for field, index in self.hash_indexes.items():
+            value = product.get(field)
+            if value is not None:
+                buckets.append((field, index_value(value)))
+                index.setdefault(buckets[-1][1], set()).add(row)
+        for price_field, index in self.price_indexes.items():
+            price = product.get(price_field)
+            if not isinstance(price, (int, float)):
+                continue
+            entry = (float(price), row)
+            if pending is not None:
+                pending.setdefault(price_field, []).append(entry)
+                for field, value in buckets:
+                    pending.setdefault((field, value, price_field), []).append(entry)
+                continue
+
+            index.add(entry)
+            for field, value in buckets:
+                bucket_key = (field, value, price_field)
+                bucket_index = self.bucket_price_indexes.get(bucket_key)
+                if bucket_index is None:
+                    bucket_index = self.bucket_price_indexes[bucket_key] = SortedPriceIndex()
+                bucket_index.add(entry)
+        return row
+
+    def _remove_row(self, row: int):
+        product = self.rows[row]
+        self.rows[row] = None
+        self.free_rows += 1
+        buckets = []
+        for field, index in self.hash_indexes.items():
+            value = product.get(field)
+            if value is not None:
+                buckets.append((field, index_value(value)))
+                rows = index[buckets[-1][1]]
+                rows.discard(row)
+                if not rows:
+                    del index[buckets[-1][1]]
+        for price_field, index in self.price_indexes.items():
+            price = product.get(price_field)
+            if isinstance(price, (int, float)):
+                entry = (float(price), row)
+                index.remove(entry)
+                for field, value in buckets:
+                    bucket_key = (field, value, price_field)
+                    bucket_index = self.bucket_price_indexes.get(bucket_key)
+                    if bucket_index is not None and bucket_index.remove(entry) and not bucket_index:
+                        del self.bucket_price_indexes[bucket_key]
+
+    def query(self, min_price: Optional[float] = None, max_price: Optional[float] = None,
+              limit: Optional[int] = None, price_field: str = 'price', descending: bool = False,
+              **filters) -> List[Mapping]:
+        """Products matching the field filters within [min_price, max_price], ordered by price_field"""
+        return list(islice(self.iter_query(min_price, max_price, price_field, descending, **filters), limit))
+
+    def iter_query(self, min_price: Optional[float] = None, max_price: Optional[float] = None,
+                   price_field: str = 'price', descending: bool = False, **filters) -> Iterator[Mapping]:
+        """Lazy query(): products are produced in price order as they are consumed"""
+        if price_field not in self.price_indexes:
+            raise ValueError(f"{price_field!r} is not a price index; price indexes: {PRICE_FIELDS}")
+
+        # Walk the smallest filter bucket in price order, checking the others by set lookup
+        buckets = []
+        for field, value in filters.items():
+            if field not in self.hash_indexes:
+                raise ValueError(f"{field!r} is not indexed; indexed fields: {INDEXED_FIELDS}")
+            rows = self.hash_indexes[field].get(index_value(value))
+            if not rows:
+                return
+            buckets.append((len(rows), field, index_value(value), rows))
+
+        if buckets:
+            buckets.sort(key=lambda bucket: bucket[0])
+            _, field, value, _ = buckets[0]
+            index = self.bucket_price_indexes.get((field, value, price_field))
+            if index is None:
+                return  # No product of the bucket has this price
+            others = [rows for *_, rows in buckets[1:]]
+        else:
+            index, others = self.price_indexes[price_field], []
+
+        for _, row in index.range(min_price, max_price, descending):
+            if all(row in rows for rows in others):
+                yield self.rows[row]
+
+    def top_k(self, k: int, price_field: str = 'price', descending: bool = False, **filters) -> List[Mapping]:
+        """The k cheapest (or most expensive) products matching the filters"""
+        return self.query(limit=k, price_field=price_field, descending=descending, **filters)
+
+    def cheapest_by(self, group_field: str, price_field: str = 'price', **filters) -> Dict[Hashable, Mapping]:
+        """Cheapest matching product per value of group_field, e.g. the cheapest entrecote per retailer"""
+        groups = len(self.hash_indexes[group_field]) if group_field in self.hash_indexes else None
+        cheapest: Dict[Hashable, Mapping] = {}
+        for product in self.iter_query(price_field=price_field, **filters):
+            group = index_value(product.get(group_field))
+            if group not in cheapest:
+                cheapest[group] = product
+                if len(cheapest) == groups:
+                    break  # Every group has its cheapest product
+        return cheapest
+
+    def lookup(self, field: str, value: Any) -> List[Mapping]:
+        """Products with field == value, in arrival order"""
+        if field not in self.hash_indexes:
+            raise ValueError(f"{field!r} is not indexed; indexed fields: {INDEXED_FIELDS}")
+        return [self.rows[row] for row in sorted(self.hash_indexes[field].get(index_value(value), ()))]
+
+    def values(self, field: str) -> Dict[Hashable, int]:
+        """Indexed values of a field with their product counts"""
+        return {value: len(rows) for value, rows in self.hash_indexes[field].items()}
+
+    def __iter__(self) -> Iterator[Mapping]:
+        return (product for product in self.rows if product is not None)
+
+    def __len__(self) -> int:
+        return len(self.row_by_key)
@@ -0,0 +1,137 @@
+"""
+Opt-in per-stage CPU and memory profiling.
+
+``ProfiledRunMetrics`` is a drop-in ``RunMetrics`` that, in addition to the
+stage timers, runs one ``cProfile`` profiler per pipeline stage and charges
+net ``tracemalloc`` allocations to the stage that made them. Because stages
+are exclusive (entering a stage pauses the enclosing one), only the
+profiler of the innermost stage is enabled at any time, so fuzzy matching,
+keyword scanning, XML parsing and output writing show up separately.
+
+Profiling is chosen once per run by picking this class instead of
+``RunMetrics``; the plain class carries no profiling checks at all.
+"""
+
+import cProfile
+import io
+import pstats
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+from .metrics import STAGES, RunMetrics
+
+
+class _RawStats:
+    """pstats input built from the stats dict of a profiler (e.g. shipped from a worker)"""
+
+    def __init__(self, stats: Dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class ProfiledRunMetrics(RunMetrics):
+    """RunMetrics with a cProfile profiler and tracemalloc accounting per stage"""
+
+    def __init__(self, trace_memory: bool = True, top_n: int = 25):
+        super().__init__()
+        self.top_n = top_n
+        self.profilers = {stage: cProfile.Profile() for stage in STAGES}
+        self.collected: Dict[str, List[Dict]] = {stage: [] for stage in STAGES}
+        self.allocated_bytes = dict.fromkeys(STAGES, 0)
+
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._memory_mark = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+
+    def _charge_memory(self):
+        if self.trace_memory and self._stack:
+            current = tracemalloc.get_traced_memory()[0]
+            self.allocated_bytes[self._stack[-1]] += current - self._memory_mark
+            self._memory_mark = current
+
+    def enter(self, stage: str):
+        if self._stack:
+            self.profilers[self._stack[-1]].disable()
+        self._charge_memory()
+        super().enter(stage)
+        self.profilers[stage].enable()
+
+    def exit(self):
+        self.profilers[self._stack[-1]].disable()
+        self._charge_memory()
+        super().exit()
+        if self._stack:
+            self.profilers[self._stack[-1]].enable()
+
+    def merge(self, other: RunMetrics):
+        super().merge(other)
+        if isinstance(other, ProfiledRunMetrics):
+            for stage in STAGES:
+                self.collected[stage].extend(other.stage_profiles(stage))
+                self.allocated_bytes[stage] += other.allocated_bytes[stage]
+
+    def stage_profiles(self, stage: str) -> List[Dict]:
+        """Raw profile stats of a stage: this process' profiler plus merged worker profiles"""
+        profiler = self.profilers.get(stage)
+        if profiler is None:
+            return list(self.collected[stage])
+        profiler.create_stats()
+        return self.collected[stage] + ([profiler.stats] if profiler.stats else [])
+
+    def __getstate__(self):
+        # Profilers cannot be pickled; workers ship their raw stats instead
+        state = self.__dict__.copy()
+        state['collected'] = {stage: self.stage_profiles(stage) for stage in STAGES}
+        state['profilers'] = {}
+        return state
+
+    def stage_stats(self, stage: str):
+        """Combined pstats.Stats of a stage, None if it never ran"""
+        profiles = self.stage_profiles(stage)
+        if not profiles:
+            return None
+        stats = pstats.Stats(_RawStats(profiles[0]))
+        for profile in profiles[1:]:
+            stats.add(_RawStats(profile))
+        return stats
+
+    def write_report(self, directory: Path, prefix: str) -> List[Path]:
+        """Write <prefix>.profile-<stage>.prof dumps and a <prefix>.profile-report.txt summary"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        written = []
+        report = io.StringIO()
+
+        report.write("Per-stage time (exclusive) and net traced allocations\n")
+        for stage in STAGES:
+            report.write(f"  {stage:<9} {self.stage_seconds[stage]:10.3f}s "
+                         f"{self.stage_calls[stage]:>10} calls "
+                         f"{self.allocated_bytes[stage] / 1024:>12.1f} KiB\n")
+
+        for stage in STAGES:
+            stats = self.stage_stats(stage)
+            if stats is None:
+                continue
+            dump_path = directory / f"{prefix}.profile-{stage}.prof"
+            stats.dump_stats(str(dump_path))
+            written.append(dump_path)
+
+            report.write(f"\n=== {stage}: top {self.top_n} functions by cumulative time ===\n")
+            stats.stream = report
+            stats.sort_stats('cumulative').print_stats(self.top_n)
+
+        if self.trace_memory and tracemalloc.is_tracing():
+            report.write(f"\n=== Top {self.top_n} allocation sites still alive ===\n")
+            snapshot = tracemalloc.take_snapshot()
+            for statistic in snapshot.statistics('lineno')[:self.top_n]:
+                report.write(f"{statistic}\n")
+            tracemalloc.stop()
+
+        report_path = directory / f"{prefix}.profile-report.txt"
+        report_path.write_text(report.getvalue(), encoding='utf-8')
+        written.append(report_path)
+        return written
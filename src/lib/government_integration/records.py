@@ -0,0 +1,296 @@
+"""
+Compact product records.
+
+An enriched product used to be a dict copy of the parsed row plus about ten
+enrichment keys, a private copy of the matched cut and an ISO timestamp
+string. ``ProductRecord`` stores the same fields in ``__slots__`` instead:
+repeated strings (retailer, chain, store, category, ...) are interned, the
+quality grade is a ``QualityGrade`` member and ``processed_at`` is kept as
+a float and only rendered when read.
+
+A record is a ``MutableMapping`` whose keys are the fields that are set, so
+code written against product dicts keeps working; ``to_dict()`` (or
+``json_default`` for ``json.dumps``) materializes a plain dict at the JSON
+boundary.
+
+``ProductBatch`` holds a written batch of products column by column
+(prices in a float array): the sink, delta tracker, unifier, price history
+and query index all read the same read-only row views, and the products a
+run returns are materialized as dicts from the batches only at the end.
+"""
+
+import math
+import sys
+from array import array
+from collections.abc import Mapping, MutableMapping
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .match_profile import QualityGrade
+
+# Known product fields, in output order: parsed row, enrichment, filter metadata
+ROW_FIELDS = (
+    'name_hebrew', 'name_english', 'price', 'retailer', 'category', 'unit_of_measure_price',
+    'chain_id', 'sub_chain_id', 'store_id', 'file_type', 'source_file',
+    'item_code', 'item_type', 'manufacturer', 'unit_of_measure', 'unit_qty', 'quantity',
+    'is_weighted', 'price_updated_at',
+)
+ENRICHMENT_FIELDS = (
+    'basarometer_match', 'normalized_cut_id', 'category_mapping', 'quality_grade',
+    'english_mapping', 'mapping_confidence',
+)
+FILTER_FIELDS = ('source', 'processed_at', 'basarometer_processed', 'meat_confidence_score', 'filtering_source')
+PRODUCT_FIELDS = ROW_FIELDS + ENRICHMENT_FIELDS + FILTER_FIELDS
+
+# Low-cardinality string fields shared by many rows
+INTERNED_FIELDS = frozenset({
+    'retailer', 'category', 'chain_id', 'sub_chain_id', 'store_id', 'file_type', 'source_file',
+    'item_type', 'manufacturer', 'unit_of_measure', 'is_weighted', 'normalized_cut_id',
+    'category_mapping', 'english_mapping', 'source', 'filtering_source',
+})
+
+# Fields kept in float arrays by ProductBatch when every value is a float (NaN marks a missing value)
+NUMERIC_FIELDS = ('price', 'meat_confidence_score')
+
+_FIELD_SET = frozenset(PRODUCT_FIELDS)
+
+
+def _render(field: str, value: Any) -> Any:
+    """Stored value of a field as it appears in a product dict"""
+    if field == 'processed_at' and isinstance(value, float):
+        return datetime.fromtimestamp(value).isoformat()
+    return value
+
+
+def _store(field: str, value: Any) -> Any:
+    """Compact representation of a field value"""
+    if field in INTERNED_FIELDS:
+        return sys.intern(value) if type(value) is str else value
+    if field == 'quality_grade' and isinstance(value, str) and not isinstance(value, QualityGrade):
+        try:
+            return QualityGrade(value)
+        except ValueError:
+            return value
+    return value
+
+
+class ProductRecord(MutableMapping):
+    """Slotted, dict-compatible product; unset slots are absent keys, unknown keys go to 'extra'"""
+
+    __slots__ = PRODUCT_FIELDS + ('extra',)
+
+    def __init__(self, fields: Optional[Mapping] = None, **more):
+        self.extra: Optional[Dict[str, Any]] = None
+        if fields:
+            self.update(fields)
+        if more:
+            self.update(more)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            try:
+                return _render(key, getattr(self, key))
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key in _FIELD_SET:
+            setattr(self, key, _store(key, value))
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in _FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self.extra is not None and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in _FIELD_SET:
+            return hasattr(self, key)
+        return self.extra is not None and key in self.extra
+
+    def __iter__(self) -> Iterator[str]:
+        for field in PRODUCT_FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"ProductRecord({self.to_dict()!r})"
+
+    def __getstate__(self):
+        # Slots only (no __dict__): ship the set fields, e.g. from a worker process
+        return {field: getattr(self, field) for field in self.__slots__ if hasattr(self, field)}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.extra = None
+        for field, value in state.items():
+            setattr(self, field, value)
+
+    def copy(self) -> 'ProductRecord':
+        return ProductRecord(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict copy for the JSON boundary (enum as string, private copy of the matched cut)"""
+        result = {}
+        for field in PRODUCT_FIELDS:
+            try:
+                value = getattr(self, field)
+            except AttributeError:
+                continue
+            result[field] = _render(field, _plain(field, value))
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps default: records and batch rows as dicts, anything else as a string"""
+    if isinstance(value, (ProductRecord, ProductRowView)):
+        return value.to_dict()
+    return str(value)
+
+
+def _plain(field: str, value: Any) -> Any:
+    """Field value as it appears in a plain product dict (enum as string, private copy of the matched cut)"""
+    if field == 'basarometer_match' and isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, QualityGrade):
+        return value.value
+    return value
+
+
+class ProductRowView(Mapping):
+    """Read-only view of one row of a ProductBatch"""
+
+    __slots__ = ('batch', 'index')
+
+    def __init__(self, batch: 'ProductBatch', index: int):
+        self.batch = batch
+        self.index = index
+
+    def __getitem__(self, key: str) -> Any:
+        return self.batch.value(key, self.index)
+
+    def __iter__(self) -> Iterator[str]:
+        for field in self.batch.columns:
+            if self.batch.has_value(field, self.index):
+                yield field
+        extra = self.batch.extras[self.index] if self.batch.extras else None
+        if extra:
+            yield from extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"ProductRowView({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict copy of the row, like ProductRecord.to_dict()"""
+        return {field: _plain(field, self[field]) for field in self}
+
+
+_MISSING = object()
+
+
+class ProductBatch:
+    """Products stored column by column; numeric fields live in float arrays"""
+
+    __slots__ = ('columns', 'extras', 'length')
+
+    def __init__(self, columns: Dict[str, Sequence], length: int, extras: Optional[List] = None):
+        self.columns = columns
+        self.length = length
+        self.extras = extras
+
+    @classmethod
+    def from_records(cls, products: Iterable[Mapping]) -> 'ProductBatch':
+        products = list(products)
+        present = set()
+        extras = None
+        for index, product in enumerate(products):
+            present.update(product.keys())
+            unknown = {key: value for key, value in product.items() if key not in _FIELD_SET}
+            if unknown:
+                if extras is None:
+                    extras = [None] * len(products)
+                extras[index] = unknown
+
+        columns: Dict[str, Sequence] = {}
+        for field in PRODUCT_FIELDS:
+            if field not in present:
+                continue
+            values = [product.get(field) for product in products]
+            if field in NUMERIC_FIELDS and all(type(value) is float or value is None for value in values):
+                columns[field] = array('d', (math.nan if value is None else value for value in values))
+            else:
+                columns[field] = [_store(field, product[field]) if field in product else _MISSING
+                                  for product in products]
+        return cls(columns, len(products), extras)
+
+    def has_value(self, field: str, index: int) -> bool:
+        column = self.columns[field]
+        value = column[index]
+        if isinstance(column, array):
+            return not math.isnan(value)
+        return value is not _MISSING
+
+    def value(self, field: str, index: int) -> Any:
+        column = self.columns.get(field)
+        if column is None or not self.has_value(field, index):
+            extra = self.extras[index] if self.extras else None
+            if extra and field in extra:
+                return extra[field]
+            raise KeyError(field)
+        return _render(field, column[index])
+
+    def column(self, field: str) -> List[Any]:
+        """Values of one field, None where a product does not have it"""
+        column = self.columns.get(field)
+        if column is None:
+            return [None] * self.length
+        if isinstance(column, array):
+            return [None if math.isnan(value) else value for value in column]
+        return [None if value is _MISSING else _render(field, value) for value in column]
+
+    def select(self, indices: Iterable[int]) -> 'ProductBatch':
+        """New batch with the given rows, e.g. the rows of one retailer"""
+        indices = list(indices)
+        columns = {field: (array('d', (column[i] for i in indices)) if isinstance(column, array)
+                           else [column[i] for i in indices])
+                   for field, column in self.columns.items()}
+        extras = [self.extras[i] for i in indices] if self.extras else None
+        return ProductBatch(columns, len(indices), extras)
+
+    def row(self, index: int) -> ProductRowView:
+        if not -self.length <= index < self.length:
+            raise IndexError(index)
+        return ProductRowView(self, index % self.length if self.length else index)
+
+    def __iter__(self) -> Iterator[ProductRowView]:
+        for index in range(self.length):
+            yield ProductRowView(self, index)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Plain dicts for the JSON boundary"""
+        return [row.to_dict() for row in self]
+
@@ -0,0 +1,141 @@
+"""
+Constant-memory streaming statistics.
+
+The filter used to append one confidence score per included product to a
+list that grew for the lifetime of the process and was dumped verbatim into
+the stats file. ``StreamingStats`` keeps count, sum, min/max and a
+fixed-bucket histogram instead, from which the mean and approximate
+quantiles are derived. Every field merges exactly (counts and sums add,
+min/max compare), so stats built by parallel workers combine into the same
+result as a single serial pass.
+"""
+
+from typing import Dict, Iterable, Optional
+
+# Quantiles reported in the stats file
+REPORTED_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class StreamingStats:
+    """Count, mean, min/max, histogram and approximate quantiles of a value stream"""
+
+    __slots__ = ('low', 'high', 'buckets', 'count', 'total', 'minimum', 'maximum', 'histogram')
+
+    def __init__(self, low: float = 0.0, high: float = 1.0, buckets: int = 20):
+        if high <= low or buckets < 1:
+            raise ValueError('histogram needs high > low and at least one bucket')
+
+        self.low = low
+        self.high = high
+        self.buckets = buckets
+        self.count = 0
+        self.total = 0.0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        self.histogram = [0] * buckets
+
+    def bucket(self, value: float) -> int:
+        """Histogram bucket of a value; out-of-range values go to the first / last bucket"""
+        index = int((value - self.low) / (self.high - self.low) * self.buckets)
+        return min(max(index, 0), self.buckets - 1)
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        self.histogram[self.bucket(value)] += 1
+
+    def update(self, values: Iterable[float]):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: 'StreamingStats'):
+        """Add the values seen by another instance with the same buckets"""
+        if (other.low, other.high, other.buckets) != (self.low, self.high, self.buckets):
+            raise ValueError('can only merge stats with identical histogram buckets')
+        if not other.count:
+            return
+
+        self.count += other.count
+        self.total += other.total
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+        self.histogram = [mine + theirs for mine, theirs in zip(self.histogram, other.histogram)]
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate quantile, interpolated inside its histogram bucket and clamped to min/max"""
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        width = (self.high - self.low) / self.buckets
+        seen = 0
+        for index, bucket_count in enumerate(self.histogram):
+            if bucket_count and seen + bucket_count >= rank:
+                value = self.low + (index + (rank - seen) / bucket_count) * width
+                return min(max(value, self.minimum), self.maximum)
+            seen += bucket_count
+        return self.maximum
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean': round(self.mean, 4) if self.count else None,
+            'min': self.minimum,
+            'max': self.maximum,
+            'quantiles': {f"p{int(q * 100)}": round(self.quantile(q), 4) if self.count else None
+                          for q in REPORTED_QUANTILES},
+            'histogram': {'low': self.low, 'high': self.high, 'counts': self.histogram},
+        }
+
+
+class GroupedStreamingStats:
+    """StreamingStats overall, per chain and per category"""
+
+    def __init__(self, low: float = 0.0, high: float = 1.0, buckets: int = 20):
+        self.low = low
+        self.high = high
+        self.buckets = buckets
+        self.overall = StreamingStats(low, high, buckets)
+        self.by_chain: Dict[str, StreamingStats] = {}
+        self.by_category: Dict[str, StreamingStats] = {}
+
+    def _group(self, groups: Dict[str, StreamingStats], key: str) -> StreamingStats:
+        stats = groups.get(key)
+        if stats is None:
+            stats = groups[key] = StreamingStats(self.low, self.high, self.buckets)
+        return stats
+
+    def add(self, value: float, chain: str = '', category: str = ''):
+        self.overall.add(value)
+        self._group(self.by_chain, chain or 'unknown').add(value)
+        self._group(self.by_category, category or 'unknown').add(value)
+
+    def merge(self, other: 'GroupedStreamingStats'):
+        """Combine the stats of a parallel worker"""
+        self.overall.merge(other.overall)
+        for groups, other_groups in ((self.by_chain, other.by_chain), (self.by_category, other.by_category)):
+            for key, stats in other_groups.items():
+                self._group(groups, key).merge(stats)
+
+    @property
+    def count(self) -> int:
+        return self.overall.count
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.overall.mean
+
+    def to_dict(self) -> Dict:
+        return {
+            **self.overall.to_dict(),
+            'by_chain': {chain: stats.to_dict() for chain, stats in sorted(self.by_chain.items())},
+            'by_category': {category: stats.to_dict() for category, stats in sorted(self.by_category.items())},
+        }
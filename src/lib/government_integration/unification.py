@@ -0,0 +1,220 @@
+"""
+Cross-retailer product unification.
+
+The website reads ``data/products.json``: one entry per product with its
+price at every network (chain), price statistics across networks and the
+savings of buying at the cheapest one. ``CrossRetailerUnifier`` builds that
+structure while enriched rows stream out of the filter instead of
+regrouping every row afterwards: rows are hash-grouped by normalized cut id
+(or normalized name when no cut matched) and each row updates its group's
+network prices and running min / max in constant time.
+
+A network's price is the lowest price seen for the product at any of its
+stores.
+
+Products also own a row of a ``PriceMatrix``, from which the snapshot's
+price statistics and savings are computed for all products in one batch.
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .price_matrix import PriceMatrix, price_statistics_entry, savings_entry
+
+UNIFIED_DATA_TYPE = 'unified_cross_network_comparison'
+UNIFIED_VERSION = 'V8.0_Government_Unified'
+
+# Original names kept per unified product (bounded: every store repeats the name)
+MAX_ORIGINAL_NAMES = 10
+
+# Size / unit tokens that do not distinguish products
+_UNIT_TOKENS = frozenset({
+    'ק"ג', 'קג', 'קילו', 'ק', 'ג', 'גר', 'גרם', 'ליטר', 'מל', 'יח', 'יחידות', 'kg', 'g', 'gr', 'unit',
+})
+_NON_WORD = re.compile(r'[^\w\s"]+|\d+')
+
+GroupKey = Tuple[str, str]
+
+
+def normalize_product_name(name: str) -> str:
+    """Lowercased name without punctuation, numbers and unit words"""
+    tokens = _NON_WORD.sub(' ', (name or '').lower()).split()
+    return ' '.join(token for token in tokens if token.strip('"') and token not in _UNIT_TOKENS)
+
+
+def unified_product_id(key: GroupKey) -> str:
+    """Stable id of a unified product across runs"""
+    digest = hashlib.blake2b('\x1f'.join(key).encode('utf-8'), digest_size=5).digest()
+    return f"unified_{int.from_bytes(digest, 'big')}"
+
+
+class UnifiedProduct:
+    """One product across networks with running price statistics"""
+
+    __slots__ = ('id', 'name', 'normalized_name', 'category', 'network_prices', 'min_price', 'max_price',
+                 'original_names', 'created_at', 'row')
+
+    def __init__(self, product_id: str, name: str, normalized_name: str, category: str, row: int = -1):
+        self.id = product_id
+        self.row = row
+        self.name = name
+        self.normalized_name = normalized_name
+        self.category = category
+        self.network_prices: Dict[str, float] = {}
+        self.min_price: Optional[float] = None
+        self.max_price: Optional[float] = None
+        self.original_names: List[str] = []
+        self.created_at = datetime.now().isoformat()
+
+    def update(self, network: str, price: float, name: str) -> bool:
+        """Record a store price at a network (O(1); O(networks) when the max drops); True if it changed"""
+        previous = self.network_prices.get(network)
+        if previous is not None and price >= previous:
+            self._add_name(name)
+            return False  # The network already has a cheaper store
+
+        self.network_prices[network] = price
+
+        if self.min_price is None or price < self.min_price:
+            self.min_price = price
+        if self.max_price is None or price > self.max_price:
+            self.max_price = price
+        elif previous is not None and previous == self.max_price:
+            # The most expensive network got cheaper
+            self.max_price = max(self.network_prices.values())
+
+        self._add_name(name)
+        return True
+
+    def _add_name(self, name: str):
+        if name and len(self.original_names) < MAX_ORIGINAL_NAMES and name not in self.original_names:
+            self.original_names.append(name)
+
+    @property
+    def network_count(self) -> int:
+        return len(self.network_prices)
+
+    def savings_analysis(self) -> Optional[Dict]:
+        """Savings of the cheapest network over the most expensive one (None for a single network)"""
+        if self.network_count < 2:
+            return None
+
+        # Ties go to the alphabetically first network, like PriceMatrix.statistics()
+        networks = sorted(self.network_prices)
+        cheapest = min(networks, key=self.network_prices.get)
+        most_expensive = max(networks, key=self.network_prices.get)
+        return savings_entry(self.min_price, self.max_price, cheapest, most_expensive)
+
+    def to_dict(self, statistics: Optional[Tuple[Dict, Optional[Dict]]] = None) -> Dict:
+        """Entry in the products.json schema (statistics: precomputed PriceStatistics.row())"""
+        if statistics is None:
+            # Summed in network-name order, like the matrix columns
+            mean = sum(self.network_prices[network] for network in sorted(self.network_prices)) / self.network_count
+            statistics = price_statistics_entry(self.min_price, self.max_price, mean), self.savings_analysis()
+        price_statistics, savings_analysis = statistics
+        return {
+            'id': self.id,
+            'name': self.name,
+            'normalized_name': self.normalized_name,
+            'category': self.category,
+            'network_prices': dict(self.network_prices),
+            'networks_available': list(self.network_prices),
+            'network_count': self.network_count,
+            'price_statistics': price_statistics,
+            'savings_analysis': savings_analysis,
+            'metadata': {
+                'original_names': list(self.original_names),
+                'created_at': self.created_at,
+                'data_quality': 'high' if self.network_count >= 2 else 'medium',
+            },
+        }
+
+
+class CrossRetailerUnifier:
+    """Hash-groups enriched rows into unified cross-network products"""
+
+    def __init__(self, use_numpy: Optional[bool] = None):
+        self.products: Dict[GroupKey, UnifiedProduct] = {}
+        self.prices = PriceMatrix(use_numpy)
+        self.networks = set()
+        self.rows = 0
+        self.skipped_rows = 0
+
+    @staticmethod
+    def group_key(product: Mapping) -> GroupKey:
+        """('cut', normalized cut id) for matched cuts, else ('name', normalized name)"""
+        cut_id = product.get('normalized_cut_id')
+        if cut_id:
+            return 'cut', str(cut_id)
+        return 'name', normalize_product_name(product.get('name_hebrew', ''))
+
+    def add(self, product: Mapping):
+        """Fold one enriched row into its unified product"""
+        price = product.get('price')
+        network = product.get('retailer', '')
+        key = self.group_key(product)
+        if not isinstance(price, (int, float)) or price <= 0 or not network or not key[1]:
+            self.skipped_rows += 1
+            return
+
+        unified = self.products.get(key)
+        if unified is None:
+            unified = self.products[key] = self._new_product(key, product)
+            unified.row = self.prices.add_row()
+        if unified.update(network, float(price), product.get('name_hebrew', '')):
+            self.prices.set(unified.row, network, float(price))
+        self.networks.add(network)
+        self.rows += 1
+
+    def add_batch(self, products: Iterable[Mapping]):
+        for product in products:
+            self.add(product)
+
+    @staticmethod
+    def _new_product(key: GroupKey, product: Mapping) -> UnifiedProduct:
+        name = product.get('name_hebrew', '')
+        match = product.get('basarometer_match') or {}
+        normalized_name = normalize_product_name(match.get('hebrew_name') or name) if key[0] == 'cut' else key[1]
+
+        category = product.get('category_mapping')
+        if not category or category == 'unknown':
+            category = product.get('category') or 'אחר'
+        return UnifiedProduct(unified_product_id(key), name, normalized_name, category)
+
+    def snapshot(self) -> Dict:
+        """The whole unified catalog in the products.json schema"""
+        statistics = self.prices.statistics()
+        return {
+            'products': [unified.to_dict(statistics.row(unified.row)) for unified in self.products.values()],
+            'metadata': {
+                'total_products': len(self.products),
+                'creation_date': datetime.now().isoformat(),
+                'data_type': UNIFIED_DATA_TYPE,
+                'networks_covered': len(self.networks),
+                'version': UNIFIED_VERSION,
+            },
+        }
+
+    def write(self, path: str, snapshot: Optional[Dict] = None):
+        """Atomically write the unified snapshot (computed unless given)"""
+        path = Path(path)
+        temp_path = path.with_name(path.name + '.tmp')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot or self.snapshot(), f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            'unified_products': len(self.products),
+            'cross_network_products': sum(1 for unified in self.products.values() if unified.network_count >= 2),
+            'networks': len(self.networks),
+            'vectorized': self.prices.use_numpy,
+            'rows': self.rows,
+            'skipped_rows': self.skipped_rows,
+        }
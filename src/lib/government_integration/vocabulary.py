@@ -0,0 +1,242 @@
+"""
+Precomputed meat filtering vocabulary.
+
+Everything ``filter_meat_products`` needs that depends only on the
+knowledge base files (keyword sets and the compiled matcher) is built once
+into an immutable ``FilterVocabulary`` and reused for every batch. The
+matcher also carries the confidence and quality grade terms, so one scan
+yields a complete ``MatchProfile``.
+
+Rows whose government / chain category is clearly not meat are decided by
+an O(1) category lookup before any name analysis.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from .fuzzy_index import FuzzyIndex
+from .keyword_matcher import KeywordMatcher
+from .match_profile import GRADE_TERMS, MEAT_CUT_TERMS, MEAT_TYPE_TERMS, MatchProfile
+
+
+# STRICT meat-only keywords (no dairy, produce, etc.)
+CORE_MEAT_KEYWORDS_HEBREW = frozenset({
+    # Primary meat types
+    'בקר', 'עוף', 'כבש', 'טלה', 'עגל', 'תרנגול', 'דק', 'אווז', 'בר',
+
+    # Beef cuts - בקר
+    'אנטריקוט', 'פילה', 'סינטה', 'שייטל', 'פיקניה', 'ריב איי', 'דנוור',
+    'בריסקט', 'אסאדו', 'אונטריב', 'וייסבראטן', 'אוסבוקו', 'ואסיו', 'פלאנק',
+    'טי-בון', 'טומהוק', 'פורטרהאוס', 'וואגיו', 'אנגוס', 'קובה',
+
+    # Chicken parts - עוף
+    'חזה', 'שוקיים', 'ירכיים', 'כנפיים', 'שניצל', 'פרגיות', 'פילה',
+    'לבבות', 'כבד', 'קיבות', 'צוואר', 'רגלי', 'עור',
+
+    # Lamb/Mutton - כבש/טלה
+    'צלעות', 'כתף', 'צווארון', 'רגל', 'חזה',
+
+    # Veal - עגל
+    'קוטלט', 'מדליונים', 'כליות', 'שקדים',
+
+    # Ground/Processed - טחון/מעובד
+    'טחון', 'קציצות', 'נקניקיות', 'קבב', 'מרגז', 'חטיפי', 'המבורגר',
+    'פסטרמה', 'סלמי', 'צ\'וריצו', 'ברטווסט', 'מרגזיה',
+
+    # Organ meats - איברים
+    'לשון', 'לחי', 'מוח', 'זנב', 'לב', 'ריאות', 'כליות', 'כבד', 'קרביים',
+
+    # Quality indicators
+    'טרי', 'קפוא', 'מעושן', 'מתובל', 'במרינדה', 'אורגני', 'פרמיום', 'מהדרין', 'בשר'
+})
+
+# EXCLUSION keywords - products that are NOT meat
+EXCLUSION_KEYWORDS_HEBREW = frozenset({
+    # Dairy products
+    'חלב', 'גבינה', 'יוגורט', 'חמאה', 'שמנת', 'קוטג\'', 'צפתית', 'עמק', 'תנובה',
+    'לבן', 'חלבי', 'מעדן', 'פודינג', 'גלידה', 'חמצה',
+
+    # Produce
+    'תפוח', 'בננה', 'תפוז', 'עגבניה', 'מלפפון', 'חסה', 'גזר', 'בצל',
+    'תפוח אדמה', 'ירקות', 'פירות', 'קישוא', 'פלפל', 'חציל',
+
+    # Grains/Bakery
+    'לחם', 'פיתה', 'חלה', 'עוגה', 'עוגיה', 'ביסקוויט', 'קרקר', 'דגנים',
+    'אורז', 'פסטה', 'מקרוני', 'קוסקוס', 'בורגול', 'שיבולת שועל',
+
+    # Beverages
+    'מיץ', 'משקה', 'קולה', 'מים', 'בירה', 'יין', 'שמפניה', 'וודקה',
+    'קפה', 'תה', 'חליב', 'אנרגיה',
+
+    # Pantry/Condiments
+    'שמן', 'חומץ', 'קטשופ', 'מיונז', 'חרדל', 'ממרח', 'ריבה', 'דבש',
+    'סוכר', 'מלח', 'פלפל', 'תבלין', 'רוטב', 'חרוסת',
+
+    # Fish (separate category from meat)
+    'דג', 'סלמון', 'טונה', 'סרדין', 'הרינג', 'מקרל', 'קרפיון', 'דניס',
+    'לברק', 'פילה דג', 'קווה', 'דג מעושן', 'דגים',
+
+    # Household items
+    'נייר', 'סבון', 'שמפו', 'ניקוי', 'חיתול', 'טואלט', 'מפיות'
+})
+
+
+# Category fast path: normalized category -> decision, checked before the name is scanned.
+# Only categories that never hold meat are listed, and their rows are never scanned; a
+# category that may hold canned meat, meat snacks or baby food with chicken goes through
+# the name analysis like any other. There is no meat counterpart: chains file cheese and
+# snacks under deli/meat counters, so a meat category alone must not include a product
+# and such rows need the full name analysis (and its enrichment) anyway.
+NON_MEAT_CATEGORIES = frozenset({
+    'חלב', 'מוצרי חלב', 'גבינות', 'חלב וביצים', 'ביצים', 'דגים', 'דגים קפואים',
+    'משקאות', 'שתייה', 'שתיה', 'יין', 'אלכוהול', 'יינות ומשקאות חריפים',
+    'ירקות', 'פירות', 'ירקות ופירות', 'פירות וירקות', 'לחם', 'מאפים', 'לחם ומאפים',
+    'ממתקים', 'תבלינים', 'דגנים', 'ניקיון', 'טואלטיקה', 'פארם', 'חד פעמי',
+    'צמחוני', 'טבעוני', 'צמחוני וטבעוני',
+})
+CATEGORY_DECISIONS: Dict[str, str] = {category: 'excluded' for category in NON_MEAT_CATEGORIES}
+
+
+def normalize_category(category: Optional[str]) -> str:
+    """Lowercased category with collapsed whitespace"""
+    return ' '.join((category or '').lower().split())
+
+
+# Similarity thresholds for fuzzy cut / mapping lookups
+CUT_SIMILARITY_THRESHOLD = 0.7
+MAPPING_SIMILARITY_THRESHOLD = 0.75
+
+
+SourceFingerprint = Tuple[Tuple[str, Optional[int], Optional[int]], ...]
+
+
+def source_fingerprint(paths: Iterable[Path]) -> SourceFingerprint:
+    """Cheap change marker for the knowledge base files: (path, mtime_ns, size) per file"""
+    fingerprint = []
+    for path in paths:
+        try:
+            stat_result = os.stat(path)
+            fingerprint.append((str(path), stat_result.st_mtime_ns, stat_result.st_size))
+        except OSError:
+            fingerprint.append((str(path), None, None))
+    return tuple(fingerprint)
+
+
+@dataclass(frozen=True)
+class FilterVocabulary:
+    """Immutable keyword sets and compiled matcher derived from the knowledge base"""
+
+    exclusion_keywords: FrozenSet[str]
+    meat_keywords: FrozenSet[str]
+    english_meat_keywords: FrozenSet[str]
+    mapping_keywords: FrozenSet[str]
+    matcher: KeywordMatcher = field(repr=False, compare=False)
+    meat_keyword_weights: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+    cut_ids: Tuple[str, ...] = ()
+    cut_index: Optional[FuzzyIndex] = field(default=None, repr=False, compare=False)
+    mapping_names: Tuple[str, ...] = ()
+    mapping_index: Optional[FuzzyIndex] = field(default=None, repr=False, compare=False)
+    source_fingerprint: SourceFingerprint = ()
+    content_hash: str = ''
+    build_seconds: float = 0.0
+
+    @classmethod
+    def build(cls, normalized_cuts: Dict, meat_names_mapping: Dict,
+              fingerprint: SourceFingerprint = ()) -> 'FilterVocabulary':
+        """Derive every keyword set from the loaded knowledge base and compile the matcher"""
+        started = time.perf_counter()
+
+        hebrew_meat_keywords = set()
+        english_meat_keywords = set()
+
+        # Extract from meat_names_mapping (high confidence meat products)
+        for hebrew_name, english_name in meat_names_mapping.items():
+            # Split compound names for better matching
+            hebrew_meat_keywords.update(hebrew_name.replace('_', ' ').split())
+            english_meat_keywords.update(english_name.replace('_', ' ').split())
+
+        # Extract from normalized_cuts (confirmed meat cuts)
+        for cut_data in normalized_cuts.values():
+            if isinstance(cut_data, dict):
+                if 'hebrew_name' in cut_data:
+                    hebrew_meat_keywords.add(cut_data['hebrew_name'])
+                if 'english_name' in cut_data:
+                    english_meat_keywords.add(cut_data['english_name'])
+
+        meat_keywords = CORE_MEAT_KEYWORDS_HEBREW.union(hebrew_meat_keywords)
+        mapping_keywords = frozenset(mapped_hebrew.lower() for mapped_hebrew in meat_names_mapping.keys())
+
+        # Confidence counts every meat keyword whose lowercase form occurs in the name
+        meat_keyword_weights: Dict[str, int] = {}
+        for keyword in meat_keywords:
+            meat_keyword_weights[keyword.lower()] = meat_keyword_weights.get(keyword.lower(), 0) + 1
+
+        matcher = KeywordMatcher(EXCLUSION_KEYWORDS_HEBREW | meat_keywords | mapping_keywords
+                                 | meat_keyword_weights.keys() | MEAT_TYPE_TERMS | MEAT_CUT_TERMS | GRADE_TERMS)
+
+        # Fuzzy lookup indexes, in dictionary order so ties resolve like a linear scan
+        cut_ids = tuple(cut_id for cut_id, cut_data in normalized_cuts.items()
+                        if isinstance(cut_data, dict) and 'hebrew_name' in cut_data)
+        cut_index = FuzzyIndex([normalized_cuts[cut_id]['hebrew_name'] for cut_id in cut_ids],
+                               CUT_SIMILARITY_THRESHOLD)
+        mapping_names = tuple(meat_names_mapping.keys())
+        mapping_index = FuzzyIndex(mapping_names, MAPPING_SIMILARITY_THRESHOLD)
+
+        # Content identity of the knowledge base, used to validate persisted caches
+        content_hash = hashlib.sha256(json.dumps(
+            [normalized_cuts, meat_names_mapping], sort_keys=True, ensure_ascii=False, default=str
+        ).encode('utf-8')).hexdigest()[:16]
+
+        return cls(
+            exclusion_keywords=EXCLUSION_KEYWORDS_HEBREW,
+            meat_keywords=meat_keywords,
+            english_meat_keywords=frozenset(english_meat_keywords),
+            mapping_keywords=mapping_keywords,
+            matcher=matcher,
+            meat_keyword_weights=meat_keyword_weights,
+            cut_ids=cut_ids,
+            cut_index=cut_index,
+            mapping_names=mapping_names,
+            mapping_index=mapping_index,
+            source_fingerprint=fingerprint,
+            content_hash=content_hash,
+            build_seconds=time.perf_counter() - started,
+        )
+
+    @staticmethod
+    def category_decision(category: Optional[str]) -> Optional[str]:
+        """'excluded' for clearly non-meat categories, None for every other category"""
+        return CATEGORY_DECISIONS.get(normalize_category(category))
+
+    def match_profile(self, hebrew_name: str, english_name: str = '', category: str = '') -> MatchProfile:
+        """Scan 'hebrew english' once and collect every hit the filter, confidence and grade need"""
+        hebrew_name = hebrew_name.lower()
+        hits = self.matcher.scan(f"{hebrew_name} {english_name.lower()}")
+        return MatchProfile.from_hits(hits, len(hebrew_name), category, self.exclusion_keywords,
+                                      self.meat_keywords, self.meat_keyword_weights, self.mapping_keywords,
+                                      self.category_decision(category))
+
+    @property
+    def size(self) -> int:
+        """Number of distinct keywords compiled into the matcher"""
+        return len(self.matcher)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Size and build time of the vocabulary for the stats report"""
+        return {
+            'keywords': self.size,
+            'exclusion_keywords': len(self.exclusion_keywords),
+            'meat_keywords': len(self.meat_keywords),
+            'mapping_keywords': len(self.mapping_keywords),
+            'category_decisions': len(CATEGORY_DECISIONS),
+            'matcher_states': self.matcher.state_count,
+            'fuzzy_cut_entries': len(self.cut_ids),
+            'fuzzy_mapping_entries': len(self.mapping_names),
+            'content_hash': self.content_hash,
+            'build_ms': round(self.build_seconds * 1000, 3),
+        }
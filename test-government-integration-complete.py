@@ -129,7 +129,9 @@ async def main():
                     print("   ✅ Integration module executed successfully")
                     
                     # Check for stats file
-                    stats_path = Path('/Users/yogi/Desktop/basarometer/v5/v3/logs/government-scraping-results.json')
+                    # The integration writes its stats next to the exported run metrics
+                    metrics_dir = Path(os.environ.get('BASAROMETER_METRICS_DIR', '/tmp/basarometer-gov-data/metrics'))
+                    stats_path = metrics_dir / 'government-scraping-results.json'
                     if stats_path.exists():
                         with open(stats_path, 'r', encoding='utf-8') as f:
                             stats = json.load(f)
@@ -141,10 +143,14 @@ async def main():
                             'excluded_non_meat': stats.get('excluded_non_meat', 0),
                             'filtering_efficiency': f"{((stats.get('excluded_non_meat', 0) / max(stats.get('total_processed', 1), 1)) * 100):.1f}%",
                             'meat_purity_rate': f"{((stats.get('meat_found', 0) / max(stats.get('meat_found', 0) + stats.get('excluded_non_meat', 0), 1)) * 100):.1f}%",
-                            'confidence_scores': stats.get('confidence_scores', [])
+                            'confidence': stats.get('confidence', {})
                         }
                         
+                        confidence = stats.get('confidence', {})
                         print(f"   ✅ Meat filtering: {stats.get('meat_found', 0)} meat products identified")
+                        if confidence.get('count'):
+                            print(f"   ✅ Confidence: mean {confidence['mean']:.2f}, p50 {confidence['quantiles']['p50']:.2f}, "
+                                  f"min {confidence['min']:.2f} over {confidence['count']} products")
                         print(f"   ✅ Exclusion efficiency: {((stats.get('excluded_non_meat', 0) / max(stats.get('total_processed', 1), 1)) * 100):.1f}%")
                     else:
                         print("   ⚠️  Stats file not found, but integration ran")
@@ -0,0 +1,61 @@
+"""Shared setup for the government integration tests (run with python -m pytest tests/government_integration)"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+LIB_PATH = Path(__file__).resolve().parents[2] / 'src' / 'lib'
+FIXTURES_PATH = Path(__file__).resolve().parent / 'fixtures'
+
+sys.path.insert(0, str(LIB_PATH))
+
+
+@pytest.fixture(scope='session')
+def integration_module():
+    """government-scraper-integration.py (hyphenated, so loaded by path)"""
+    spec = importlib.util.spec_from_file_location(
+        'government_scraper_integration', LIB_PATH / 'government-scraper-integration.py')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def fixtures_path() -> Path:
+    return FIXTURES_PATH
+
+
+@pytest.fixture
+def make_integration(integration_module, tmp_path, monkeypatch):
+    """Factory of BasarometerGovernmentIntegration instances with every path under tmp_path"""
+    data_folder = tmp_path / 'data'
+    data_folder.mkdir()
+    for variable, name in (('KNOWLEDGE_BASE_CACHE', '.knowledge-base.pickle'),
+                           ('BARCODE_CATALOG', 'barcode-catalog.sqlite'),
+                           ('UNIFIED_OUTPUT', 'government-unified-products.json'),
+                           ('PRICE_HISTORY', 'price-history'),
+                           ('METRICS_DIR', 'metrics')):
+        monkeypatch.setenv(f"BASAROMETER_{variable}", str(data_folder / name))
+    for variable in ('FULL_REFRESH', 'DOWNLOAD', 'FILTER_WORKERS', 'UNIFIED_SNAPSHOT', 'ENRICHMENT_CACHE',
+                     'BARCODE_OVERRIDES', 'DECISION_LOG', 'PROFILE'):
+        monkeypatch.delenv(f"BASAROMETER_{variable}", raising=False)
+
+    def make(normalized_cuts=None, meat_names_mapping=None):
+        instance = integration_module.BasarometerGovernmentIntegration(
+            normalized_cuts=normalized_cuts or {}, meat_names_mapping=meat_names_mapping or {})
+        instance.data_folder = str(data_folder)
+        instance.output_path = data_folder / 'government-meat-products.jsonl'
+        instance.delta_output_path = data_folder / 'government-meat-deltas.jsonl'
+        instance.price_state_path = data_folder / '.last-known-prices.sqlite'
+        return instance
+
+    return make
+
+
+@pytest.fixture
+def integration(make_integration):
+    """BasarometerGovernmentIntegration with an empty knowledge base and every path under tmp_path"""
+    return make_integration()
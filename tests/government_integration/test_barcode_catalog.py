@@ -0,0 +1,95 @@
+import json
+import sqlite3
+from contextlib import closing
+
+from government_integration import BarcodeCatalog, catalog_key
+
+CLASSIFICATION = {'decision': 'included', 'confidence': 0.9, 'has_mapping_match': True,
+                  'enrichment': {'normalized_cut_id': 'cut_1', 'quality_grade': 'premium'}}
+
+
+def barcode_keys(path):
+    with closing(sqlite3.connect(str(path))) as connection:
+        return {key for key, in connection.execute("SELECT key FROM barcodes")}
+
+
+def test_catalog_keys():
+    assert catalog_key('0007290000000017') == '7290000000017'
+    assert catalog_key('2900123000000', 'SHUFERSAL') == 'SHUFERSAL:2900123000000'  # weighed, in-store
+    assert catalog_key('1234', 'MEGA') == 'MEGA:1234'
+    assert catalog_key('  ') is None
+    assert BarcodeCatalog.key({'item_code': '77', 'chain_id': '7290027600007'}) == '7290027600007:77'
+
+
+def test_learned_codes_and_overrides_persist(tmp_path):
+    path = tmp_path / 'barcodes.sqlite'
+    catalog = BarcodeCatalog(str(path), fingerprint='v1')
+    assert catalog.get('7290000000017') is None
+    catalog.learn('7290000000017', CLASSIFICATION)
+    catalog.set_override('7290000000024', decision='excluded')
+    catalog.save()
+
+    reloaded = BarcodeCatalog(str(path), fingerprint='v1')
+    assert reloaded.get('7290000000017') == CLASSIFICATION
+    assert reloaded.get('7290000000024')['decision'] == 'excluded'
+    assert reloaded.metrics()['codes'] == 1 and reloaded.metrics()['overrides'] == 1
+
+    # Another knowledge base: learned codes are dropped, overrides stay
+    relearning = BarcodeCatalog(str(path), fingerprint='v2')
+    assert relearning.get('7290000000017') is None
+    assert relearning.get('7290000000024')['decision'] == 'excluded'
+    relearning.save()
+    assert barcode_keys(path) == set()
+
+
+def test_override_wins_over_learned_classification(tmp_path):
+    catalog = BarcodeCatalog()
+    catalog.learn('7290000000017', CLASSIFICATION)
+    catalog.set_override('7290000000017', quality_grade='wagyu')
+
+    result = catalog.get('7290000000017')
+    assert result['decision'] == 'included'
+    assert result['enrichment'] == {'normalized_cut_id': 'cut_1', 'quality_grade': 'wagyu'}
+    assert CLASSIFICATION['enrichment']['quality_grade'] == 'premium'
+
+    catalog.set_override('7290000000017', decision='excluded')
+    assert catalog.get('7290000000017')['decision'] == 'excluded'
+    catalog.remove_override('7290000000017')
+    assert catalog.get('7290000000017') == CLASSIFICATION
+
+
+def test_unchanged_overrides_do_not_rewrite_the_catalog(tmp_path):
+    path = tmp_path / 'barcodes.sqlite'
+    overrides = tmp_path / 'overrides.json'
+    overrides.write_text(json.dumps({'7290000000024': {'decision': 'excluded'}}), encoding='utf-8')
+
+    catalog = BarcodeCatalog(str(path), fingerprint='v1')
+    catalog.import_overrides(str(overrides))
+    catalog.learn('7290000000017', CLASSIFICATION)
+    catalog.save()
+
+    # Every run re-imports the same overrides file
+    catalog = BarcodeCatalog(str(path), fingerprint='v1')
+    assert catalog.import_overrides(str(overrides)) == 1
+    with closing(sqlite3.connect(str(path))) as connection, connection:
+        connection.execute("INSERT INTO barcodes (key, value) VALUES ('sentinel', '{}')")
+    catalog.save()
+    assert barcode_keys(path) == {'7290000000017', 'sentinel'}
+
+    # A changed override is saved without touching the learned codes
+    overrides.write_text(json.dumps({'7290000000024': {'decision': 'included'}}), encoding='utf-8')
+    catalog.import_overrides(str(overrides))
+    catalog.save()
+    assert barcode_keys(path) == {'7290000000017', 'sentinel'}
+    assert BarcodeCatalog(str(path), fingerprint='v1').get('7290000000024')['decision'] == 'included'
+
+
+def test_worker_codes_merge_into_the_parent():
+    worker = BarcodeCatalog()
+    worker.learn('7290000000017', CLASSIFICATION)
+    parent = BarcodeCatalog()
+
+    parent.merge(worker.drain_new_entries())
+
+    assert parent.get('7290000000017') == CLASSIFICATION
+    assert worker.drain_new_entries() == {}
@@ -0,0 +1,60 @@
+import json
+import random
+
+import pytest
+
+from government_integration import CatalogSnapshot, CrossRetailerUnifier, write_catalog_snapshot
+
+NETWORKS = ['SHUFERSAL', 'RAMI_LEVY', 'MEGA', 'VICTORY']
+PRODUCTS = [('אנטריקוט בקר', 'בקר'), ('קציצות בקר', 'בקר'), ('חזה עוף', 'עוף'), ('שניצל עוף', 'עוף'),
+            ('כתף טלה', 'טלה'), ('"פרגית" 1 ק\\"ג', 'עוף')]
+
+
+def unified_snapshot():
+    rng = random.Random(9)
+    unifier = CrossRetailerUnifier(use_numpy=False)
+    unifier.add_batch({'name_hebrew': name, 'category': category, 'retailer': rng.choice(NETWORKS),
+                       'price': round(rng.uniform(19, 130), 2)}
+                      for name, category in PRODUCTS for _ in range(rng.randint(1, 6)))
+    return unifier.snapshot()
+
+
+def test_snapshot_returns_the_products_json_entries(tmp_path):
+    snapshot = unified_snapshot()
+    products = json.loads(json.dumps(snapshot['products'], ensure_ascii=False))
+    path = tmp_path / 'unified.bin'
+
+    assert write_catalog_snapshot(path, snapshot) == path.stat().st_size
+    with CatalogSnapshot(path) as catalog:
+        assert len(catalog) == len(products)
+        assert list(catalog) == products
+        assert catalog.metadata == json.loads(json.dumps(snapshot['metadata'], ensure_ascii=False))
+        for product in products:
+            assert catalog.get(product['id']) == product
+        assert catalog.get('missing-id') is None
+        with pytest.raises(IndexError):
+            catalog.record(len(products))
+
+
+def test_by_category_keeps_catalog_order(tmp_path):
+    snapshot = unified_snapshot()
+    path = tmp_path / 'unified.bin'
+    write_catalog_snapshot(path, snapshot)
+
+    with CatalogSnapshot(path) as catalog:
+        assert sorted(catalog.categories) == sorted({product['category'] for product in snapshot['products']})
+        for category in catalog.categories:
+            assert [product['id'] for product in catalog.by_category(category)] == \
+                [product['id'] for product in snapshot['products'] if product['category'] == category]
+        assert list(catalog.by_category('ירקות')) == []
+
+
+def test_empty_catalog_and_foreign_files(tmp_path):
+    path = tmp_path / 'unified.bin'
+    write_catalog_snapshot(path, {'products': [], 'metadata': {}})
+    with CatalogSnapshot(path) as catalog:
+        assert list(catalog) == [] and catalog.categories == []
+
+    path.write_bytes(b'{"products": []}' + b'\0' * 128)
+    with pytest.raises(ValueError):
+        CatalogSnapshot(path)
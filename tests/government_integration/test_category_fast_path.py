@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from government_integration import CATEGORY_DECISIONS, FilterVocabulary
+
+MEAT_NAMES = ['אנטריקוט בקר טרי', 'חזה עוף טרי', 'קבב בקר']
+
+
+def row(name, category):
+    return {'name_hebrew': name, 'name_english': '', 'price': 49.9, 'retailer': 'SHUFERSAL', 'category': category}
+
+
+@pytest.mark.parametrize('category', ['שימורים', 'חטיפים', 'חטיפים וממתקים', 'יבשים', 'תינוקות', 'מזון לחיות'])
+def test_ambiguous_categories_go_through_the_name_matcher(make_integration, category):
+    assert FilterVocabulary.category_decision(category) is None
+    integration = make_integration()
+
+    uncategorized = asyncio.run(integration.filter_meat_products([row(name, '') for name in MEAT_NAMES]))
+    categorized = asyncio.run(integration.filter_meat_products([row(name, category) for name in MEAT_NAMES]))
+
+    assert uncategorized
+    assert [product['name_hebrew'] for product in categorized] == \
+        [product['name_hebrew'] for product in uncategorized]
+
+
+def test_non_meat_categories_skip_the_name_analysis(integration):
+    products = asyncio.run(integration.filter_meat_products(
+        [row('חזה עוף טרי', 'חלב'), row('חזה עוף טרי', ' דגים '), row('חזה עוף טרי', 'בשר')]))
+
+    assert [product['category'] for product in products] == ['בשר']
+    assert integration.stats['filter_paths'] == {'barcode_catalog': 0, 'category_non_meat': 2, 'text_matcher': 1}
+    assert integration.enrichment_cache.misses == 1
+    assert set(CATEGORY_DECISIONS.values()) == {'excluded'}
@@ -0,0 +1,158 @@
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from government_integration import ChainDownloadOrchestrator, TokenBucket
+from government_integration import download_orchestrator
+
+
+class FlakyDownloader:
+    """Fake scraper: fails the first `failures` attempts of every job, then returns one file"""
+
+    def __init__(self, failures: int = 0, delays=None):
+        self.failures = failures
+        self.delays = delays or {}
+        self.calls = {}
+        self.finished = set()
+
+    async def download(self, chain, file_type, folder):
+        attempts = self.calls.setdefault((chain, file_type), [])
+        attempts.append(time.perf_counter())
+        await asyncio.sleep(self.delays.get(chain, 0))
+        if len(attempts) <= self.failures:
+            raise ConnectionError(f"{chain} is down")
+        self.finished.add(chain)
+        return [folder / f"PriceFull-{chain}-{file_type}.xml"]
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture
+def no_jitter(monkeypatch):
+    """Backoff delays at their maximum (no random jitter)"""
+    monkeypatch.setattr(download_orchestrator.random, 'random', lambda: 1.0)
+
+
+def test_retries_with_exponential_backoff(tmp_path, no_jitter):
+    downloader = FlakyDownloader(failures=2)
+    orchestrator = ChainDownloadOrchestrator(downloader.download, str(tmp_path), rate_per_second=1000, burst=10,
+                                             max_retries=3, backoff_base=0.05)
+
+    results = run(orchestrator.run(['shufersal']))
+
+    result = results['shufersal']
+    assert result.files == [tmp_path / 'shufersal' / 'PriceFull-shufersal-PRICE_FILE.xml']
+    assert result.attempts == 3
+    assert result.failed_jobs == 0
+    assert len(result.errors) == 2 and 'attempt 1: ConnectionError' in result.errors[0]
+
+    attempts = downloader.calls[('shufersal', 'PRICE_FILE')]
+    gaps = [later - earlier for earlier, later in zip(attempts, attempts[1:])]
+    assert gaps[0] >= 0.05
+    assert gaps[1] >= 0.1
+
+
+def test_gives_up_after_max_retries(tmp_path, no_jitter):
+    downloader = FlakyDownloader(failures=10)
+    orchestrator = ChainDownloadOrchestrator(downloader.download, str(tmp_path), rate_per_second=1000, burst=10,
+                                             max_retries=2, backoff_base=0.01)
+
+    results = run(orchestrator.run(['mega']))
+
+    assert results['mega'].files == []
+    assert results['mega'].attempts == 3
+    assert results['mega'].failed_jobs == 1
+    assert len(results['mega'].errors) == 3
+
+
+def test_token_bucket_limits_the_start_rate():
+    async def take(bucket, count):
+        started = time.perf_counter()
+        for _ in range(count):
+            await bucket.acquire()
+        return time.perf_counter() - started
+
+    # One token up front, then one every 50ms
+    assert run(take(TokenBucket(rate=20, capacity=1), 5)) >= 0.2 - 0.01
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_downloads_share_the_rate_limit(tmp_path):
+    downloader = FlakyDownloader()
+    orchestrator = ChainDownloadOrchestrator(downloader.download, str(tmp_path), file_types=('PRICE_FILE', 'STORE_FILE'),
+                                             max_concurrent_chains=4, per_chain_concurrency=2,
+                                             rate_per_second=20, burst=1)
+
+    run(orchestrator.run(['shufersal', 'ramilevy', 'victory']))
+
+    starts = sorted(started for attempts in downloader.calls.values() for started in attempts)
+    assert len(starts) == 6
+    # Six jobs at 20 per second with no burst take at least 5 intervals
+    assert starts[-1] - starts[0] >= 5 / 20 - 0.01
+
+
+def test_files_stream_while_other_chains_download(tmp_path):
+    downloader = FlakyDownloader(delays={'shufersal': 0.3})
+    orchestrator = ChainDownloadOrchestrator(downloader.download, str(tmp_path), rate_per_second=1000, burst=10)
+
+    async def consume():
+        arrivals = []
+        async for chain, path in orchestrator.stream(['shufersal', 'victory']):
+            # The consumer (filtering) sees each file while slower chains are still downloading
+            arrivals.append((chain, path.name, set(downloader.finished)))
+            await asyncio.sleep(0.05)
+        return arrivals
+
+    arrivals = run(consume())
+
+    assert [chain for chain, *_ in arrivals] == ['victory', 'shufersal']
+    assert 'shufersal' not in arrivals[0][2]
+
+    timings = orchestrator.timings()
+    assert set(timings) == {'shufersal', 'victory'}
+    assert timings['shufersal']['seconds'] >= 0.3
+    assert timings['victory']['seconds'] < timings['shufersal']['seconds']
+    assert timings['victory'] == {'chain': 'victory', 'files': 1, 'attempts': 1, 'failed_jobs': 0,
+                                  'errors': [], 'seconds': timings['victory']['seconds']}
+
+
+def test_sync_downloader_runs_in_a_thread(tmp_path):
+    def downloader(chain, file_type, folder):
+        return [str(folder / f"{chain}.xml")]
+
+    orchestrator = ChainDownloadOrchestrator(downloader, str(tmp_path), rate_per_second=1000, burst=10)
+
+    results = run(orchestrator.run(['king_store']))
+
+    assert results['king_store'].files == [Path(tmp_path) / 'king_store' / 'king_store.xml']
+
+
+def test_timed_out_sync_download_is_not_run_twice_in_its_folder(tmp_path, no_jitter):
+    running = []
+    overlaps = []
+    calls = []
+
+    def downloader(chain, file_type, folder):
+        calls.append(chain)
+        overlaps.append(len(running))
+        running.append(chain)
+        try:
+            time.sleep(0.3 if len(calls) == 1 else 0)  # the first attempt hangs past the timeout
+            return [str(folder / f"{chain}.xml")]
+        finally:
+            running.remove(chain)
+
+    orchestrator = ChainDownloadOrchestrator(downloader, str(tmp_path), rate_per_second=1000, burst=10,
+                                             max_retries=5, backoff_base=0.01, attempt_timeout=0.1)
+
+    results = run(orchestrator.run(['shufersal']))
+
+    assert overlaps == [0] * len(calls)
+    assert len(calls) == 2  # retries waited for the hung scraper instead of starting another one
+    assert results['shufersal'].files == [Path(tmp_path) / 'shufersal' / 'shufersal.xml']
+    assert 'TimeoutError' in results['shufersal'].errors[0]
@@ -0,0 +1,69 @@
+import sqlite3
+from contextlib import closing
+
+from government_integration import EnrichmentCache
+
+
+def stored_rows(path):
+    with closing(sqlite3.connect(str(path))) as connection:
+        return connection.execute("SELECT key, position FROM enrichment ORDER BY position").fetchall()
+
+
+def test_save_writes_only_changes_and_keeps_lru_order(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    cache = EnrichmentCache(max_entries=3, path=str(path), fingerprint='v1')
+    for name in ('a', 'b', 'c'):
+        cache.put((name,), {'decision': name})
+    cache.save()
+    assert [key for key, _ in stored_rows(path)] == ['["a"]', '["b"]', '["c"]']
+
+    cache.get(('a',))           # a becomes the newest
+    cache.put(('d',), {'decision': 'd'})  # evicts b
+    cache.save()
+    assert [key for key, _ in stored_rows(path)] == ['["c"]', '["a"]', '["d"]']
+
+    reloaded = EnrichmentCache(max_entries=3, path=str(path), fingerprint='v1')
+    assert list(reloaded._entries) == [('c',), ('a',), ('d',)]
+    assert reloaded.get(('d',)) == {'decision': 'd'}
+
+
+def test_save_without_changes_does_not_touch_the_database(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    cache = EnrichmentCache(path=str(path), fingerprint='v1')
+    cache.put(('a',), {'decision': 'a'})
+    cache.save()
+    mtime = path.stat().st_mtime_ns
+
+    cache.save()
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_other_fingerprint_and_reset_replace_the_table(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    cache = EnrichmentCache(path=str(path), fingerprint='v1')
+    cache.put(('a',), {'decision': 'a'})
+    cache.save()
+
+    cold = EnrichmentCache(path=str(path), fingerprint='v2')
+    assert len(cold) == 0
+    cold.put(('b',), {'decision': 'b'})
+    cold.save()
+    assert [key for key, _ in stored_rows(path)] == ['["b"]']
+
+    cold.reset('v3')
+    cold.save()
+    assert stored_rows(path) == []
+    assert len(EnrichmentCache(path=str(path), fingerprint='v3')) == 0
+
+
+def test_capacity_shrink_deletes_rows_beyond_it(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    cache = EnrichmentCache(path=str(path), fingerprint='v1')
+    for name in 'abcde':
+        cache.put((name,), {'decision': name})
+    cache.save()
+
+    smaller = EnrichmentCache(max_entries=2, path=str(path), fingerprint='v1')
+    assert list(smaller._entries) == [('d',), ('e',)]
+    smaller.save()
+    assert [key for key, _ in stored_rows(path)] == ['["d"]', '["e"]']
@@ -0,0 +1,46 @@
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from government_integration import FuzzyIndex
+
+SYLLABLES = ['אנ', 'טרי', 'קוט', 'בקר', 'עוף', 'חזה', 'פי', 'לה', 'שו', 'קיים', 'צל', 'עות', 'טלה', ' ', '_']
+
+
+def linear_best_match(names, query, threshold):
+    """The original full-scan loop of find_best_cut_match"""
+    best_match = None
+    best_score = 0
+    for index, name in enumerate(names):
+        similarity = SequenceMatcher(None, query, name).ratio()
+        if similarity > best_score and similarity > threshold:
+            best_score = similarity
+            best_match = (index, similarity)
+    return best_match
+
+
+def random_name(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 6)))
+
+
+@pytest.mark.parametrize('threshold', [0.7, 0.75])
+def test_best_match_equals_the_linear_scan(threshold):
+    rng = random.Random(3)
+    names = [random_name(rng) for _ in range(150)]
+    names += names[:20]  # duplicates: ties must resolve to the first entry
+    index = FuzzyIndex(names, threshold)
+
+    queries = [random_name(rng) for _ in range(150)] + [rng.choice(names) for _ in range(50)]
+    results = [index.best_match(query) for query in queries]
+
+    assert results == [linear_best_match(names, query, threshold) for query in queries]
+    assert any(result is not None for result in results)
+
+
+def test_empty_names_and_queries():
+    index = FuzzyIndex(['', 'חזה עוף', ''], 0.7)
+
+    assert index.best_match('') == linear_best_match(index.names, '', 0.7) == (0, 1.0)
+    assert index.best_match('חזה עוף') == (1, 1.0)
+    assert FuzzyIndex([], 0.7).best_match('חזה') is None
@@ -0,0 +1,36 @@
+import asyncio
+import shutil
+
+from government_integration import PriceHistoryStore, read_snapshot
+
+
+def test_up_to_date_run_still_appends_price_history(integration, fixtures_path):
+    shutil.copytree(fixtures_path / 'price_files', integration.data_folder, dirs_exist_ok=True)
+
+    first = asyncio.run(integration.execute_government_scraping())
+    assert first
+    appended = integration.stats['price_history']['appended']
+    assert appended > 0
+
+    # A new day: nothing changed in the price files, but the history still needs its point
+    shutil.rmtree(integration.price_history_path)
+    second = asyncio.run(integration.execute_government_scraping())
+
+    assert second == []
+    assert integration.stats['ingest']['unchanged_files'] == 3
+    assert integration.stats['price_history']['appended'] == appended
+    assert len(PriceHistoryStore(integration.price_history_path)) == appended
+    assert len(list(read_snapshot(integration.output_path))) == len(first)
+
+
+def test_up_to_date_run_keeps_the_query_index_and_unified_catalog(integration, fixtures_path):
+    shutil.copytree(fixtures_path / 'price_files', integration.data_folder, dirs_exist_ok=True)
+    asyncio.run(integration.execute_government_scraping())
+    indexed = sorted(product['name_hebrew'] for product in integration.product_index)
+    unified = set(integration.unifier.products)
+    assert indexed
+
+    assert asyncio.run(integration.execute_government_scraping()) == []
+
+    assert sorted(product['name_hebrew'] for product in integration.product_index) == indexed
+    assert set(integration.unifier.products) == unified
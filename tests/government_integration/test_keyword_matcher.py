@@ -0,0 +1,79 @@
+import random
+
+from government_integration import MEAT_CONFIDENCE_THRESHOLD, FilterVocabulary, KeywordMatcher
+
+NORMALIZED_CUTS = {
+    'beef_entrecote': {'hebrew_name': 'אנטריקוט', 'english_name': 'Entrecote'},
+    'chicken_breast': {'hebrew_name': 'חזה עוף', 'english_name': 'Chicken Breast'},
+    'lamb_chops': {'hebrew_name': 'צלעות טלה', 'english_name': 'Lamb Chops'},
+}
+MEAT_NAMES_MAPPING = {
+    'אנטריקוט_בקר': 'beef_entrecote',
+    'שוקיים_עוף': 'chicken_drumsticks',
+    'קבב_כבש': 'lamb_kebab',
+}
+WORDS = ['אנטריקוט', 'בקר', 'חזה', 'עוף', 'שוקיים', 'טרי', 'קפוא', 'גבינה', 'חלב', 'קבב', 'כבש', 'טלה',
+         'צלעות', 'אנגוס', 'וואגיו', 'עגל', 'פילה', 'דג', 'סלמון', 'ממרח', 'אנטריקוט_בקר', 'שוקיים_עוף',
+         'מארז', 'משפחתי', 'ק"ג', '500', 'גרם']
+CATEGORIES = ['', 'בשר', 'עוף ובשר', 'בשר מעובד', 'מעדנייה', 'קפואים']
+
+
+def legacy_decision(vocabulary, hebrew, english, category):
+    """The per-row keyword scan the vocabulary replaced: (decision, confidence)"""
+    full_name = f"{hebrew.lower()} {english.lower()}"
+    if any(keyword in full_name for keyword in vocabulary.exclusion_keywords):
+        return 'excluded', None
+
+    contains_meat_keyword = any(keyword in full_name for keyword in vocabulary.meat_keywords)
+    has_mapping_match = any(mapped.lower() in hebrew.lower() for mapped in MEAT_NAMES_MAPPING)
+    if not (contains_meat_keyword or has_mapping_match):
+        return 'no_meat_keywords', None
+
+    confidence = min(sum(keyword.lower() in full_name for keyword in vocabulary.meat_keywords) * 0.25, 0.5)
+    if any(term in full_name for term in ['בקר', 'עוף', 'כבש', 'עגל', 'טלה']):
+        confidence += 0.25
+    if any(term in full_name for term in ['חזה', 'שוקיים', 'כנפיים', 'אנטריקוט', 'פילה', 'צלעות']):
+        confidence += 0.25
+    if any(mapped.lower() in full_name for mapped in MEAT_NAMES_MAPPING):
+        confidence += 0.3
+    if any(term in category.lower() for term in ['בשר', 'עוף', 'כבש', 'בקר', 'בשר מעובד']):
+        confidence += 0.2
+    confidence = min(confidence, 1.0)
+
+    return ('included' if confidence >= MEAT_CONFIDENCE_THRESHOLD else 'low_confidence'), confidence
+
+
+def test_scan_reports_every_contained_keyword():
+    rng = random.Random(1)
+    alphabet = 'אבגדהו'
+    for _ in range(200):
+        keywords = {''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(12)}
+        matcher = KeywordMatcher(keywords)
+        text = ''.join(rng.choice(alphabet + ' ') for _ in range(rng.randint(0, 30)))
+
+        hits = matcher.scan(text)
+
+        assert set(hits) == {keyword for keyword in keywords if keyword in text}
+        assert all(hits[keyword] == text.index(keyword) + len(keyword) for keyword in hits)
+        assert matcher.contains_any(text) == bool(hits)
+
+
+def test_match_profile_agrees_with_the_legacy_scan():
+    rng = random.Random(7)
+    vocabulary = FilterVocabulary.build(NORMALIZED_CUTS, MEAT_NAMES_MAPPING)
+    decisions = set()
+
+    for _ in range(2000):
+        hebrew = ' '.join(rng.sample(WORDS, rng.randint(1, 5)))
+        english = rng.choice(['', 'Beef', 'Fresh Chicken', 'Angus Entrecote'])
+        category = rng.choice(CATEGORIES)
+
+        profile = vocabulary.match_profile(hebrew, english, category)
+        decision, confidence = legacy_decision(vocabulary, hebrew, english, category)
+
+        assert profile.decision == decision, (hebrew, english, category)
+        if confidence is not None:
+            assert profile.confidence == confidence, (hebrew, english, category)
+        decisions.add(decision)
+
+    assert decisions == {'excluded', 'no_meat_keywords', 'low_confidence', 'included'}
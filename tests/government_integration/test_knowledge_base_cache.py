@@ -0,0 +1,79 @@
+import os
+import pickle
+
+import pytest
+
+from government_integration import KnowledgeBaseCache
+
+
+LOADED_EXPLOITS = []
+
+
+def run_exploit():
+    LOADED_EXPLOITS.append(True)
+
+
+class Exploit:
+    """Pickle that runs code when loaded"""
+
+    def __reduce__(self):
+        return (run_exploit, ())
+
+
+def plant(path, payload, mode=0o600):
+    path.write_bytes(pickle.dumps(payload))
+    path.chmod(mode)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    folder = tmp_path / 'data'
+    folder.mkdir(mode=0o700)
+    return folder / '.knowledge-base.pickle'
+
+
+def test_round_trip_writes_a_private_file(cache_path):
+    cache = KnowledgeBaseCache(str(cache_path))
+    cache.save('key', {'cuts': 1})
+
+    assert cache_path.stat().st_mode & 0o777 == 0o600
+    assert cache.load('key') == {'cuts': 1}
+    assert cache.load('other key') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_rejects_a_file_others_could_have_written(cache_path):
+    plant(cache_path, Exploit(), mode=0o644)
+
+    assert KnowledgeBaseCache(str(cache_path)).load('key') is None
+    assert not LOADED_EXPLOITS
+
+
+def test_rejects_a_folder_writable_by_others(cache_path):
+    plant(cache_path, Exploit())
+    cache_path.parent.chmod(0o777)
+
+    cache = KnowledgeBaseCache(str(cache_path))
+    assert cache.load('key') is None
+    assert not LOADED_EXPLOITS
+
+    # Nor is it written there
+    cache_path.unlink()
+    cache.save('key', {'cuts': 1})
+    assert not cache_path.exists()
+
+
+def test_rejects_a_symlink(cache_path, tmp_path):
+    target = tmp_path / 'elsewhere.pickle'
+    KnowledgeBaseCache(str(target)).save('key', {'cuts': 1})
+    cache_path.symlink_to(target)
+
+    assert KnowledgeBaseCache(str(cache_path)).load('key') is None
+
+
+@pytest.mark.skipif(os.geteuid() != 0, reason='changing file ownership needs root')
+def test_rejects_a_file_owned_by_another_user(cache_path):
+    KnowledgeBaseCache(str(cache_path)).save('key', {'cuts': 1})
+    os.chown(cache_path, 12345, 12345)
+
+    assert KnowledgeBaseCache(str(cache_path)).load('key') is None
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import shutil
+
+from government_integration import STAGES, MetricsExporter, RunMetrics, prometheus_text
+from government_integration import metrics as metrics_module
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_nested_stages_are_charged_exclusively(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(metrics_module.time, 'perf_counter', clock)
+    metrics = RunMetrics()
+
+    def parsed_rows():
+        for row in range(3):
+            clock.now += 1.0  # parsing a row
+            yield row
+
+    with metrics.stage('write'):
+        for _ in metrics.timed('filter', metrics.timed('parse', parsed_rows())):
+            clock.now += 0.5  # writing a row
+    metrics.add_stage_time('download', 4.0, calls=2)
+
+    assert metrics.stage_seconds == {'download': 4.0, 'parse': 3.0, 'filter': 0.0, 'enrich': 0.0, 'write': 1.5}
+    assert metrics.stage_calls['parse'] == 4  # three rows and the final StopIteration
+
+    worker = RunMetrics()
+    worker.count('SHUFERSAL', 'rows', 10)
+    metrics.count('SHUFERSAL', 'rows', 5)
+    metrics.count('', 'errors')
+    metrics.merge(worker)
+
+    summary = metrics.summary(rows=3)
+    assert summary['chains'] == {'SHUFERSAL': {'rows': 15}, 'unknown': {'errors': 1}}
+    assert summary['stages']['parse']['rows_per_second'] == 1.0
+    assert summary['stages']['download']['rows_per_second'] is None
+
+
+def test_prometheus_text_and_run_log(tmp_path):
+    metrics = RunMetrics()
+    metrics.count('SHUFERSAL', 'rows', 120)
+    metrics.count('RAMI_LEVY', 'files', 2)
+    summary = metrics.summary(rows=120, cache_hit_rate={'enrichment': 0.75}, errors=1)
+
+    text = prometheus_text(summary)
+    assert '# TYPE basarometer_ingest_rows gauge\nbasarometer_ingest_rows 120\n' in text
+    assert 'basarometer_ingest_chain_rows{chain="SHUFERSAL"} 120' in text
+    assert 'basarometer_ingest_chain_rows{chain="RAMI_LEVY"} 0' in text
+    assert 'basarometer_ingest_cache_hit_ratio{cache="enrichment"} 0.75' in text
+    assert 'basarometer_ingest_errors 1' in text
+    assert all(f'basarometer_ingest_stage_seconds{{stage="{stage}"}}' in text for stage in STAGES)
+
+    exporter = MetricsExporter(tmp_path / 'metrics')
+    assert exporter.export(summary) == tmp_path / 'metrics'
+    assert exporter.export(summary) == tmp_path / 'metrics'
+
+    assert exporter.prometheus_path.read_text(encoding='utf-8').startswith('# HELP basarometer_ingest_')
+    runs = exporter.run_log_path.read_text(encoding='utf-8').splitlines()
+    assert len(runs) == 2
+    assert json.loads(runs[-1])['rows'] == 120
+    assert not list((tmp_path / 'metrics').glob('*.tmp'))
+
+
+def test_run_exports_its_metrics(integration, fixtures_path):
+    shutil.copytree(fixtures_path / 'price_files', integration.data_folder, dirs_exist_ok=True)
+    products = asyncio.run(integration.execute_government_scraping())
+    assert products
+
+    exporter = MetricsExporter(integration.metrics_dir)
+    summary = json.loads(exporter.run_log_path.read_text(encoding='utf-8').splitlines()[-1])
+
+    assert summary['rows'] > 0
+    assert set(summary['stages']) == set(STAGES)
+    assert summary['chains']
+    assert 'basarometer_ingest_rows_per_second ' in exporter.prometheus_path.read_text(encoding='utf-8')
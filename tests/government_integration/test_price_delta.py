@@ -0,0 +1,53 @@
+from government_integration import PriceDeltaTracker
+
+
+def product(code, price, store='001', name='אנטריקוט בקר', source_file='PriceFull-001.xml', retailer='SHUFERSAL'):
+    return {'item_code': code, 'store_id': store, 'retailer': retailer, 'price': price, 'name_hebrew': name,
+            'source_file': source_file, 'processed_at': '2026-10-17T06:00:00'}
+
+
+def run(path, products, replaced_files=None):
+    tracker = PriceDeltaTracker(path)
+    tracker.observe_batch(products)
+    deltas = tracker.finish(replaced_files)
+    tracker.save()
+    return tracker, deltas
+
+
+def test_feed_holds_inserts_updates_and_deletions_only(tmp_path):
+    path = tmp_path / 'last-known.sqlite'
+    _, first = run(path, [product('001', 49.9), product('002', 29.9), product('003', 19.9)])
+    assert [(delta['op'], delta['product_id']) for delta in first] == [('insert', '1'), ('insert', '2'), ('insert', '3')]
+    assert first[0]['product']['price'] == 49.9
+
+    tracker, second = run(path, [
+        dict(product('001', 49.9), processed_at='2026-10-18T06:00:00'),  # volatile field only
+        product('002', 24.9),  # price drop
+        product('003', 19.9, name='אנטריקוט בקר טרי'),  # attributes changed
+        product('004', 9.9),
+    ])
+
+    assert [(delta['op'], delta['product_id']) for delta in second] == [('update', '2'), ('update', '3'), ('insert', '4')]
+    assert second[0] == {'op': 'update', 'retailer': 'SHUFERSAL', 'store_id': '001', 'product_id': '2',
+                         'price': 24.9, 'previous_price': 29.9}
+    assert second[1]['product']['name_hebrew'] == 'אנטריקוט בקר טרי'
+    assert tracker.metrics() == {'inserts': 1, 'updates': 2, 'deletions': 0, 'unchanged': 1, 'tracked_products': 4}
+
+    _, third = run(path, [product('001', 49.9), product('002', 24.9), product('003', 19.9, name='אנטריקוט בקר טרי')])
+    assert third == [{'op': 'delete', 'retailer': 'SHUFERSAL', 'store_id': '001', 'product_id': '4',
+                      'previous_price': 9.9}]
+
+    _, fourth = run(path, [product('001', 49.9), product('002', 24.9), product('003', 19.9, name='אנטריקוט בקר טרי')])
+    assert fourth == []
+
+
+def test_only_products_of_replaced_files_are_deleted(tmp_path):
+    path = tmp_path / 'last-known.sqlite'
+    run(path, [product('001', 49.9, store='001', source_file='PriceFull-001.xml'),
+               product('001', 51.9, store='002', source_file='PriceFull-002.xml')])
+
+    # Only store 001's file was re-read; store 002's product was not seen but must survive
+    _, deltas = run(path, [], replaced_files={('SHUFERSAL', 'PriceFull-001.xml')})
+
+    assert [(delta['op'], delta['store_id']) for delta in deltas] == [('delete', '001')]
+    assert set(PriceDeltaTracker(path).state) == {('SHUFERSAL', '002', '1')}
@@ -0,0 +1,82 @@
+from government_integration import (
+    find_price_files,
+    iter_price_file_products,
+    iter_price_files_products,
+    parse_price_file_name,
+)
+
+SHUFERSAL = 'price_files/Shufersal/PriceFull7290027600007-001-202410150300.gz'
+RAMI_LEVY = 'price_files/RamiLevy/PriceFull7290058140886-039-202410150300.zip'
+VICTORY = 'price_files/Victory/PriceFull7290696200003-001-202410150300.xml'
+
+
+def test_gzip_file_fields_and_header(fixtures_path):
+    stats = {}
+    products = list(iter_price_file_products(fixtures_path / SHUFERSAL, stats=stats))
+
+    assert [product['name_hebrew'] for product in products] == ['אנטריקוט בקר טרי', 'כנפיים עוף']
+    assert products[0] == {
+        'name_hebrew': 'אנטריקוט בקר טרי',
+        'name_english': '',
+        'price': 129.9,
+        'retailer': 'SHUFERSAL',
+        'category': '',
+        'unit_of_measure_price': 129.9,
+        'chain_id': '7290027600007',
+        'sub_chain_id': '001',
+        'store_id': '001',
+        'file_type': 'PriceFull',
+        'source_file': 'PriceFull7290027600007-001-202410150300.gz',
+        'item_code': '7290000000017',
+        'item_type': '1',
+        'manufacturer': 'טיב טעם',
+        'unit_of_measure': 'ק"ג',
+        'unit_qty': 'קילו',
+        'quantity': '1.00',
+        'is_weighted': '1',
+        'price_updated_at': '2024-10-15 03:00',
+    }
+    # Falls back to the manufacturer description when there is no item name
+    assert products[1]['price'] == 24.5
+    assert products[1]['unit_of_measure_price'] is None
+
+
+def test_items_without_name_or_price_are_skipped(fixtures_path):
+    stats = {}
+    list(iter_price_file_products(fixtures_path / SHUFERSAL, stats=stats))
+
+    assert stats == {'files': 1, 'items': 2, 'skipped_items': 2}
+
+
+def test_zip_file_and_retailer_from_folder(fixtures_path):
+    products = list(iter_price_file_products(fixtures_path / RAMI_LEVY))
+
+    assert len(products) == 1
+    assert products[0]['retailer'] == 'RAMI_LEVY'
+    assert products[0]['name_hebrew'] == 'פרגית עוף טרייה'
+    assert (products[0]['chain_id'], products[0]['sub_chain_id'], products[0]['store_id']) == \
+        ('7290058140886', '001', '039')
+
+
+def test_flat_layout_with_namespace(fixtures_path):
+    products = list(iter_price_file_products(fixtures_path / VICTORY, retailer='VICTORY'))
+
+    assert [(product['name_hebrew'], product['price'], product['category']) for product in products] == [
+        ('קציצות בקר', 54.9, 'בשר'),
+        ('שניצל עוף', 44.9, ''),
+    ]
+    assert {(product['chain_id'], product['sub_chain_id'], product['store_id']) for product in products} == \
+        {('7290696200003', '1', '1')}
+    assert {product['retailer'] for product in products} == {'VICTORY'}
+
+
+def test_find_and_chain_price_files(fixtures_path):
+    paths = find_price_files(str(fixtures_path / 'price_files'))
+    assert [path.parent.name for path in paths] == ['RamiLevy', 'Shufersal', 'Victory']
+    assert parse_price_file_name(paths[0]) == {
+        'file_type': 'PriceFull', 'chain_id': '7290058140886', 'store_id': '039', 'timestamp': '202410150300'}
+
+    stats = {}
+    products = list(iter_price_files_products(paths, stats=stats))
+    assert len(products) == 5
+    assert stats == {'files': 3, 'items': 5, 'skipped_items': 2}
@@ -0,0 +1,88 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from government_integration import PriceHistoryStore, history_key
+
+START = date(2026, 1, 1)  # a Thursday
+
+
+def product(code, price, retailer='SHUFERSAL', store='001'):
+    return {'item_code': code, 'store_id': store, 'retailer': retailer, 'price': price, 'name_hebrew': 'חזה עוף'}
+
+
+def record_days(path, days):
+    """Flush one day of prices per {day: [products]} entry, reopening the store every 50 days"""
+    store = PriceHistoryStore(path)
+    for number, (day, products) in enumerate(sorted(days.items())):
+        if number and number % 50 == 0:
+            store.close()
+            store = PriceHistoryStore(path)
+        store.observe_batch(products)
+        store.flush(day)
+    store.close()
+    return PriceHistoryStore(path)
+
+
+def test_range_returns_the_daily_lowest_price_across_chunks(tmp_path):
+    rng = random.Random(21)
+    expected = {'001': {}, '002': {}}
+    days = {}
+    for number in range(200):  # several chunks per series, interleaved in the files
+        day = START + timedelta(days=number)
+        days[day] = []
+        for code in expected:
+            if rng.random() < 0.2:
+                continue  # not published that day
+            prices = [round(rng.uniform(20, 90), 2) for _ in range(3)]
+            days[day] += [product(code, price, store=f"00{store}") for store, price in enumerate(prices)]
+            expected[code][day] = min(prices)
+
+    store = record_days(tmp_path / 'history', days)
+
+    assert len(store) == 2
+    for code, points in expected.items():
+        retailer, product_id = history_key(product(code, 1))
+        assert store.range(retailer, product_id) == sorted(points.items())
+
+        start, end = START + timedelta(days=60), START + timedelta(days=130)
+        assert store.range(retailer, product_id, start, end) == \
+            sorted((day, price) for day, price in points.items() if start <= day <= end)
+    assert store.range('SHUFERSAL', 'missing') == []
+
+
+def test_same_day_and_out_of_order_flushes(tmp_path):
+    store = PriceHistoryStore(tmp_path / 'history')
+    store.observe(product('001', 30.0))
+    store.flush(START + timedelta(days=1))
+    store.observe(product('001', 25.5))
+    store.flush(START + timedelta(days=1))  # a later run on the same day, lower price
+    store.observe(product('001', 40.0))
+    store.flush(START + timedelta(days=1))
+    store.observe(product('001', 10.0))
+    store.flush(START)  # older than the last point
+
+    assert store.range('SHUFERSAL', '1') == [(START + timedelta(days=1), 25.5)]
+    assert store.metrics()['updated'] == 1
+    assert store.metrics()['unchanged'] == 1
+    assert store.metrics()['out_of_order'] == 1
+
+
+def test_weekly_downsample(tmp_path):
+    prices = [50.0, 48.0, 52.0, 47.0, 49.0, 51.0, 46.0, 45.0, 44.0, 60.0]
+    days = {START + timedelta(days=number): [product('001', price)] for number, price in enumerate(prices)}
+    store = record_days(tmp_path / 'history', days)
+
+    weeks = store.downsample('SHUFERSAL', '1', period='week')
+
+    # Thu Jan 1 - Sat Jan 3 belong to the week starting Sun Dec 28
+    assert weeks == [
+        {'date': '2025-12-28', 'min_price': 48.0, 'max_price': 52.0, 'avg_price': 50.0, 'close_price': 52.0,
+         'points': 3},
+        {'date': '2026-01-04', 'min_price': 44.0, 'max_price': 60.0, 'avg_price': 48.86, 'close_price': 60.0,
+         'points': 7},
+    ]
+    assert len(store.downsample('SHUFERSAL', '1', period='day')) == len(prices)
+    with pytest.raises(ValueError):
+        store.downsample('SHUFERSAL', '1', period='month')
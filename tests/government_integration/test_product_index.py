@@ -0,0 +1,65 @@
+import random
+
+from government_integration import ProductIndex, product_key
+from government_integration.product_index import COMPACT_MIN_FREE_ROWS
+
+RETAILERS = ['SHUFERSAL', 'RAMI_LEVY', 'VICTORY']
+CATEGORIES = ['בקר', 'עוף']
+
+
+def product(code, price, retailer='SHUFERSAL', category='בקר'):
+    return {'item_code': str(code), 'store_id': '001', 'retailer': retailer, 'price': price,
+            'category_mapping': category, 'normalized_cut_id': f"cut_{code % 7}"}
+
+
+def expected(products, **filters):
+    matching = [p for p in products if all(p.get(field) == value for field, value in filters.items())]
+    return sorted((p['price'], p['item_code'], p['retailer']) for p in matching)
+
+
+def prices(results):
+    return [(p['price'], p['item_code'], p['retailer']) for p in results]
+
+
+def test_replaced_rows_are_compacted():
+    rng = random.Random(5)
+    index = ProductIndex()
+    latest = {}
+    for round_number in range(60):
+        batch = [product(code, round(rng.uniform(5, 200), 2), rng.choice(RETAILERS[:1]), rng.choice(CATEGORIES))
+                 for code in range(100)]
+        if round_number % 2:
+            index.add_batch(batch)
+        else:
+            for item in batch:
+                index.add(item)
+        latest.update((code, item) for code, item in enumerate(batch))
+
+    live = list(latest.values())
+    assert len(index) == 100
+    # 6000 rows were indexed, but the replaced ones do not accumulate
+    assert len(index.rows) <= 2 * max(COMPACT_MIN_FREE_ROWS, len(index)) + 100
+    assert index.free_rows == sum(row is None for row in index.rows)
+
+    assert prices(index.query()) == expected(live)
+    assert prices(index.query(category_mapping='עוף')) == expected(live, category_mapping='עוף')
+    assert prices(index.query(normalized_cut_id='cut_3', category_mapping='בקר')) == \
+        expected(live, normalized_cut_id='cut_3', category_mapping='בקר')
+    # Arrival order survives the renumbering
+    assert [p['item_code'] for p in index.lookup('retailer', 'SHUFERSAL')] == [str(code) for code in range(100)]
+
+
+def test_compact_renumbers_rows_and_indexes():
+    index = ProductIndex([product(code, 10.0 + code, RETAILERS[code % 3]) for code in range(10)])
+    for code in range(0, 10, 2):
+        index.add(product(code, 100.0 - code, RETAILERS[code % 3]))
+
+    index.compact()
+
+    assert len(index.rows) == 10 and index.free_rows == 0
+    assert all(row is not None for row in index.rows)
+    assert index.row_by_key == {product_key(p): row for row, p in enumerate(index.rows)}
+    assert [p['price'] for p in index.top_k(3, descending=True)] == [100.0, 98.0, 96.0]
+    assert {retailer: p['price'] for retailer, p in index.cheapest_by('retailer').items()} == \
+        {'SHUFERSAL': 13.0, 'RAMI_LEVY': 11.0, 'VICTORY': 15.0}
+    assert len(index.price_indexes['price']) == 10
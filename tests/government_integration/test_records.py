@@ -0,0 +1,81 @@
+import asyncio
+import json
+import shutil
+
+from government_integration import ProductBatch, ProductRecord, QualityGrade, json_default
+
+NORMALIZED_CUTS = {'cut_1': {'hebrew_name': 'אנטריקוט בקר', 'english_name': 'Entrecote', 'category': 'beef'}}
+
+
+def rows():
+    return [
+        {'name_hebrew': 'אנטריקוט בקר', 'price': 129.9, 'retailer': 'SHUFERSAL', 'category': 'בשר',
+         'item_code': '7290000000017', 'store_id': '001'},
+        {'name_hebrew': 'אנטריקוט בקר', 'price': 119.9, 'retailer': 'MEGA', 'category': 'בשר',
+         'item_code': '7290000000017', 'store_id': '002'},
+        {'name_hebrew': 'חלב 3%', 'price': 6.9, 'retailer': 'MEGA', 'category': 'חלב'},
+    ]
+
+
+def test_filter_meat_products_returns_plain_dicts(make_integration):
+    integration = make_integration(NORMALIZED_CUTS)
+
+    products = asyncio.run(integration.filter_meat_products(rows()))
+
+    assert [type(product) for product in products] == [dict, dict]
+    assert json.loads(json.dumps(products, ensure_ascii=False))[0]['basarometer_match']['normalized_id'] == 'cut_1'
+    assert type(products[0]['quality_grade']) is str
+    assert isinstance(products[0]['processed_at'], str)
+    assert type(integration.enhance_with_basarometer_data(rows()[0])) is dict
+
+
+def test_returned_match_is_not_the_cached_classification(make_integration):
+    integration = make_integration(NORMALIZED_CUTS)
+    first = asyncio.run(integration.filter_meat_products(rows()[:1]))[0]
+    first['basarometer_match']['normalized_id'] = 'corrupted'
+
+    second = asyncio.run(integration.filter_meat_products(rows()[1:2]))[0]
+    assert second['basarometer_match']['normalized_id'] == 'cut_1'
+
+    record = integration.merge_enrichment(rows()[0], integration.compute_basarometer_enrichment(rows()[0]))
+    record['basarometer_match']['normalized_id'] = 'corrupted'
+    assert integration.find_best_cut_match('אנטריקוט בקר')['normalized_id'] == 'cut_1'
+    assert asyncio.run(integration.filter_meat_products(rows()[:1]))[0]['basarometer_match']['normalized_id'] == 'cut_1'
+
+
+def test_execute_returns_plain_dicts(integration, fixtures_path):
+    shutil.copytree(fixtures_path / 'price_files', integration.data_folder, dirs_exist_ok=True)
+
+    products = asyncio.run(integration.execute_government_scraping())
+
+    assert products and all(type(product) is dict for product in products)
+    json.dumps(products, ensure_ascii=False)
+
+
+def test_batch_rows_match_the_records():
+    records = [ProductRecord(row, quality_grade='premium', processed_at=1700000000.0) for row in rows()]
+    records[1]['unknown_field'] = 'kept'
+    batch = ProductBatch.from_records(records)
+
+    assert len(batch) == 3
+    assert batch.to_dicts() == [record.to_dict() for record in records]
+    assert [dict(row) for row in batch] == [dict(record) for record in records]
+    assert batch.row(1)['unknown_field'] == 'kept'
+    assert batch.row(-1)['price'] == 6.9
+    assert batch.row(0)['quality_grade'] is QualityGrade.PREMIUM
+    assert json.loads(json.dumps(batch.row(0), default=json_default))['quality_grade'] == 'premium'
+    assert batch.column('item_code') == ['7290000000017', '7290000000017', None]
+    assert batch.select([2]).to_dicts() == [records[2].to_dict()]
+
+
+def test_batch_keeps_non_float_prices_as_they_are():
+    batch = ProductBatch.from_records([{'name_hebrew': 'a', 'price': 10}, {'name_hebrew': 'b', 'price': 12.5},
+                                       {'name_hebrew': 'c'}])
+
+    assert batch.column('price') == [10, 12.5, None]
+    assert type(batch.row(0)['price']) is int
+    assert 'price' not in batch.row(2)
+
+    floats = ProductBatch.from_records([{'price': 10.0}, {'name_hebrew': 'b'}])
+    assert floats.column('price') == [10.0, None]
+    assert 'price' not in floats.row(1)
@@ -0,0 +1,68 @@
+import asyncio
+import json
+import random
+
+import pytest
+
+from government_integration import GroupedStreamingStats, StreamingStats
+
+CHAINS = ['SHUFERSAL', 'RAMI_LEVY', 'VICTORY']
+CATEGORIES = ['בקר', 'עוף', '']
+
+
+def test_summary_matches_the_raw_values():
+    rng = random.Random(11)
+    values = [round(rng.uniform(0.8, 1.0), 2) for _ in range(5000)]
+    stats = StreamingStats()
+    stats.update(values)
+
+    assert stats.count == len(values)
+    assert stats.mean == pytest.approx(sum(values) / len(values))
+    assert (stats.minimum, stats.maximum) == (min(values), max(values))
+    assert sum(stats.histogram) == len(values)
+
+    ordered = sorted(values)
+    bucket_width = (stats.high - stats.low) / stats.buckets
+    for q in (0.5, 0.9, 0.99):
+        assert abs(stats.quantile(q) - ordered[int(q * len(values)) - 1]) <= bucket_width
+
+
+def test_merged_worker_stats_equal_a_serial_pass():
+    rng = random.Random(12)
+    # Multiples of 1/64 add up exactly in any order
+    rows = [(rng.randint(52, 64) / 64, rng.choice(CHAINS), rng.choice(CATEGORIES)) for _ in range(3000)]
+
+    serial = GroupedStreamingStats()
+    for value, chain, category in rows:
+        serial.add(value, chain, category)
+
+    merged = GroupedStreamingStats()
+    for start in range(0, len(rows), 700):
+        worker = GroupedStreamingStats()
+        for value, chain, category in rows[start:start + 700]:
+            worker.add(value, chain, category)
+        merged.merge(worker)
+
+    assert merged.to_dict() == serial.to_dict()
+    assert set(merged.to_dict()['by_category']) == {'בקר', 'עוף', 'unknown'}
+    assert sum(stats['count'] for stats in merged.to_dict()['by_chain'].values()) == len(rows)
+
+
+def test_empty_stats_and_mismatched_buckets():
+    assert StreamingStats().to_dict()['quantiles'] == {'p50': None, 'p90': None, 'p99': None}
+    with pytest.raises(ValueError):
+        StreamingStats().merge(StreamingStats(buckets=10))
+
+
+def test_stats_file_holds_the_confidence_summary(integration):
+    rows = [{'name_hebrew': name, 'name_english': '', 'price': 49.9, 'retailer': retailer, 'category': 'בשר'}
+            for name, retailer in (('אנטריקוט בקר טרי', 'SHUFERSAL'), ('חזה עוף טרי', 'RAMI_LEVY'))]
+    products = asyncio.run(integration.filter_meat_products(rows))
+
+    with open(integration.metrics_dir / 'government-scraping-results.json', encoding='utf-8') as f:
+        confidence = json.load(f)['confidence']
+
+    assert confidence['count'] == len(products) == 2
+    assert confidence['min'] == min(product['meat_confidence_score'] for product in products)
+    assert set(confidence['by_chain']) == {'SHUFERSAL', 'RAMI_LEVY'}
+    assert 'confidence_scores' not in integration.stats
@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+from government_integration import CrossRetailerUnifier, PriceMatrix
+
+NETWORKS = ['SHUFERSAL', 'RAMI_LEVY', 'MEGA', 'VICTORY', 'YAYNO_BITAN']
+NAMES = ['אנטריקוט בקר', 'חזה עוף', 'כנפיים עוף', 'קציצות בקר', 'שניצל עוף', 'פרגית']
+
+
+def price_rows(count=500, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        rows.append({
+            'name_hebrew': rng.choice(NAMES),
+            'retailer': rng.choice(NETWORKS),
+            # Few distinct prices, so networks often tie on the cheapest / most expensive price
+            'price': rng.choice([19.9, 24.5, 39.9, 54.9, 129.9]),
+            'category': 'בשר',
+        })
+    return rows
+
+
+def comparable(products):
+    """Snapshot products without their creation timestamps"""
+    for product in products:
+        product['metadata'].pop('created_at')
+    return products
+
+
+def unified_snapshot(use_numpy):
+    unifier = CrossRetailerUnifier(use_numpy=use_numpy)
+    unifier.add_batch(price_rows())
+    assert unifier.metrics()['vectorized'] is use_numpy
+    return unifier
+
+
+def test_numpy_and_python_statistics_agree():
+    pytest.importorskip('numpy')
+
+    vectorized = comparable(unified_snapshot(True).snapshot()['products'])
+    fallback = comparable(unified_snapshot(False).snapshot()['products'])
+
+    assert vectorized == fallback
+
+
+def test_matrix_statistics_match_per_product_statistics():
+    unifier = unified_snapshot(False)
+
+    snapshot = comparable(unifier.snapshot()['products'])
+    per_product = comparable([unified.to_dict() for unified in unifier.products.values()])
+
+    assert snapshot == per_product
+    assert any(product['savings_analysis'] for product in snapshot)
+
+
+@pytest.mark.parametrize('use_numpy', [False, True])
+def test_first_price_of_a_new_network(use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    matrix = PriceMatrix(use_numpy)
+    first, second = matrix.add_row(), matrix.add_row()
+
+    matrix.set(first, 'SHUFERSAL', 10.0)
+    matrix.set(second, 'MEGA', 12.0)
+    matrix.set(second, 'SHUFERSAL', 11.0)
+
+    assert matrix.get(first, 'MEGA') is None
+    assert matrix.get(second, 'SHUFERSAL') == 11.0
+    statistics = matrix.statistics()
+    assert statistics.row(second)[1]['cheapest_network'] == 'SHUFERSAL'
+    assert statistics.row(first)[1] is None
+
+
+@pytest.mark.parametrize('use_numpy', [False, True])
+def test_empty_catalog(use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    unifier = CrossRetailerUnifier(use_numpy=use_numpy)
+
+    snapshot = unifier.snapshot()
+
+    assert snapshot['products'] == []
+    assert snapshot['metadata']['total_products'] == 0
+    assert len(unifier.prices.statistics().networks) == 0
+
+
+@pytest.mark.parametrize('use_numpy', [False, True])
+def test_rows_without_network_columns(use_numpy):
+    if use_numpy:
+        pytest.importorskip('numpy')
+    matrix = PriceMatrix(use_numpy)
+    matrix.add_row()
+
+    statistics = matrix.statistics()
+
+    assert int(statistics.count[0]) == 0